@@ -0,0 +1,70 @@
+"""
+Quantize, sum and split 100k amounts, with and without NumPy.
+
+``legacy`` is a per-item Decimal loop; the other rows run the amounts
+module on its NumPy and pure-Python backends::
+
+    pytest benchmarks/bench_amounts.py --benchmark-columns=mean,ops
+"""
+
+from collections.abc import Generator
+from decimal import ROUND_HALF_EVEN, Decimal
+
+import pytest
+from fastapi_mongo_base.utils import bsontools
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from src.ufaas import amounts
+
+AMOUNTS = [Decimal(index % 9973) / 7 for index in range(100_000)]
+TOTAL = Decimal("1234567.89")
+
+
+def legacy_sum(values: list[Decimal]) -> Decimal:
+    """Normalize, quantize and add amounts one Decimal at a time."""
+    quantum = Decimal("0.01")
+    total = Decimal(0)
+    for value in values:
+        total += bsontools.decimal_amount(value).quantize(
+            quantum, ROUND_HALF_EVEN
+        )
+    return total
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(
+    request: pytest.FixtureRequest,
+) -> Generator[str]:
+    """Run a benchmark with and without NumPy."""
+    saved = amounts.np
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        amounts.np = None
+    try:
+        yield request.param
+    finally:
+        amounts.np = saved
+
+
+def test_sum_legacy(benchmark: BenchmarkFixture) -> None:
+    """Benchmark the per-item Decimal loop."""
+    benchmark(legacy_sum, AMOUNTS)
+
+
+def test_exact_sum(benchmark: BenchmarkFixture) -> None:
+    """Benchmark quantizing and summing in minor units."""
+    benchmark(amounts.exact_sum, AMOUNTS, "USD")
+
+
+def test_sum_minor_units(benchmark: BenchmarkFixture, backend: str) -> None:
+    """Benchmark summing amounts already held in minor units."""
+    units = amounts.to_minor_units(AMOUNTS, "USD")
+    benchmark(amounts.sum_minor_units, units)
+
+
+def test_split(benchmark: BenchmarkFixture, backend: str) -> None:
+    """Benchmark a largest-remainder split over 100k recipients."""
+    units = amounts.to_minor_units([TOTAL], "USD")[0]
+    weights = amounts.to_minor_units(AMOUNTS, "USD")
+    benchmark(amounts.split_minor_units, int(units), weights)
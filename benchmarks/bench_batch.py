@@ -0,0 +1,99 @@
+"""
+Compare sequential, fanned-out and bulk hold creation and release.
+
+Runs in process against the stub accounting service with simulated
+service latency::
+
+    python -m benchmarks.bench_batch --holds 500 --latency 0.005
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import UTC, datetime, timedelta
+
+import httpx
+
+from src.ufaas.hold import WalletHoldBatchItem
+from src.ufaas.services import AccountingClient
+
+from .stub_server import StubAccounting, fake_agent_tokens
+
+
+def make_client(stub: StubAccounting, *, bulk: bool) -> AccountingClient:
+    """Build a client served in process by the stub."""
+    return AccountingClient(
+        "tenant",
+        agent_id="agent",
+        agent_private_key="key",
+        transport=httpx.ASGITransport(stub),
+        bulk_holds=bulk,
+    )
+
+
+async def sequential(stub: StubAccounting, holds: list) -> None:
+    """Create and release holds one request at a time."""
+    async with make_client(stub, bulk=False) as client:
+        created = [
+            await client.create_hold(
+                hold.wallet_id, hold.currency, hold.amount, hold.expires_at
+            )
+            for hold in holds
+        ]
+        for hold in created:
+            await client.release_hold(hold.wallet_id, hold.uid)
+
+
+async def batched(
+    stub: StubAccounting, holds: list, *, bulk: bool, concurrency: int
+) -> None:
+    """Create and release holds through the batch API."""
+    async with make_client(stub, bulk=bulk) as client:
+        created = await client.create_holds(holds, concurrency=concurrency)
+        await client.release_holds(
+            [(item.result.wallet_id, item.result.uid) for item in created],
+            concurrency=concurrency,
+        )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--holds", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    expires_at = datetime.now(UTC) + timedelta(hours=1)
+    holds = [
+        WalletHoldBatchItem(
+            wallet_id="wallet-0",
+            currency="USD",
+            amount=1,
+            expires_at=expires_at,
+        )
+        for _ in range(args.holds)
+    ]
+    scenarios = {
+        "sequential": lambda stub: sequential(stub, holds),
+        "fan-out": lambda stub: batched(
+            stub, holds, bulk=False, concurrency=args.concurrency
+        ),
+        "bulk": lambda stub: batched(
+            stub, holds, bulk=True, concurrency=args.concurrency
+        ),
+    }
+    with fake_agent_tokens():
+        for name, scenario in scenarios.items():
+            stub = StubAccounting(latency=args.latency)
+            started = time.perf_counter()
+            asyncio.run(scenario(stub))
+            elapsed = time.perf_counter() - started
+            print(
+                f"{name:>10}: {2 * args.holds / elapsed:8.0f} holds/s  "
+                f"{stub.requests:5d} requests  {elapsed:6.2f} s"
+            )
+
+
+if __name__ == "__main__":
+    main()
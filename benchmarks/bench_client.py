@@ -0,0 +1,156 @@
+"""
+Throughput and latency of every AccountingClient method.
+
+Each scenario runs against the in-process stub accounting service, with
+``concurrency`` workers sharing one client. Besides pytest-benchmark's
+per-round timings, every scenario reports per-call p50/p99 latency and
+throughput in ``extra_info``::
+
+    pytest benchmarks/bench_client.py --benchmark-columns=mean,ops
+    pytest benchmarks/bench_client.py --benchmark-autosave
+
+In CI, compare against the last saved run and fail on regressions::
+
+    pytest benchmarks/bench_client.py \
+        --benchmark-compare --benchmark-compare-fail=mean:20%
+
+Set ``UFAAS_BENCH_LATENCY`` to emulate service time in seconds.
+"""
+
+import asyncio
+import os
+import statistics
+import time
+from collections.abc import Awaitable, Callable, Generator
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+import httpx
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from src.ufaas.services import AccountingClient
+
+from .stub_server import StubAccounting, fake_agent_tokens
+
+WALLETS = 64
+HOLDS_PER_WALLET = 50
+CALLS_PER_ROUND = 256
+ROUNDS = 10
+LATENCY = float(os.getenv("UFAAS_BENCH_LATENCY", "0"))
+EXPIRES_AT = datetime.now(UTC) + timedelta(days=1)
+
+type Scenario = Callable[[AccountingClient, int], Awaitable[object]]
+
+
+def wallet_id(index: int) -> str:
+    """Spread calls over the stub's wallets."""
+    return f"wallet-{index % WALLETS}"
+
+
+async def hold_roundtrip(client: AccountingClient, index: int) -> None:
+    """Create a hold and release it."""
+    hold = await client.create_hold(wallet_id(index), "USD", 1.5, EXPIRES_AT)
+    await client.release_hold(hold.wallet_id, hold.uid)
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "get_wallet": lambda client, i: client.get_wallet(wallet_id(i)),
+    "get_wallets": lambda client, i: client.get_wallets(),
+    "get_holds": lambda client, i: client.get_holds(wallet_id(i)),
+    "total_held_amount": lambda client, i: client.total_held_amount(
+        wallet_id(i), "USD"
+    ),
+    "create_hold": lambda client, i: client.create_hold(
+        wallet_id(i), "USD", 1.5, EXPIRES_AT
+    ),
+    "hold_roundtrip": hold_roundtrip,
+    "create_proposal": lambda client, i: client.create_proposal(
+        from_wallet_id=wallet_id(i),
+        to_wallet_id=wallet_id(i + 1),
+        currency="USD",
+        amount=Decimal("0.01"),
+    ),
+    "create_multi_recipient_proposal": (
+        lambda client, i: client.create_multi_recipient_proposal(
+            from_wallet_id=wallet_id(i),
+            to_wallet_ids=[wallet_id(i + step) for step in range(1, 11)],
+            currency="USD",
+            amounts=[Decimal("0.01")] * 10,
+        )
+    ),
+}
+
+
+def make_stub() -> StubAccounting:
+    """Build a stub whose wallets already hold some holds."""
+    stub = StubAccounting(wallets=WALLETS, latency=LATENCY)
+    for index in range(WALLETS):
+        for _ in range(HOLDS_PER_WALLET):
+            stub.handle(
+                "POST",
+                f"/api/accounting/v1/wallets/{wallet_id(index)}/holds",
+                {},
+                {"currency": "USD", "amount": "1", "status": "active"},
+            )
+    return stub
+
+
+@pytest.fixture
+def runner() -> Generator[asyncio.Runner]:
+    """Event loop shared by the rounds of a benchmark."""
+    with fake_agent_tokens(), asyncio.Runner() as runner:
+        yield runner
+
+
+@pytest.mark.parametrize("concurrency", [1, 16])
+@pytest.mark.parametrize("scenario", list(SCENARIOS))
+def test_client_method(
+    benchmark: BenchmarkFixture,
+    runner: asyncio.Runner,
+    scenario: str,
+    concurrency: int,
+) -> None:
+    """Benchmark one client method under concurrency."""
+    call = SCENARIOS[scenario]
+    client = AccountingClient(
+        "tenant",
+        agent_id="agent",
+        agent_private_key="key",
+        transport=httpx.ASGITransport(make_stub()),
+    )
+    latencies: list[float] = []
+    elapsed: list[float] = []
+
+    async def worker(offset: int) -> None:
+        for index in range(offset, CALLS_PER_ROUND, concurrency):
+            started = time.perf_counter()
+            await call(client, index)
+            latencies.append(time.perf_counter() - started)
+
+    async def run_round() -> None:
+        started = time.perf_counter()
+        await asyncio.gather(*[
+            worker(offset) for offset in range(concurrency)
+        ])
+        elapsed.append(time.perf_counter() - started)
+
+    benchmark.pedantic(
+        lambda: runner.run(run_round()), rounds=ROUNDS, warmup_rounds=1
+    )
+    runner.run(client.aclose())
+
+    # Drop the warmup round; with --benchmark-disable it is the only one.
+    latencies = latencies[CALLS_PER_ROUND:]
+    benchmark.extra_info.update({
+        "calls_per_round": CALLS_PER_ROUND,
+        "concurrency": concurrency,
+    })
+    if len(latencies) < 2:
+        return
+    percentiles = statistics.quantiles(latencies, n=100)
+    benchmark.extra_info.update({
+        "throughput": CALLS_PER_ROUND * ROUNDS / sum(elapsed[1:]),
+        "p50_ms": percentiles[49] * 1000,
+        "p99_ms": percentiles[98] * 1000,
+    })
@@ -0,0 +1,44 @@
+"""
+Read currency metadata, rebuilt per access and from the shared table.
+
+``legacy`` rebuilds the nested properties dict on every read, as the
+enum used to; ``table`` reads the precomputed record::
+
+    pytest benchmarks/bench_currency.py --benchmark-columns=mean,ops
+"""
+
+from collections.abc import Callable
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from src.ufaas.enums import Currency
+
+READS = 10_000
+
+
+def legacy_precision(currency: Currency) -> int:
+    """Build every currency's properties, then read one precision."""
+    properties = {member: member.info.as_dict() for member in Currency}
+    return properties.get(currency.value, {}).get("precision")
+
+
+def table_precision(currency: Currency) -> int:
+    """Read the precision from the metadata table."""
+    return currency.precision
+
+
+@pytest.mark.parametrize(
+    "read", [legacy_precision, table_precision], ids=["legacy", "table"]
+)
+def test_precision(
+    benchmark: BenchmarkFixture, read: Callable[[Currency], int]
+) -> None:
+    """Benchmark reading the precision of every currency."""
+    currencies = list(Currency) * (READS // len(Currency))
+
+    def run() -> int:
+        return sum(read(currency) for currency in currencies)
+
+    benchmark.extra_info["reads"] = len(currencies)
+    benchmark(run)
@@ -0,0 +1,74 @@
+"""
+Decode a large page of holds, per item and straight from bytes.
+
+``legacy`` is the former path: ``json.loads`` into dicts, then one
+``model_validate`` per item with a Python validator coercing amounts.
+``direct`` validates the raw body into the items envelope in one call::
+
+    pytest benchmarks/bench_decode.py --benchmark-columns=mean,ops
+"""
+
+import json
+from decimal import Decimal
+
+import pytest
+from fastapi_mongo_base.utils import bsontools
+from pydantic import field_validator
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from src.ufaas._schemas import Items
+from src.ufaas.hold import WalletHoldSchema
+
+HOLDS = 10_000
+
+
+class LegacyHoldSchema(WalletHoldSchema):
+    """Hold schema coercing amounts with a Python validator."""
+
+    @field_validator("amount", mode="before")
+    @classmethod
+    def validate_amount(cls, value: object) -> Decimal:
+        """Convert amount to Decimal."""
+        return bsontools.decimal_amount(value)
+
+
+def page() -> bytes:
+    """Build the body of a page of holds."""
+    return json.dumps({
+        "items": [
+            {
+                "uid": f"hold-{index}",
+                "tenant_id": "tenant",
+                "workspace_id": "workspace",
+                "created_at": "2026-01-01T00:00:00Z",
+                "updated_at": "2026-01-01T00:00:00Z",
+                "wallet_id": f"wallet-{index % 64}",
+                "currency": "USD",
+                "amount": "1.25" if index % 2 else 1.25,
+                "expires_at": "2026-02-01T00:00:00Z",
+                "status": "active",
+            }
+            for index in range(HOLDS)
+        ],
+        "total": HOLDS,
+    }).encode()
+
+
+def legacy(body: bytes) -> list[WalletHoldSchema]:
+    """Decode to dicts, then validate item by item."""
+    return [
+        LegacyHoldSchema.model_validate(item)
+        for item in json.loads(body).get("items", [])
+    ]
+
+
+def direct(body: bytes) -> list[WalletHoldSchema]:
+    """Validate the raw body into the items envelope."""
+    return Items[WalletHoldSchema].model_validate_json(body).items
+
+
+@pytest.mark.parametrize("decode", [legacy, direct], ids=["legacy", "direct"])
+def test_decode_holds(benchmark: BenchmarkFixture, decode: object) -> None:
+    """Benchmark decoding a page of holds."""
+    body = page()
+    benchmark.extra_info["holds"] = len(benchmark(decode, body))
@@ -0,0 +1,58 @@
+"""
+Build and dump a large proposal, from Decimals and from Money.
+
+Building validates the participants and sums the amounts, as
+``create_multi_recipient_proposal`` does; dumping serializes the body to
+JSON, the same for both kinds of amounts::
+
+    pytest benchmarks/bench_money.py --benchmark-columns=mean,ops
+"""
+
+from decimal import Decimal
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from src.ufaas.money import Money
+from src.ufaas.proposal import Participant, ProposalCreateSchema
+
+PARTICIPANTS = 1_000
+
+AMOUNTS = {
+    "decimal": [Decimal(index).scaleb(-2) for index in range(PARTICIPANTS)],
+    "money": [Money(index, "USD") for index in range(PARTICIPANTS)],
+}
+
+
+def build(amounts: list[object]) -> ProposalCreateSchema:
+    """Build a proposal paying every amount."""
+    total = (
+        Money.total(amounts, "USD")
+        if isinstance(amounts[0], Money)
+        else sum(amounts)
+    )
+    return ProposalCreateSchema(
+        amount=total,
+        currency="USD",
+        participants=[
+            Participant(wallet_id="source", amount=-total),
+            *[
+                Participant(wallet_id=f"wallet-{index}", amount=amount)
+                for index, amount in enumerate(amounts)
+            ],
+        ],
+    )
+
+
+@pytest.mark.parametrize("kind", AMOUNTS)
+def test_build_proposal(benchmark: BenchmarkFixture, kind: str) -> None:
+    """Benchmark building a proposal from one kind of amounts."""
+    proposal = benchmark(build, AMOUNTS[kind])
+    benchmark.extra_info["participants"] = len(proposal.participants)
+
+
+@pytest.mark.parametrize("kind", AMOUNTS)
+def test_dump_proposal(benchmark: BenchmarkFixture, kind: str) -> None:
+    """Benchmark dumping a proposal of one kind of amounts to JSON."""
+    proposal = build(AMOUNTS[kind])
+    benchmark.extra_info["bytes"] = len(benchmark(proposal.model_dump_json))
@@ -0,0 +1,97 @@
+"""
+Build the body of a 1k-participant proposal, validated and trusted.
+
+``validated`` is the former path: a ``Participant`` per recipient and a
+``ProposalCreateSchema``, dumped with ``model_dump(mode="json")``.
+``trusted`` is what the clients send now: ``proposal_payload`` assembles
+the JSON-ready body directly and only checks the double-entry invariant.
+Peak allocations of one build are reported in ``extra_info``::
+
+    pytest benchmarks/bench_proposal.py --benchmark-columns=mean,ops
+"""
+
+import tracemalloc
+from collections.abc import Callable
+from decimal import Decimal
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from src.ufaas.proposal import (
+    Participant,
+    ProposalCreateSchema,
+    proposal_payload,
+)
+from src.ufaas.services import AccountingClient
+
+PARTICIPANTS = 1_000
+
+WALLETS = [f"wallet-{index}" for index in range(PARTICIPANTS)]
+AMOUNTS = [Decimal(index + 1).scaleb(-2) for index in range(PARTICIPANTS)]
+
+
+def validated() -> dict:
+    """Validate a schema per participant, then dump the proposal."""
+    total = sum(AMOUNTS)
+    return ProposalCreateSchema(
+        amount=total,
+        currency="USD",
+        participants=[
+            Participant(wallet_id="source", amount=-total),
+            *[
+                Participant(wallet_id=wallet_id, amount=amount)
+                for wallet_id, amount in zip(WALLETS, AMOUNTS, strict=True)
+            ],
+        ],
+        meta_data={"idempotency_key": "key"},
+    ).model_dump(mode="json")
+
+
+def trusted() -> dict:
+    """Assemble the body as the accounting clients do."""
+    return AccountingClient._new_proposal(
+        from_wallet_id="source",
+        to_wallet_ids=WALLETS,
+        currency="USD",
+        amounts=AMOUNTS,
+        description=None,
+        note=None,
+        hold_id=None,
+        from_label=None,
+        to_labels=None,
+        idempotency_key="key",
+    )
+
+
+def peak_allocations(build: Callable[[], dict]) -> int:
+    """Measure the peak bytes allocated by one build."""
+    tracemalloc.start()
+    try:
+        build()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.parametrize(
+    "build", [validated, trusted], ids=["validated", "trusted"]
+)
+def test_build_proposal_body(
+    benchmark: BenchmarkFixture, build: Callable[[], dict]
+) -> None:
+    """Benchmark building the body of a large proposal."""
+    benchmark.extra_info["peak_kib"] = peak_allocations(build) // 1024
+    body = benchmark(build)
+    benchmark.extra_info["participants"] = len(body["participants"])
+    benchmark.extra_info["same_body"] = body == proposal_payload(
+        currency="USD",
+        amount=sum(AMOUNTS),
+        participants=[
+            ("source", -sum(AMOUNTS), None, None),
+            *[
+                (wallet_id, amount, None, None)
+                for wallet_id, amount in zip(WALLETS, AMOUNTS, strict=True)
+            ],
+        ],
+        meta_data={"idempotency_key": "key"},
+    )
@@ -0,0 +1,192 @@
+"""
+Compare AccountingClient over HTTP/1.1 and HTTP/2 against the stub server.
+
+Each mode runs the client's own opt-in path, ``AccountingClient(http2=...,
+limits=...)``. The stub is served over TLS with a throwaway self-signed
+certificate, so HTTP/2 is negotiated through ALPN exactly as against the
+real service. Requires the ``bench`` extra::
+
+    python -m benchmarks.bench_transport --requests 2000 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import datetime as dt
+import ipaddress
+import os
+import socket
+import statistics
+import tempfile
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import httpx
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+from hypercorn.asyncio import serve
+from hypercorn.config import Config
+
+from src.ufaas.services import AccountingClient
+
+from .stub_server import StubAccounting, fake_agent_tokens
+
+
+def self_signed_certificate(directory: Path) -> tuple[Path, Path]:
+    """Write a certificate and key for 127.0.0.1 and return their paths."""
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "127.0.0.1")])
+    now = dt.datetime.now(UTC)
+    certificate = (
+        x509
+        .CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(minutes=1))
+        .not_valid_after(now + timedelta(days=1))
+        .add_extension(
+            x509.SubjectAlternativeName([
+                x509.IPAddress(ipaddress.ip_address("127.0.0.1"))
+            ]),
+            critical=False,
+        )
+        .add_extension(
+            x509.BasicConstraints(ca=True, path_length=None), critical=True
+        )
+        .sign(key, hashes.SHA256())
+    )
+    certfile = directory / "cert.pem"
+    keyfile = directory / "key.pem"
+    certfile.write_bytes(certificate.public_bytes(serialization.Encoding.PEM))
+    keyfile.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    return certfile, keyfile
+
+
+def start_server(
+    app: StubAccounting, certfile: Path, keyfile: Path
+) -> tuple[str, Callable[[], None]]:
+    """Serve the stub over TLS on a free local port in a thread."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    config = Config()
+    config.bind = [f"127.0.0.1:{port}"]
+    config.certfile = str(certfile)
+    config.keyfile = str(keyfile)
+    config.accesslog = None
+    config.errorlog = None
+    loop = asyncio.new_event_loop()
+    shutdown = asyncio.Event()
+    threading.Thread(
+        target=loop.run_until_complete,
+        args=(serve(app, config, shutdown_trigger=shutdown.wait),),
+        daemon=True,
+    ).start()
+    time.sleep(0.5)
+    return f"https://127.0.0.1:{port}", lambda: loop.call_soon_threadsafe(
+        shutdown.set
+    )
+
+
+async def run_mode(
+    http2: bool, requests: int, concurrency: int, connections: int
+) -> tuple[list[float], Counter[str]]:
+    """Issue create_hold calls; return latencies and protocol versions."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    versions: Counter[str] = Counter()
+    expires_at = datetime.now(UTC) + timedelta(hours=1)
+
+    async def record_version(response: httpx.Response) -> None:  # ruff:ignore[unused-async]
+        versions[response.http_version] += 1
+
+    async with AccountingClient(
+        "tenant",
+        agent_id="agent",
+        agent_private_key="key",
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=connections,
+            max_keepalive_connections=connections,
+        ),
+    ) as client:
+        client.event_hooks = {"response": [record_version]}
+
+        async def call() -> None:
+            async with semaphore:
+                started = time.perf_counter()
+                await client.create_hold("wallet-0", "USD", 1, expires_at)
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*[call() for _ in range(requests)])
+    return latencies, versions
+
+
+def report(
+    name: str,
+    latencies: list[float],
+    versions: Counter[str],
+    elapsed: float,
+) -> None:
+    """Print throughput, latency percentiles and negotiated protocols."""
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{name:>8}: {len(latencies) / elapsed:8.0f} req/s  "
+        f"p50 {quantiles[49] * 1000:6.2f} ms  "
+        f"p99 {quantiles[98] * 1000:6.2f} ms  "
+        f"{dict(versions)}"
+    )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--connections", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        certfile, keyfile = self_signed_certificate(Path(directory))
+        url, stop = start_server(StubAccounting(), certfile, keyfile)
+        os.environ["ACCOUNTING_SERVICE_URL"] = url
+        # The clients build their default transport, which trusts the
+        # certificate through SSL_CERT_FILE.
+        os.environ["SSL_CERT_FILE"] = str(certfile)
+        try:
+            with fake_agent_tokens():
+                for name, http2 in (("HTTP/1.1", False), ("HTTP/2", True)):
+                    started = time.perf_counter()
+                    latencies, versions = asyncio.run(
+                        run_mode(
+                            http2,
+                            args.requests,
+                            args.concurrency,
+                            args.connections,
+                        )
+                    )
+                    report(
+                        name,
+                        latencies,
+                        versions,
+                        time.perf_counter() - started,
+                    )
+        finally:
+            stop()
+
+
+if __name__ == "__main__":
+    main()
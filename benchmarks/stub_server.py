@@ -0,0 +1,279 @@
+"""In-memory stand-in for the UFaaS accounting service."""
+
+import asyncio
+import json
+import uuid
+from collections.abc import Generator
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from decimal import Decimal
+from urllib.parse import parse_qsl
+
+import httpx
+from usso.utils import agent
+
+PREFIX = "/api/accounting/v1"
+
+
+class StubAccounting:
+    """
+    Minimal accounting service keeping wallets, holds and proposals.
+
+    The same instance can be mounted in-process through ``transport()``
+    or served over real sockets as an ASGI app.
+    """
+
+    def __init__(
+        self,
+        *,
+        tenant_id: str = "tenant",
+        workspace_id: str = "workspace",
+        wallets: int = 1,
+        currency: str = "USD",
+        balance: Decimal = Decimal(1_000_000),
+        latency: float = 0.0,
+        bulk: bool = True,
+    ) -> None:
+        """
+        Initialize StubAccounting.
+
+        Args:
+            tenant_id: Tenant of every stored entity
+            workspace_id: Workspace of every stored entity
+            wallets: Number of wallets to create; the first is default
+            currency: Currency of the initial balances
+            balance: Initial balance of every wallet
+            latency: Seconds the ASGI app waits before answering, to
+                emulate network and service time.
+            bulk: Whether the bulk holds endpoint is offered
+        """
+        self.tenant_id = tenant_id
+        self.workspace_id = workspace_id
+        self.currency = currency
+        self.latency = latency
+        self.bulk = bulk
+        self.wallets: dict[str, dict] = {}
+        self.holds: dict[str, dict[str, dict]] = {}
+        self.proposals: list[dict] = []
+        self.requests = 0
+        for index in range(wallets):
+            wallet_id = f"wallet-{index}"
+            self.wallets[wallet_id] = self._entity(
+                uid=wallet_id,
+                is_default=index == 0,
+                balance={
+                    currency: {
+                        "currency": currency,
+                        "total": str(balance),
+                        "held": "0",
+                        "available": str(balance),
+                    }
+                },
+            )
+            self.holds[wallet_id] = {}
+
+    def _entity(self, **fields: object) -> dict:
+        now = datetime.now(UTC).isoformat()
+        return {
+            "uid": str(uuid.uuid4()),
+            "tenant_id": self.tenant_id,
+            "workspace_id": self.workspace_id,
+            "created_at": now,
+            "updated_at": now,
+            **fields,
+        }
+
+    @staticmethod
+    def _page(items: list[dict], query: dict[str, str]) -> dict:
+        offset = int(query.get("offset", 0))
+        limit = int(query.get("limit", 10))
+        return {
+            "items": items[offset : offset + limit],
+            "total": len(items),
+            "offset": offset,
+            "limit": limit,
+        }
+
+    def _adjust(self, wallet_id: str, currency: str, held: Decimal) -> None:
+        balance = self.wallets[wallet_id]["balance"].get(currency)
+        if balance is None:
+            return
+        balance["held"] = str(Decimal(balance["held"]) + held)
+        balance["available"] = str(Decimal(balance["available"]) - held)
+
+    def handle(
+        self, method: str, path: str, query: dict[str, str], body: object
+    ) -> tuple[int, object]:
+        """
+        Serve one request.
+
+        Args:
+            method: HTTP method
+            path: Request path including the API prefix
+            query: Query parameters
+            body: Decoded JSON body, or None
+
+        Returns:
+            Status code and JSON payload
+        """
+        self.requests += 1
+        if not path.startswith(PREFIX):
+            return 404, {"detail": "Not found"}
+        parts = path[len(PREFIX) :].strip("/").split("/")
+
+        if parts == ["proposals"] and method == "POST":
+            proposal = self._entity(user_id="agent", issuer_id="agent", **body)
+            self.proposals.append(proposal)
+            return 201, proposal
+        if parts == ["holds", "bulk"] and self.bulk:
+            return self._handle_bulk(method, body["items"])
+        if parts[0] != "wallets":
+            return 404, {"detail": "Not found"}
+        if len(parts) == 1 and method == "GET":
+            wallets = list(self.wallets.values())
+            return 200, self._page(wallets, query)
+
+        wallet = self.wallets.get(parts[1])
+        if wallet is None:
+            return 404, {"detail": "Wallet not found"}
+        if len(parts) == 2 and method == "GET":
+            return 200, wallet
+        if len(parts) > 2 and parts[2] == "holds":
+            return self._handle_holds(method, parts[1], parts[3:], query, body)
+        return 405, {"detail": "Method not allowed"}
+
+    def _handle_bulk(
+        self, method: str, items: list[dict]
+    ) -> tuple[int, object]:
+        entries = []
+        for item in items:
+            wallet_id = item.pop("wallet_id")
+            if wallet_id not in self.wallets:
+                entries.append({
+                    "error": "Wallet not found",
+                    "status_code": 404,
+                })
+                continue
+            uid = item.pop("uid", None)
+            parts = [uid] if method == "PATCH" else []
+            status, payload = self._handle_holds(
+                method, wallet_id, parts, {}, item
+            )
+            entries.append(
+                payload
+                if status < 400
+                else {"error": payload["detail"], "status_code": status}
+            )
+        return 200, {"items": entries}
+
+    def _handle_holds(
+        self,
+        method: str,
+        wallet_id: str,
+        parts: list[str],
+        query: dict[str, str],
+        body: object,
+    ) -> tuple[int, object]:
+        holds = self.holds[wallet_id]
+        if not parts and method == "POST":
+            hold = self._entity(wallet_id=wallet_id, **body)
+            holds[hold["uid"]] = hold
+            self._adjust(wallet_id, hold["currency"], Decimal(hold["amount"]))
+            return 201, hold
+        if not parts and method == "GET":
+            items = [
+                hold
+                for hold in holds.values()
+                if all(
+                    hold.get(field) == query[field]
+                    for field in ("currency", "status")
+                    if field in query
+                )
+            ]
+            return 200, self._page(items, query)
+        if len(parts) == 1 and method == "PATCH":
+            hold = holds.get(parts[0])
+            if hold is None:
+                return 404, {"detail": "Hold not found"}
+            releasing = hold["status"] != "released"
+            if releasing and body.get("status") == "released":
+                self._adjust(
+                    wallet_id, hold["currency"], -Decimal(hold["amount"])
+                )
+            hold.update({k: v for k, v in body.items() if v is not None})
+            return 200, hold
+        return 405, {"detail": "Method not allowed"}
+
+    def _handle_request(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content) if request.content else None
+        status, payload = self.handle(
+            request.method,
+            request.url.path,
+            dict(request.url.params),
+            body,
+        )
+        return httpx.Response(status, json=payload)
+
+    def transport(self) -> httpx.MockTransport:
+        """
+        Build an in-process transport serving this stub.
+
+        Returns:
+            httpx transport usable by sync and async clients
+        """
+        return httpx.MockTransport(self._handle_request)
+
+    async def __call__(
+        self, scope: dict, receive: object, send: object
+    ) -> None:
+        """Serve the stub as an ASGI application."""
+        if scope["type"] == "lifespan":
+            await receive()
+            await send({"type": "lifespan.startup.complete"})
+            await receive()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        content = b""
+        while True:
+            message = await receive()
+            content += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        status, payload = self.handle(
+            scope["method"],
+            scope["path"],
+            dict(parse_qsl(scope["query_string"].decode())),
+            json.loads(content) if content else None,
+        )
+        data = json.dumps(payload).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(data)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": data})
+
+
+@contextmanager
+def fake_agent_tokens() -> Generator[None]:
+    """Replace the USSO agent token exchange with a local fake."""
+    originals = agent.generate_agent_jwt, agent.get_agent_token_async
+
+    def generate_agent_jwt(scopes: list[str], **kwargs: object) -> str:
+        return "agent-jwt"
+
+    async def get_agent_token_async(jwt: str) -> str:  # ruff:ignore[unused-async]
+        return "access-token"
+
+    agent.generate_agent_jwt = generate_agent_jwt
+    agent.get_agent_token_async = get_agent_token_async
+    try:
+        yield
+    finally:
+        agent.generate_agent_jwt, agent.get_agent_token_async = originals
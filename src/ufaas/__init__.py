@@ -1,22 +1,56 @@
 """UFaaS - Universal Function as a Service client library."""
 
+from .aggregator import ProposalAggregator
+from .circuit import CircuitBreakers, CircuitState
+from .currency import CurrencyInfo, currency_info, register_currency
+from .exceptions import BatchItemError, CircuitOpenError, RateLimitedError
 from .hold import (
     HoldStatus,
     WalletHoldCreateSchema,
     WalletHoldSchema,
     WalletHoldUpdateSchema,
 )
+from .instrumentation import Instrumentation, MetricsRegistry, RequestEvent
+from .money import Money
+from .payout import PayoutEngine, PayoutReport
+from .pool import AccountingClientPool
 from .proposal import Participant, ProposalCreateSchema, ProposalSchema
-from .services import AccountingClient
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+from .services import (
+    ACCOUNTING_SCOPES,
+    AccountingClient,
+    SyncAccountingClient,
+)
+from .token_cache import TokenCache
 from .wallet import WalletCreateSchema, WalletSchema, WalletUpdateSchema
 
 __all__ = [
+    "ACCOUNTING_SCOPES",
     "AccountingClient",
+    "AccountingClientPool",
     # "AsyncUFaaS",
+    "BatchItemError",
+    "CircuitBreakers",
+    "CircuitOpenError",
+    "CircuitState",
+    "CurrencyInfo",
     "HoldStatus",
+    "Instrumentation",
+    "MetricsRegistry",
+    "Money",
     "Participant",
+    "PayoutEngine",
+    "PayoutReport",
+    "ProposalAggregator",
     "ProposalCreateSchema",
     "ProposalSchema",
+    "RateLimitedError",
+    "RateLimiter",
+    "RequestEvent",
+    "RetryPolicy",
+    "SyncAccountingClient",
+    "TokenCache",
     # "UFaaS",
     "WalletCreateSchema",
     "WalletHoldCreateSchema",
@@ -24,4 +58,6 @@ __all__ = [
     "WalletHoldUpdateSchema",
     "WalletSchema",
     "WalletUpdateSchema",
+    "currency_info",
+    "register_currency",
 ]
@@ -1,9 +1,69 @@
 """Pydantic schemas for entities."""
 
 from datetime import datetime, timezone
-from typing import Self
+from decimal import Decimal
+from typing import Annotated, Self
+
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    GetCoreSchemaHandler,
+    GetPydanticSchema,
+    model_validator,
+)
+from pydantic_core import CoreSchema, core_schema
+
+from .money import Money
+
+
+def _to_decimal(value: object) -> object:
+    # BSON Decimal128 values convert themselves; everything else is
+    # coerced by the core decimal validator.
+    to_decimal = getattr(value, "to_decimal", None)
+    return to_decimal() if to_decimal is not None else value
+
+
+def _decimal_amount_schema(
+    source: type, handler: GetCoreSchemaHandler
+) -> CoreSchema:
+    decimal_schema = handler.generate_schema(Decimal)
+    # Money is kept as is. Both dump to JSON as their decimal string, the
+    # same as pydantic does for Decimal, so a payload built from Money is
+    # the same as one built from Decimals.
+    return core_schema.json_or_python_schema(
+        json_schema=decimal_schema,
+        python_schema=core_schema.union_schema([
+            core_schema.is_instance_schema(Money),
+            core_schema.no_info_before_validator_function(
+                _to_decimal, decimal_schema
+            ),
+        ]),
+        serialization=core_schema.plain_serializer_function_ser_schema(
+            str, when_used="json"
+        ),
+    )
+
+
+DecimalAmount = Annotated[
+    Decimal | Money, GetPydanticSchema(_decimal_amount_schema)
+]
+"""
+Decimal accepting numbers, numeric strings and BSON Decimal128, or Money.
+
+JSON input is coerced by pydantic-core alone, without a Python validator
+per value, so ``model_validate_json`` stays on the fast path. ``Money``
+values skip decimal validation and stay in integer minor units.
+"""
+
+
+class Items[TSchema](BaseModel):
+    """Envelope of a list response: its items and paging fields."""
+
+    items: list[TSchema] = Field(default_factory=list)
+    total: int | None = None
+    limit: int | None = None
 
-from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 try:
     from fastapi_mongo_base.schemas import (
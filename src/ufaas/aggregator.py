@@ -0,0 +1,375 @@
+"""Aggregation of micro-charges into summed transfer proposals."""
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from dataclasses import dataclass
+from decimal import Decimal
+from pathlib import Path
+from typing import Self
+
+import httpx
+from fastapi_mongo_base.utils import bsontools
+
+from .proposal import ProposalSchema
+from .services import AccountingClient
+
+logger = logging.getLogger(__name__)
+
+ChargeKey = tuple[str, str, str]
+
+# Client errors that may succeed when the proposal is sent again.
+_RETRYABLE_STATUSES = frozenset({408, 409, 425, 429})
+
+
+@dataclass(slots=True, eq=False)
+class _Bucket:
+    amount: Decimal
+    count: int
+    opened_at: float
+    idempotency_key: str | None = None
+    sending: bool = False
+    error: str | None = None
+
+
+def _is_permanent(error: BaseException) -> bool:
+    """Check whether sending a failed proposal again cannot succeed."""
+    if isinstance(error, httpx.HTTPStatusError):
+        status_code = error.response.status_code
+        return status_code < 500 and status_code not in _RETRYABLE_STATUSES
+    return isinstance(error, ValueError)
+
+
+class ProposalAggregator:
+    """
+    Coalesce many small charges into one proposal per wallet pair.
+
+    Charges are summed per (from_wallet_id, to_wallet_id, currency) and
+    flushed as a single proposal when a key reaches ``max_charges``, when
+    it has been open for ``window`` seconds, and on close.
+
+    A flush seals each key's charges under an idempotency key that stays
+    with them until their proposal is confirmed; a failed flush is retried
+    with the same key and amount, so a proposal accepted despite an error
+    is not created twice. Charges arriving meanwhile open a new bucket.
+    Charges whose proposal is invalid or rejected by the service with a
+    client error are never retried: they move to ``failed`` instead.
+
+    With ``log_path`` set, every charge is appended to a log before it is
+    acknowledged and the log is rewritten to the unconfirmed remainder,
+    sealed buckets with their keys and failed ones with their error,
+    before and after each flush. Charges survive a crash and are replayed
+    on start without double charging. Replays, rewrites and synced
+    appends run in a worker thread; other appends are written inline, so
+    keep the log on local disk.
+    """
+
+    def __init__(
+        self,
+        client: AccountingClient,
+        *,
+        max_charges: int = 1000,
+        window: float = 5.0,
+        log_path: str | os.PathLike | None = None,
+        fsync: bool = False,
+    ) -> None:
+        """
+        Initialize ProposalAggregator.
+
+        Args:
+            client: Accounting client creating the proposals
+            max_charges: Number of charges that triggers a flush of a key
+            window: Seconds a key may accumulate charges before it is
+                flushed
+            log_path: Append log making pending charges crash-safe
+            fsync: Sync the log to disk after every charge
+        """
+        if max_charges < 1:
+            raise ValueError("max_charges must be positive")
+        self.client = client
+        self.max_charges = max_charges
+        self.window = window
+        self.log_path = Path(log_path) if log_path else None
+        self.fsync = fsync
+        self.flushed_charges = 0
+        self.flushed_proposals = 0
+        self._buckets: dict[ChargeKey, _Bucket] = {}
+        self._sealed: dict[ChargeKey, list[_Bucket]] = {}
+        self._failed: list[tuple[ChargeKey, _Bucket]] = []
+        self._log = None
+        self._log_lock = asyncio.Lock()
+        self._timer: asyncio.Task | None = None
+
+    @property
+    def pending(self) -> dict[ChargeKey, Decimal]:
+        """Unconfirmed total per (from_wallet_id, to_wallet_id, currency)."""
+        pending: dict[ChargeKey, Decimal] = {}
+        for key, bucket in self._all_buckets():
+            pending[key] = pending.get(key, Decimal(0)) + bucket.amount
+        return pending
+
+    @property
+    def failed(self) -> dict[ChargeKey, Decimal]:
+        """Total per key of charges whose proposal failed for good."""
+        failed: dict[ChargeKey, Decimal] = {}
+        for key, bucket in self._failed:
+            failed[key] = failed.get(key, Decimal(0)) + bucket.amount
+        return failed
+
+    async def start(self) -> None:
+        """Replay the charge log and start the flush timer."""
+        if self.log_path is not None and self._log is None:
+            await asyncio.to_thread(self._replay)
+            self._log = self.log_path.open("a", encoding="utf-8")
+        if self._timer is None:
+            self._timer = asyncio.create_task(self._run_timer())
+
+    async def close(self) -> None:
+        """Stop the flush timer and flush every pending charge."""
+        if self._timer is not None:
+            self._timer.cancel()
+            await asyncio.gather(self._timer, return_exceptions=True)
+            self._timer = None
+        await self.flush()
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    async def __aenter__(self) -> Self:
+        """Start the aggregator."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        """Close the aggregator."""
+        await self.close()
+
+    async def add(
+        self,
+        *,
+        from_wallet_id: str,
+        to_wallet_id: str,
+        currency: str,
+        amount: float | Decimal,
+    ) -> None:
+        """
+        Record a charge.
+
+        Args:
+            from_wallet_id: Source wallet ID
+            to_wallet_id: Destination wallet ID
+            currency: Currency code
+            amount: Charge amount
+        """
+        key = (from_wallet_id, to_wallet_id, currency)
+        amount = bsontools.decimal_amount(amount)
+        await self._append(key, amount)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            self._buckets[key] = _Bucket(amount, 1, time.monotonic())
+        else:
+            bucket.amount += amount
+            bucket.count += 1
+        if self._buckets[key].count >= self.max_charges:
+            await self.flush(key)
+
+    async def flush(
+        self, key: ChargeKey | None = None
+    ) -> list[ProposalSchema]:
+        """
+        Create the proposals of pending charges.
+
+        Failed proposals stay sealed under their idempotency key and are
+        retried on the next flush, unless they can never succeed.
+
+        Args:
+            key: Key to flush. Every key is flushed when omitted.
+
+        Returns:
+            Created proposals
+        """
+        keys = (
+            list(dict.fromkeys([*self._sealed, *self._buckets]))
+            if key is None
+            else [key]
+        )
+        for charge_key in keys:
+            bucket = self._buckets.pop(charge_key, None)
+            if bucket is not None:
+                bucket.idempotency_key = uuid.uuid4().hex
+                self._sealed.setdefault(charge_key, []).append(bucket)
+        batch = [
+            (charge_key, bucket)
+            for charge_key in keys
+            for bucket in self._sealed.get(charge_key, ())
+            if not bucket.sending
+        ]
+        if not batch:
+            return []
+        await self._mark_sending(batch)
+        results = await asyncio.gather(
+            *[
+                self._create(charge_key, bucket)
+                for charge_key, bucket in batch
+            ],
+            return_exceptions=True,
+        )
+        proposals = []
+        for (charge_key, bucket), result in zip(batch, results, strict=True):
+            bucket.sending = False
+            if isinstance(result, BaseException) and not _is_permanent(result):
+                logger.warning(
+                    "Flushing charges of %s failed: %r", charge_key, result
+                )
+                continue
+            self._sealed[charge_key].remove(bucket)
+            if not self._sealed[charge_key]:
+                del self._sealed[charge_key]
+            if isinstance(result, BaseException):
+                logger.error(
+                    "Charges of %s failed for good: %r", charge_key, result
+                )
+                bucket.error = repr(result)
+                self._failed.append((charge_key, bucket))
+                continue
+            proposals.append(result)
+            self.flushed_charges += bucket.count
+            self.flushed_proposals += 1
+        await self._compact()
+        return proposals
+
+    async def _mark_sending(
+        self, batch: list[tuple[ChargeKey, _Bucket]]
+    ) -> None:
+        for _, bucket in batch:
+            bucket.sending = True
+        # Persist the idempotency keys before the proposals are sent.
+        try:
+            await self._compact()
+        except BaseException:
+            for _, bucket in batch:
+                bucket.sending = False
+            raise
+
+    async def _create(self, key: ChargeKey, bucket: _Bucket) -> ProposalSchema:
+        from_wallet_id, to_wallet_id, currency = key
+        return await self.client.create_proposal(
+            from_wallet_id=from_wallet_id,
+            to_wallet_id=to_wallet_id,
+            currency=currency,
+            amount=bucket.amount,
+            description=f"{bucket.count} aggregated charges",
+            idempotency_key=bucket.idempotency_key,
+        )
+
+    def _all_buckets(self) -> list[tuple[ChargeKey, _Bucket]]:
+        return [
+            *[
+                (key, bucket)
+                for key, buckets in self._sealed.items()
+                for bucket in buckets
+            ],
+            *self._buckets.items(),
+        ]
+
+    def _merge(self, key: ChargeKey, bucket: _Bucket) -> None:
+        current = self._buckets.get(key)
+        if current is None:
+            self._buckets[key] = bucket
+        else:
+            current.amount += bucket.amount
+            current.count += bucket.count
+            current.opened_at = min(current.opened_at, bucket.opened_at)
+
+    async def _run_timer(self) -> None:
+        while True:
+            await asyncio.sleep(self.window / 2)
+            deadline = time.monotonic() - self.window
+            for key in dict.fromkeys(
+                key
+                for key, bucket in self._all_buckets()
+                if bucket.opened_at <= deadline and not bucket.sending
+            ):
+                try:
+                    await self.flush(key)
+                except Exception:
+                    # Keep the timer alive; the key is retried next tick.
+                    logger.exception("Timed flush of %s failed", key)
+
+    async def _append(self, key: ChargeKey, amount: Decimal) -> None:
+        if self._log is None:
+            return
+        record = {"key": key, "amount": str(amount), "count": 1}
+        line = json.dumps(record) + "\n"
+        async with self._log_lock:
+            if self.fsync:
+                await asyncio.to_thread(self._write, line)
+            else:
+                self._write(line)
+
+    def _write(self, line: str) -> None:
+        self._log.write(line)
+        self._log.flush()
+        if self.fsync:
+            os.fsync(self._log.fileno())
+
+    def _replay(self) -> None:
+        if not self.log_path.exists():
+            return
+        with self.log_path.open(encoding="utf-8") as log:
+            for line in log:
+                try:
+                    record = json.loads(line)
+                    key = tuple(record["key"])
+                    bucket = _Bucket(
+                        Decimal(record["amount"]),
+                        record.get("count", 1),
+                        time.monotonic(),
+                        record.get("idempotency_key"),
+                        error=record.get("error"),
+                    )
+                except (ValueError, KeyError, TypeError):
+                    # A torn last line from a crash mid-write.
+                    logger.warning("Skipping corrupt charge log line")
+                    continue
+                if bucket.error is not None:
+                    self._failed.append((key, bucket))
+                elif bucket.idempotency_key is None:
+                    self._merge(key, bucket)
+                else:
+                    self._sealed.setdefault(key, []).append(bucket)
+
+    async def _compact(self) -> None:
+        """Rewrite the log to the charges that are not confirmed yet."""
+        if self._log is None:
+            return
+        async with self._log_lock:
+            # Snapshot on the loop; charges change while the thread writes.
+            lines = []
+            for key, bucket in [*self._all_buckets(), *self._failed]:
+                record = {
+                    "key": key,
+                    "amount": str(bucket.amount),
+                    "count": bucket.count,
+                }
+                if bucket.idempotency_key is not None:
+                    record["idempotency_key"] = bucket.idempotency_key
+                if bucket.error is not None:
+                    record["error"] = bucket.error
+                lines.append(json.dumps(record) + "\n")
+            await asyncio.to_thread(self._rewrite, lines)
+
+    def _rewrite(self, lines: list[str]) -> None:
+        tmp_path = self.log_path.with_suffix(self.log_path.suffix + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as tmp:
+            tmp.writelines(lines)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        self._log.close()
+        try:
+            tmp_path.replace(self.log_path)
+        finally:
+            self._log = self.log_path.open("a", encoding="utf-8")
@@ -0,0 +1,279 @@
+"""Batch arithmetic on monetary amounts in integer minor units."""
+
+from collections.abc import Iterable, Sequence
+from decimal import ROUND_HALF_EVEN, Decimal
+
+from .currency import currency_info
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_INT64_MAX = 2**63 - 1
+
+type MinorUnits = Sequence[int]
+"""Minor units as a NumPy int64 array when available, else a list."""
+
+
+def to_decimal(value: object) -> Decimal:
+    """
+    Convert one amount to a Decimal.
+
+    Same conversion as ``bsontools.decimal_amount``: floats go through
+    ``str`` so 0.1 stays 0.1, and BSON Decimal128 and Money convert
+    themselves.
+
+    Args:
+        value: Decimal, int, float, numeric string, Decimal128 or Money
+
+    Returns:
+        Amount as a Decimal
+    """
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, int):
+        return Decimal(value)
+    convert = getattr(value, "to_decimal", None)
+    if convert is not None:
+        return convert()
+    return Decimal(str(value))
+
+
+def _units(
+    amounts: Iterable[object], precision: int, rounding: str
+) -> list[int]:
+    return [
+        int(to_decimal(amount).scaleb(precision).to_integral_value(rounding))
+        for amount in amounts
+    ]
+
+
+def _integer_weights(weights: Sequence[object]) -> list[int]:
+    if np is not None and isinstance(weights, np.ndarray):
+        if weights.dtype.kind in "iu":
+            return weights.tolist()
+        weights = weights.tolist()
+    if all(type(weight) is int for weight in weights):
+        return list(weights)
+    decimals = [to_decimal(weight) for weight in weights]
+    if not all(weight.is_finite() for weight in decimals):
+        raise ValueError("weights must be finite")
+    # Scale the weights to integers so the split stays exact.
+    places = max(0, *(-weight.as_tuple().exponent for weight in decimals))
+    return [int(weight.scaleb(places)) for weight in decimals]
+
+
+def _array(units: list[int]) -> MinorUnits:
+    if np is None:
+        return units
+    try:
+        return np.array(units, dtype=np.int64)
+    except OverflowError:
+        return units
+
+
+def minor_units(
+    amount: object, currency: str, *, rounding: str = ROUND_HALF_EVEN
+) -> int:
+    """
+    Convert one amount to integer minor units of a currency.
+
+    Args:
+        amount: Decimal, int, float, numeric string or Decimal128
+        currency: Currency code whose precision is used
+        rounding: Decimal rounding mode for digits past the precision
+
+    Returns:
+        Minor units
+    """
+    [units] = _units([amount], currency_info(currency).precision, rounding)
+    return units
+
+
+def to_minor_units(
+    amounts: Iterable[object],
+    currency: str,
+    *,
+    rounding: str = ROUND_HALF_EVEN,
+) -> MinorUnits:
+    """
+    Convert amounts to integer minor units of a currency.
+
+    Args:
+        amounts: Decimals, ints, floats, numeric strings or Decimal128
+        currency: Currency code whose precision is used
+        rounding: Decimal rounding mode for digits past the precision
+
+    Returns:
+        Minor units, as a NumPy int64 array when NumPy is installed and
+        the values fit, else as a list of ints
+    """
+    return _array(_units(amounts, currency_info(currency).precision, rounding))
+
+
+def from_minor_units(units: Iterable[int], currency: str) -> list[Decimal]:
+    """
+    Convert integer minor units back to amounts.
+
+    Args:
+        units: Minor units, a list or an array
+        currency: Currency code whose precision is used
+
+    Returns:
+        Amounts with exactly the currency's number of decimal places
+    """
+    precision = currency_info(currency).precision
+    if np is not None and isinstance(units, np.ndarray):
+        units = units.tolist()
+    return [Decimal(unit).scaleb(-precision) for unit in units]
+
+
+def quantize(
+    amounts: Iterable[object],
+    currency: str,
+    *,
+    rounding: str = ROUND_HALF_EVEN,
+) -> list[Decimal]:
+    """
+    Round amounts to the precision of a currency.
+
+    Args:
+        amounts: Decimals, ints, floats, numeric strings or Decimal128
+        currency: Currency code whose precision is used
+        rounding: Decimal rounding mode for digits past the precision
+
+    Returns:
+        Quantized amounts
+    """
+    quantum = currency_info(currency).quantum
+    return [
+        to_decimal(amount).quantize(quantum, rounding) for amount in amounts
+    ]
+
+
+def sum_minor_units(units: MinorUnits) -> int:
+    """
+    Sum minor units without overflowing.
+
+    Args:
+        units: Minor units, a list or an array
+
+    Returns:
+        Exact total
+    """
+    if np is None or not isinstance(units, np.ndarray) or not len(units):
+        return sum(units)
+    # int64 sums wrap silently; fall back to Python ints when they could.
+    if int(np.abs(units).max()) <= _INT64_MAX // len(units):
+        return int(units.sum())
+    return sum(units.tolist())
+
+
+def exact_sum(
+    amounts: Iterable[object],
+    currency: str,
+    *,
+    rounding: str = ROUND_HALF_EVEN,
+) -> Decimal:
+    """
+    Sum amounts exactly, each rounded to the precision of a currency.
+
+    Args:
+        amounts: Decimals, ints, floats, numeric strings or Decimal128
+        currency: Currency code whose precision is used
+        rounding: Decimal rounding mode for digits past the precision
+
+    Returns:
+        Total with exactly the currency's number of decimal places
+    """
+    # Converting the amounts dominates; Python ints add them as fast as
+    # building an array would, and never overflow.
+    precision = currency_info(currency).precision
+    return Decimal(sum(_units(amounts, precision, rounding))).scaleb(
+        -precision
+    )
+
+
+def split_minor_units(total: int, weights: Sequence[object]) -> MinorUnits:
+    """
+    Split minor units pro rata, with largest-remainder rounding.
+
+    Every share is first rounded down; the units left over go one each to
+    the shares with the largest remainders, earlier shares first on ties.
+    The shares always add up to the total.
+
+    Args:
+        total: Minor units to split; a negative total gives negative
+            shares
+        weights: Non-negative weights, one per share
+
+    Returns:
+        Shares, as a NumPy int64 array when NumPy is installed and the
+        products fit, else as a list of ints
+
+    Raises:
+        ValueError: When weights are empty, negative, not finite or all
+            zero
+    """
+    if not len(weights):
+        raise ValueError("weights must not be empty")
+    integers = _integer_weights(weights)
+    if min(integers) < 0:
+        raise ValueError("weights must not be negative")
+    weight_total = sum(integers)
+    if not weight_total:
+        raise ValueError("weights must not all be zero")
+
+    sign, total = (-1, -total) if total < 0 else (1, total)
+    # Weights are non-negative, so their sum bounds every weight too.
+    if (
+        np is not None
+        and weight_total <= _INT64_MAX
+        and total * weight_total <= _INT64_MAX
+    ):
+        shares, remainders = np.divmod(
+            np.array(integers, dtype=np.int64) * total, weight_total
+        )
+        leftover = total - int(shares.sum())
+        shares[np.argsort(-remainders, kind="stable")[:leftover]] += 1
+        return shares * sign
+
+    shares, remainders = [], []
+    for weight in integers:
+        share, remainder = divmod(total * weight, weight_total)
+        shares.append(share)
+        remainders.append(remainder)
+    leftover = total - sum(shares)
+    for index in sorted(
+        range(len(shares)), key=remainders.__getitem__, reverse=True
+    )[:leftover]:
+        shares[index] += 1
+    return [sign * share for share in shares]
+
+
+def split(
+    total: object,
+    weights: Sequence[object],
+    currency: str,
+    *,
+    rounding: str = ROUND_HALF_EVEN,
+) -> list[Decimal]:
+    """
+    Split an amount pro rata across recipients.
+
+    The total is rounded to the currency's precision, then split in minor
+    units with largest-remainder rounding, so the shares add up to it
+    exactly.
+
+    Args:
+        total: Amount to split
+        weights: Non-negative weights, one per recipient
+        currency: Currency code whose precision is used
+        rounding: Decimal rounding mode applied to the total
+
+    Returns:
+        Share of every recipient
+    """
+    units = minor_units(total, currency, rounding=rounding)
+    return from_minor_units(split_minor_units(units, weights), currency)
@@ -0,0 +1,75 @@
+"""Per-request authentication for UFaaS service clients."""
+
+import time
+from collections.abc import AsyncGenerator, Awaitable, Callable, Generator
+
+import httpx
+
+from .instrumentation import PHASES_EXTENSION
+
+
+class AgentTokenAuth(httpx.Auth):
+    """
+    Attach an agent access token to a single request.
+
+    The token is resolved for the request's own scopes when the request is
+    sent, so concurrent requests on a shared client never see each other's
+    credentials.
+    """
+
+    def __init__(
+        self,
+        get_token: Callable[[list[str]], Awaitable[str] | str],
+        scopes: str | list[str],
+    ) -> None:
+        """
+        Initialize AgentTokenAuth.
+
+        Args:
+            get_token: Function returning a token for scopes; a
+                coroutine function when used by an async client
+            scopes: Permission scopes required by the request
+        """
+        self.get_token = get_token
+        self.scopes = [scopes] if isinstance(scopes, str) else scopes
+
+    def sync_auth_flow(
+        self, request: httpx.Request
+    ) -> Generator[httpx.Request, httpx.Response]:
+        """
+        Authorize the request with a bearer token, blocking.
+
+        Args:
+            request: Outgoing request
+
+        Yields:
+            The authorized request
+        """
+        started = time.perf_counter()
+        _authorize(request, self.get_token(self.scopes), started)
+        yield request
+
+    async def async_auth_flow(
+        self, request: httpx.Request
+    ) -> AsyncGenerator[httpx.Request, httpx.Response]:
+        """
+        Authorize the request with a bearer token.
+
+        Args:
+            request: Outgoing request
+
+        Yields:
+            The authorized request
+        """
+        started = time.perf_counter()
+        _authorize(request, await self.get_token(self.scopes), started)
+        yield request
+
+
+def _authorize(request: httpx.Request, token: str, started: float) -> None:
+    phases = request.extensions.get(PHASES_EXTENSION)
+    if phases is not None:
+        phases["token"] = (
+            phases.get("token", 0.0) + time.perf_counter() - started
+        )
+    request.headers["Authorization"] = f"Bearer {token}"
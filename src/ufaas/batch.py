@@ -0,0 +1,59 @@
+"""Batch execution helpers for UFaaS service clients."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class BatchItemResult[TItem, TResult]:
+    """Outcome of one item of a batch operation."""
+
+    item: TItem
+    result: TResult | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the item succeeded."""
+        return self.error is None
+
+
+async def gather_bounded[TItem, TResult](
+    items: Iterable[TItem],
+    call: Callable[[TItem], Awaitable[TResult]],
+    *,
+    concurrency: int = 10,
+) -> list[BatchItemResult[TItem, TResult]]:
+    """
+    Run a call for every item with at most ``concurrency`` in flight.
+
+    Failures are captured per item instead of aborting the batch.
+
+    Args:
+        items: Items to process
+        call: Coroutine function processing one item
+        concurrency: Maximum number of calls in flight
+
+    Returns:
+        One result per item, in input order
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be positive")
+    items = list(items)
+    results: list[BatchItemResult[TItem, TResult]] = [
+        BatchItemResult(item) for item in items
+    ]
+    pending = iter(results)
+
+    async def worker() -> None:
+        for outcome in pending:
+            try:
+                outcome.result = await call(outcome.item)
+            except Exception as exc:
+                outcome.error = exc
+
+    await asyncio.gather(*[
+        worker() for _ in range(min(concurrency, len(items)))
+    ])
+    return results
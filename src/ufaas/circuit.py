@@ -0,0 +1,193 @@
+"""Circuit breakers for UFaaS service clients."""
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from enum import StrEnum
+
+from .exceptions import CircuitOpenError
+
+
+class CircuitState(StrEnum):
+    """State of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Fail fast on an endpoint that keeps failing or answering slowly.
+
+    The breaker tracks the outcome of the last ``window_size`` calls. Once
+    at least ``min_calls`` were seen and the share of failed calls reaches
+    ``failure_rate``, it opens and rejects calls for ``reset_timeout``
+    seconds. It then lets ``half_open_calls`` probes through: a successful
+    probe closes it, a failed one opens it again. Calls slower than
+    ``slow_call_duration`` count as failures. Safe to share between
+    threads.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        failure_rate: float = 0.5,
+        slow_call_duration: float | None = None,
+        window_size: int = 20,
+        min_calls: int = 10,
+        reset_timeout: float = 30.0,
+        half_open_calls: int = 1,
+        on_state_change: Callable[[str, CircuitState], None] | None = None,
+    ) -> None:
+        """
+        Initialize CircuitBreaker.
+
+        Args:
+            name: Name of the guarded endpoint
+            failure_rate: Share of failed calls in the window that opens
+                the circuit
+            slow_call_duration: Seconds after which a successful call
+                counts as failed. Latency is ignored when omitted.
+            window_size: Number of recent calls considered
+            min_calls: Number of calls needed before the circuit can open
+            reset_timeout: Seconds the circuit stays open before probing
+            half_open_calls: Number of concurrent probes when half-open
+            on_state_change: Called with the name and new state on every
+                transition.
+        """
+        if not 0 < failure_rate <= 1:
+            raise ValueError("failure_rate must be in (0, 1]")
+        self.name = name
+        self.failure_rate = failure_rate
+        self.slow_call_duration = slow_call_duration
+        self.min_calls = min(min_calls, window_size)
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = half_open_calls
+        self.on_state_change = on_state_change
+        self._outcomes: deque[bool] = deque(maxlen=window_size)
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        # Reentrant: on_state_change may read the breaker's state.
+        self._lock = threading.RLock()
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state, moving from open to half-open when due."""
+        with self._lock:
+            if (
+                self._state is CircuitState.OPEN
+                and time.monotonic() - self._opened_at >= self.reset_timeout
+            ):
+                self._transition(CircuitState.HALF_OPEN)
+            return self._state
+
+    @property
+    def retry_after(self) -> float:
+        """Seconds until an open circuit lets a probe through."""
+        if self.state is not CircuitState.OPEN:
+            return 0.0
+        return self._opened_at + self.reset_timeout - time.monotonic()
+
+    def acquire(self) -> None:
+        """
+        Admit a call, or reject it while the circuit is open.
+
+        Every admitted call must be settled with ``record`` or
+        ``release``.
+
+        Raises:
+            CircuitOpenError: When the circuit rejects the call
+        """
+        with self._lock:
+            state = self.state
+            if state is CircuitState.CLOSED:
+                return
+            if (
+                state is CircuitState.HALF_OPEN
+                and self._probes < self.half_open_calls
+            ):
+                self._probes += 1
+                return
+        raise CircuitOpenError(self.name, max(self.retry_after, 0.0))
+
+    def release(self) -> None:
+        """Settle an admitted call that ended without an outcome."""
+        with self._lock:
+            if self._state is CircuitState.HALF_OPEN and self._probes:
+                self._probes -= 1
+
+    def record(self, *, ok: bool, duration: float) -> None:
+        """
+        Settle an admitted call with its outcome.
+
+        Args:
+            ok: Whether the call succeeded
+            duration: Seconds the call took
+        """
+        failed = not ok or (
+            self.slow_call_duration is not None
+            and duration >= self.slow_call_duration
+        )
+        with self._lock:
+            if self._state is CircuitState.HALF_OPEN:
+                self.release()
+                self._transition(
+                    CircuitState.OPEN if failed else CircuitState.CLOSED
+                )
+            elif self._state is CircuitState.CLOSED:
+                self._outcomes.append(failed)
+                if (
+                    len(self._outcomes) >= self.min_calls
+                    and sum(self._outcomes) / len(self._outcomes)
+                    >= self.failure_rate
+                ):
+                    self._transition(CircuitState.OPEN)
+
+    def _transition(self, state: CircuitState) -> None:
+        self._state = state
+        self._outcomes.clear()
+        self._probes = 0
+        if state is CircuitState.OPEN:
+            self._opened_at = time.monotonic()
+        if self.on_state_change is not None:
+            self.on_state_change(self.name, state)
+
+
+class CircuitBreakers:
+    """
+    Circuit breakers created on demand, one per endpoint.
+
+    Share one instance between clients to share the endpoints' state.
+    """
+
+    def __init__(self, **settings: object) -> None:
+        """
+        Initialize CircuitBreakers.
+
+        Args:
+            **settings: Keyword arguments of every ``CircuitBreaker``
+        """
+        self.settings = settings
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def __getitem__(self, endpoint: str) -> CircuitBreaker:
+        """Return the breaker of an endpoint, creating it when missing."""
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            # setdefault keeps the first breaker when threads race here.
+            breaker = self._breakers.setdefault(
+                endpoint, CircuitBreaker(endpoint, **self.settings)
+            )
+        return breaker
+
+    @property
+    def states(self) -> dict[str, CircuitState]:
+        """Current state of every endpoint seen so far."""
+        return {
+            endpoint: breaker.state
+            for endpoint, breaker in self._breakers.items()
+        }
@@ -5,6 +5,8 @@ from urllib.parse import urlparse
 
 from usso.client import AsyncUssoClient, UssoClient
 
+from .instrumentation import Instrumentation, httpx_event_hooks
+
 
 def _get_usso_url(ufaas_base_url: str) -> str:
     """Get the USSO URL from the UFaaS base URL."""
@@ -31,6 +33,15 @@ def _get_usso_url(ufaas_base_url: str) -> str:
     return f"https://{netloc}"
 
 
+def _add_event_hooks(
+    client: UssoClient | AsyncUssoClient, hooks: dict[str, list]
+) -> None:
+    client.event_hooks = {
+        name: [*client.event_hooks.get(name, []), *hooks.get(name, [])]
+        for name in ("request", "response")
+    }
+
+
 class UFaaS(UssoClient):
     """Synchronous UFaaS main client."""
 
@@ -44,6 +55,7 @@ class UFaaS(UssoClient):
         agent_id: str | None = os.getenv("AGENT_ID"),
         agent_private_key: str | None = os.getenv("AGENT_PRIVATE_KEY"),
         client: UssoClient | None = None,
+        instrumentation: Instrumentation | None = None,
     ) -> None:
         """
         Initialize the UFaaS client.
@@ -56,6 +68,8 @@ class UFaaS(UssoClient):
             agent_id: Agent ID for authentication
             agent_private_key: Agent private key for authentication
             client: Existing USSO client to reuse
+            instrumentation: Receives an event with the network time and
+                payload sizes of every request. Disabled when omitted.
         """
         usso_base_url = (
             usso_base_url
@@ -79,6 +93,11 @@ class UFaaS(UssoClient):
         if not ufaas_base_url:
             raise ValueError("UFAAS_BASE_URL is required")
         self.ufaas_base_url = ufaas_base_url
+        if instrumentation is not None:
+            _add_event_hooks(
+                self,
+                httpx_event_hooks(instrumentation, "ufaas", is_async=False),
+            )
 
 
 class AsyncUFaaS(AsyncUssoClient):
@@ -94,6 +113,7 @@ class AsyncUFaaS(AsyncUssoClient):
         agent_id: str | None = os.getenv("AGENT_ID"),
         agent_private_key: str | None = os.getenv("AGENT_PRIVATE_KEY"),
         client: AsyncUssoClient | None = None,
+        instrumentation: Instrumentation | None = None,
     ) -> None:
         """
         Initialize the AsyncUFaaS client.
@@ -106,6 +126,8 @@ class AsyncUFaaS(AsyncUssoClient):
             agent_private_key: Agent private key for authentication
             refresh_token: Refresh token for authentication
             client: Existing USSO client to reuse
+            instrumentation: Receives an event with the network time and
+                payload sizes of every request. Disabled when omitted.
         """
         usso_base_url = (
             usso_base_url
@@ -129,3 +151,8 @@ class AsyncUFaaS(AsyncUssoClient):
         if not ufaas_base_url:
             raise ValueError("UFAAS_BASE_URL is required")
         self.ufaas_base_url = ufaas_base_url
+        if instrumentation is not None:
+            _add_event_hooks(
+                self,
+                httpx_event_hooks(instrumentation, "ufaas", is_async=True),
+            )
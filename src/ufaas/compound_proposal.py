@@ -1,13 +1,14 @@
 """Schemas for compound proposal."""
 
-from decimal import Decimal
 from enum import StrEnum
+from typing import Self
 
 from fastapi_mongo_base.schemas import TenantUserEntitySchema
 from fastapi_mongo_base.tasks import TaskMixin
-from fastapi_mongo_base.utils import bsontools
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, model_validator
 
+from ._schemas import DecimalAmount
+from .money import check_currency
 from .proposal import Participant
 
 
@@ -30,14 +31,20 @@ class CompoundProposalLeg(BaseModel):
     """
 
     currency: str
-    amount: Decimal
+    amount: DecimalAmount
     participants: list[Participant]
 
-    @field_validator("amount", mode="before")
-    @classmethod
-    def validate_amount(cls, value: Decimal) -> Decimal:
-        """Validate and normalize amount."""
-        return bsontools.decimal_amount(value)
+    @model_validator(mode="after")
+    def validate_currency(self) -> Self:
+        """Check Money amounts are in the leg's currency."""
+        check_currency(
+            self.currency,
+            [
+                self.amount,
+                *(participant.amount for participant in self.participants),
+            ],
+        )
+        return self
 
 
 class CompoundProposalSchema(TenantUserEntitySchema, TaskMixin):
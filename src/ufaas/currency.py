@@ -0,0 +1,153 @@
+"""Currency metadata for UFaaS."""
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from decimal import Decimal
+from types import MappingProxyType
+
+
+@dataclass(slots=True, frozen=True)
+class CurrencyInfo:
+    """
+    Immutable metadata of one currency.
+
+    ``scale`` and ``quantum`` are derived from ``precision`` once, so
+    rounding code can read them without recomputing powers of ten.
+    """
+
+    code: str
+    name: Mapping[str, str]
+    precision: int
+    symbol: str | None = None
+    icon: str | None = None
+    is_crypto: bool = False
+    color: str | None = None
+    scale: int = field(init=False, repr=False)
+    quantum: Decimal = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        """Freeze the names and derive the scale and quantum."""
+        if self.precision < 0:
+            raise ValueError("precision must not be negative")
+        object.__setattr__(self, "name", MappingProxyType(dict(self.name)))
+        object.__setattr__(self, "symbol", self.symbol or self.code)
+        object.__setattr__(self, "scale", 10**self.precision)
+        object.__setattr__(self, "quantum", Decimal(1).scaleb(-self.precision))
+
+    def as_dict(self) -> dict:
+        """
+        Build the legacy properties dictionary.
+
+        Returns:
+            Name, symbol, precision, icon, is_crypto and color
+        """
+        return {
+            "name": dict(self.name),
+            "symbol": self.symbol,
+            "precision": self.precision,
+            "icon": self.icon,
+            "is_crypto": self.is_crypto,
+            "color": self.color,
+        }
+
+
+_CURRENCIES: dict[str, CurrencyInfo] = {
+    info.code: info
+    for info in (
+        CurrencyInfo(
+            code="IRR",
+            name={"fa": "ریال", "en": "Iranian Rial"},
+            precision=0,
+            icon="https://flagcdn.com/w40/ir.png",
+            color="#1976d2",
+        ),
+        CurrencyInfo(
+            code="USD",
+            name={"fa": "دلار", "en": "Dollar"},
+            precision=2,
+            icon="https://flagcdn.com/w40/us.png",
+            color="#f7931a",
+        ),
+        CurrencyInfo(
+            code="EUR",
+            name={"fa": "یورو", "en": "Euro"},
+            precision=2,
+            icon="https://flagcdn.com/w40/eu.png",
+            color="#26a17b",
+        ),
+    )
+}
+
+
+def currency_info(code: str) -> CurrencyInfo:
+    """
+    Get the metadata of a currency.
+
+    Args:
+        code: Currency code, a ``Currency`` member or a registered code
+
+    Returns:
+        Currency metadata
+
+    Raises:
+        KeyError: When the currency is not known
+    """
+    return _CURRENCIES[code]
+
+
+def register_currency(
+    code: str,
+    *,
+    name: Mapping[str, str],
+    precision: int,
+    symbol: str | None = None,
+    icon: str | None = None,
+    is_crypto: bool = False,
+    color: str | None = None,
+    replace: bool = False,
+) -> CurrencyInfo:
+    """
+    Register the metadata of a currency missing from ``Currency``.
+
+    Takes the keys of a config entry, so currencies can be loaded with
+    ``register_currency(**entry)``.
+
+    Args:
+        code: Currency code such as ``USDT``
+        name: Localized names by language code
+        precision: Number of decimal places
+        symbol: Display symbol. Defaults to the code.
+        icon: Icon URL
+        is_crypto: Whether the currency is a cryptocurrency
+        color: Color hex code
+        replace: Replace the metadata of a registered currency
+
+    Returns:
+        Registered metadata
+
+    Raises:
+        ValueError: When the currency is registered and replace is False
+    """
+    if code in _CURRENCIES and not replace:
+        raise ValueError(f"Currency {code} is already registered")
+    info = CurrencyInfo(
+        code=code,
+        name=name,
+        precision=precision,
+        symbol=symbol,
+        icon=icon,
+        is_crypto=is_crypto,
+        color=color,
+    )
+    _CURRENCIES[code] = info
+    return info
+
+
+def registered_currencies() -> Mapping[str, CurrencyInfo]:
+    """
+    Get the metadata of every known currency.
+
+    Returns:
+        Read-only view keyed by currency code
+    """
+    return MappingProxyType(_CURRENCIES)
@@ -1,8 +1,11 @@
 """Enums for UFaaS application."""
 
+from collections.abc import Mapping
 from enum import StrEnum
 from typing import Self
 
+from .currency import _CURRENCIES, CurrencyInfo
+
 
 class Currency(StrEnum):
     """Enumeration for supported currencies."""
@@ -30,44 +33,20 @@ class Currency(StrEnum):
         """
         return cls.IRR
 
+    @property
+    def info(self) -> CurrencyInfo:
+        """
+        Currency metadata.
+
+        Returns:
+            Immutable metadata record
+        """
+        return _CURRENCIES[self]
+
     @property
     def properties(self) -> dict:
-        """Currency properties."""
-        return {
-            Currency.IRR: {
-                "name": {
-                    "fa": "ریال",
-                    "en": "Iranian Rial",
-                },
-                "symbol": "IRR",
-                "precision": 0,
-                "icon": "https://flagcdn.com/w40/ir.png",
-                "is_crypto": False,
-                "color": "#1976d2",
-            },
-            Currency.USD: {
-                "name": {
-                    "fa": "دلار",
-                    "en": "Dollar",
-                },
-                "symbol": "USD",
-                "precision": 2,
-                "icon": "https://flagcdn.com/w40/us.png",
-                "is_crypto": False,
-                "color": "#f7931a",
-            },
-            Currency.EUR: {
-                "name": {
-                    "fa": "یورو",
-                    "en": "Euro",
-                },
-                "symbol": "EUR",
-                "precision": 2,
-                "icon": "https://flagcdn.com/w40/eu.png",
-                "is_crypto": False,
-                "color": "#26a17b",
-            },
-        }
+        """Currency properties, keyed by currency."""
+        return {currency: currency.info.as_dict() for currency in Currency}
 
     @property
     def currency(self) -> Self:
@@ -80,14 +59,14 @@ class Currency(StrEnum):
         return self
 
     @property
-    def name(self) -> dict:
+    def name(self) -> Mapping[str, str]:
         """
-        Currency name dictionary.
+        Currency names.
 
         Returns:
-            Dictionary with localized names
+            Read-only mapping of localized names
         """
-        return self.properties.get(self.value, {}).get("name")
+        return _CURRENCIES[self].name
 
     @property
     def symbol(self) -> str:
@@ -97,7 +76,7 @@ class Currency(StrEnum):
         Returns:
             Currency symbol string
         """
-        return self.properties.get(self.value, {}).get("symbol")
+        return _CURRENCIES[self].symbol
 
     @property
     def precision(self) -> int:
@@ -107,7 +86,7 @@ class Currency(StrEnum):
         Returns:
             Number of decimal places
         """
-        return self.properties.get(self.value, {}).get("precision")
+        return _CURRENCIES[self].precision
 
     @property
     def icon(self) -> str:
@@ -117,7 +96,7 @@ class Currency(StrEnum):
         Returns:
             Icon URL string
         """
-        return self.properties.get(self.value, {}).get("icon")
+        return _CURRENCIES[self].icon
 
     @property
     def is_crypto(self) -> bool:
@@ -127,7 +106,7 @@ class Currency(StrEnum):
         Returns:
             True if cryptocurrency, False otherwise
         """
-        return self.properties.get(self.value, {}).get("is_crypto")
+        return _CURRENCIES[self].is_crypto
 
     @property
     def color(self) -> str:
@@ -137,7 +116,7 @@ class Currency(StrEnum):
         Returns:
             Color hex code string
         """
-        return self.properties.get(self.value, {}).get("color")
+        return _CURRENCIES[self].color
 
 
 class StatusEnum(StrEnum):
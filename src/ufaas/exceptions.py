@@ -124,3 +124,74 @@ class NotFoundError(UFaaSError):
         super().__init__(
             status_code=404, error_code="not_found", detail=detail
         )
+
+
+class BatchItemError(UFaaSError):
+    """Exception recorded for one failed item of a bulk request."""
+
+    message_en: str = "Batch item failed"
+    message_fa: str | None = "این مورد از دسته انجام نشد"
+
+    def __init__(self, detail: str, status_code: int = 400) -> None:
+        """
+        Initialize BatchItemError.
+
+        Args:
+            detail: Error reported by the server for the item
+            status_code: Status code reported for the item
+        """
+        super().__init__(
+            status_code=status_code,
+            error_code="batch_item_failed",
+            detail=detail,
+        )
+
+
+class CircuitOpenError(UFaaSError):
+    """Exception raised when a circuit breaker rejects a request."""
+
+    message_en: str = "Service temporarily unavailable"
+    message_fa: str | None = "سرویس موقتا در دسترس نیست"
+
+    def __init__(self, endpoint: str, retry_after: float) -> None:
+        """
+        Initialize CircuitOpenError.
+
+        Args:
+            endpoint: Endpoint whose circuit is open
+            retry_after: Seconds until the circuit lets a probe through
+        """
+        super().__init__(
+            status_code=503,
+            error_code="circuit_open",
+            detail=f"Circuit for {endpoint} is open",
+            endpoint=endpoint,
+            retry_after=retry_after,
+        )
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+class RateLimitedError(UFaaSError):
+    """Exception raised when a client-side rate limit cannot be met."""
+
+    message_en: str = "Too many requests"
+    message_fa: str | None = "تعداد درخواست بیش از حد مجاز است"
+
+    def __init__(self, limit: str, retry_after: float) -> None:
+        """
+        Initialize RateLimitedError.
+
+        Args:
+            limit: Name of the exceeded limit
+            retry_after: Seconds until the request could be sent
+        """
+        super().__init__(
+            status_code=429,
+            error_code="rate_limited",
+            detail=f"Rate limit {limit} exceeded",
+            limit=limit,
+            retry_after=retry_after,
+        )
+        self.limit = limit
+        self.retry_after = retry_after
@@ -1,14 +1,15 @@
 """Wallet hold functionality for UFaaS."""
 
 from datetime import datetime
-from decimal import Decimal
 from enum import StrEnum
+from typing import Self
 
-from fastapi_mongo_base.utils import bsontools, timezone
-from pydantic import BaseModel, field_validator
+from fastapi_mongo_base.utils import timezone
+from pydantic import BaseModel, model_validator
 
-from ._schemas import TenantWorkspaceEntitySchema
+from ._schemas import DecimalAmount, TenantWorkspaceEntitySchema
 from .enums import Currency
+from .money import check_currency
 
 
 class HoldStatus(StrEnum):
@@ -26,25 +27,11 @@ class WalletHoldSchema(TenantWorkspaceEntitySchema):
 
     wallet_id: str
     currency: str
-    amount: Decimal
+    amount: DecimalAmount
     expires_at: datetime | None = None
     status: HoldStatus = HoldStatus.ACTIVE
     description: str | None = None
 
-    @field_validator("amount", mode="before")
-    @classmethod
-    def validate_amount(cls, value: Decimal) -> Decimal:
-        """
-        Validate hold amount.
-
-        Args:
-            value: Amount to validate
-
-        Returns:
-            Validated decimal amount
-        """
-        return bsontools.decimal_amount(value)
-
     def is_expired(self) -> bool:
         """
         Check if the hold has expired.
@@ -63,12 +50,24 @@ class WalletHoldCreateSchema(BaseModel):
     """Schema for creating wallet holds."""
 
     currency: Currency
-    amount: Decimal
+    amount: DecimalAmount
     expires_at: datetime | None = None
     status: HoldStatus = HoldStatus.ACTIVE
     meta_data: dict | None = None
     description: str | None = None
 
+    @model_validator(mode="after")
+    def validate_currency(self) -> Self:
+        """Check a Money amount is in the hold's currency."""
+        check_currency(self.currency, [self.amount])
+        return self
+
+
+class WalletHoldBatchItem(WalletHoldCreateSchema):
+    """Schema for one hold of a batch hold creation."""
+
+    wallet_id: str
+
 
 class WalletHoldUpdateSchema(BaseModel):
     """Schema for updating wallet holds."""
@@ -0,0 +1,450 @@
+"""Instrumentation hooks for UFaaS service clients."""
+
+import re
+import threading
+import time
+import weakref
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Protocol
+
+import httpx
+
+PHASES_EXTENSION = "ufaas_phases"
+ATTEMPTS_EXTENSION = "ufaas_attempts"
+
+_VERSION = re.compile(r"v\d+")
+
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class CacheStatsSource(Protocol):
+    """Client exposing hit and miss counters of its caches."""
+
+    def cache_stats(self) -> dict[str, tuple[int, int]]:
+        """Return (hits, misses) per cache name."""
+
+
+@dataclass(slots=True, frozen=True)
+class RequestEvent:
+    """Outcome and timings of one request, retries included."""
+
+    client: str
+    method: str
+    endpoint: str
+    status_code: int | None
+    error: str | None
+    attempts: int
+    phases: dict[str, float] = field(default_factory=dict)
+    request_bytes: int = 0
+    response_bytes: int = 0
+
+
+def endpoint_name(
+    method: str, path: str, literals: Iterable[str] | None = None
+) -> str:
+    """
+    Name an endpoint by method and path template.
+
+    Args:
+        method: HTTP method
+        path: Request path
+        literals: Path segments kept as they are; every other segment is
+            an identifier. When omitted, segments containing a digit are
+            identifiers, except version segments such as ``v1``.
+
+    Returns:
+        Endpoint name such as ``GET /wallets/{id}``
+    """
+    literals = None if literals is None else frozenset(literals)
+
+    def is_literal(segment: str) -> bool:
+        if literals is not None:
+            return segment in literals
+        return _VERSION.fullmatch(segment) is not None or not any(
+            char.isdigit() for char in segment
+        )
+
+    template = "/".join(
+        segment if not segment or is_literal(segment) else "{id}"
+        for segment in path.split("/")
+    )
+    return f"{method} {template}"
+
+
+def add_phase(request: httpx.Request, phase: str, seconds: float) -> None:
+    """
+    Add time spent in a phase to an instrumented request.
+
+    Requests that are not instrumented are left untouched.
+
+    Args:
+        request: Request being sent
+        phase: Phase name
+        seconds: Seconds spent
+    """
+    phases = request.extensions.get(PHASES_EXTENSION)
+    if phases is not None:
+        phases[phase] = phases.get(phase, 0.0) + seconds
+
+
+class Instrumentation:
+    """
+    Base of instrumentation backends; every hook is a no-op.
+
+    Clients call the hooks only when an instrumentation is configured,
+    so an uninstrumented client pays nothing for them.
+    """
+
+    def bind(self, client: CacheStatsSource) -> None:
+        """
+        Register a client whose cache counters are reported.
+
+        Args:
+            client: Client exposing ``cache_stats``
+        """
+
+    def on_request(self, client: str, request: httpx.Request) -> None:
+        """
+        Handle a request about to be sent.
+
+        Args:
+            client: Name of the sending client
+            request: Outgoing request
+        """
+
+    def on_response(self, event: RequestEvent) -> None:
+        """
+        Handle the outcome of a request.
+
+        Args:
+            event: Outcome and timings of the request
+        """
+
+    def on_phase(
+        self, client: str, endpoint: str, phase: str, seconds: float
+    ) -> None:
+        """
+        Handle time spent after the response, decoding it into models.
+
+        Args:
+            client: Name of the client
+            endpoint: Endpoint name
+            phase: Phase name, ``decode``
+            seconds: Seconds spent
+        """
+
+
+class BoundClients:
+    """Weak set of bound clients with aggregated cache counters."""
+
+    def __init__(self) -> None:
+        """Initialize BoundClients."""
+        self._clients: weakref.WeakSet = weakref.WeakSet()
+
+    def add(self, client: CacheStatsSource) -> None:
+        """
+        Track a client until it is garbage collected.
+
+        Args:
+            client: Client exposing ``cache_stats``
+        """
+        self._clients.add(client)
+
+    def cache_stats(self) -> dict[tuple[str, str], tuple[int, int]]:
+        """
+        Sum the cache counters of the tracked clients.
+
+        Returns:
+            (hits, misses) per (client name, cache name)
+        """
+        totals: dict[tuple[str, str], tuple[int, int]] = {}
+        for client in list(self._clients):
+            name = getattr(client, "audience", type(client).__name__)
+            for cache, (hits, misses) in client.cache_stats().items():
+                total_hits, total_misses = totals.get((name, cache), (0, 0))
+                totals[name, cache] = (
+                    total_hits + hits,
+                    total_misses + misses,
+                )
+        return totals
+
+
+@dataclass(slots=True)
+class _Histogram:
+    buckets: tuple[float, ...]
+    counts: list[int]
+    sum: float = 0.0
+    count: int = 0
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+
+
+type Labels = tuple[tuple[str, str], ...]
+
+
+class MetricsRegistry(Instrumentation):
+    """
+    In-process metrics in the Prometheus text exposition format.
+
+    Serve ``render()`` from a ``/metrics`` endpoint to scrape it. Updates
+    are locked, so one registry may be shared between threads.
+    """
+
+    def __init__(
+        self,
+        *,
+        namespace: str = "ufaas",
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        """
+        Initialize MetricsRegistry.
+
+        Args:
+            namespace: Prefix of every metric name
+            buckets: Upper bounds of the phase duration histogram
+        """
+        self.namespace = namespace
+        self.buckets = tuple(sorted(buckets))
+        self._counters: dict[tuple[str, Labels], float] = {}
+        self._histograms: dict[Labels, _Histogram] = {}
+        self._clients = BoundClients()
+        self._lock = threading.Lock()
+
+    def bind(self, client: CacheStatsSource) -> None:
+        """
+        Register a client whose cache counters are reported.
+
+        Args:
+            client: Client exposing ``cache_stats``
+        """
+        self._clients.add(client)
+
+    def on_response(self, event: RequestEvent) -> None:
+        """
+        Count a request and record its phase timings.
+
+        Args:
+            event: Outcome and timings of the request
+        """
+        labels = (("client", event.client), ("endpoint", event.endpoint))
+        status = str(event.status_code) if event.status_code else event.error
+        with self._lock:
+            self._inc("requests_total", (*labels, ("status", status or "")))
+            self._inc("retries_total", labels, event.attempts - 1)
+            self._inc("request_bytes_total", labels, event.request_bytes)
+            self._inc("response_bytes_total", labels, event.response_bytes)
+            for phase, seconds in event.phases.items():
+                self._observe((*labels, ("phase", phase)), seconds)
+
+    def on_phase(
+        self, client: str, endpoint: str, phase: str, seconds: float
+    ) -> None:
+        """
+        Record time spent decoding a response.
+
+        Args:
+            client: Name of the client
+            endpoint: Endpoint name
+            phase: Phase name
+            seconds: Seconds spent
+        """
+        with self._lock:
+            self._observe(
+                (("client", client), ("endpoint", endpoint), ("phase", phase)),
+                seconds,
+            )
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text format.
+
+        Returns:
+            Exposition text
+        """
+        with self._lock:
+            lines = self._render_metrics()
+        lines.extend(self._render_caches())
+        return "\n".join(lines) + "\n"
+
+    def _render_metrics(self) -> list[str]:
+        lines: list[str] = []
+        for name in sorted({name for name, _ in self._counters}):
+            metric = f"{self.namespace}_{name}"
+            lines.append(f"# TYPE {metric} counter")
+            lines.extend(
+                _sample(metric, labels, value)
+                for (counter, labels), value in sorted(self._counters.items())
+                if counter == name
+            )
+        if self._histograms:
+            metric = f"{self.namespace}_phase_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            for labels, histogram in sorted(self._histograms.items()):
+                cumulative = 0
+                for bound, count in zip(
+                    histogram.buckets, histogram.counts, strict=True
+                ):
+                    cumulative += count
+                    lines.append(
+                        _sample(
+                            f"{metric}_bucket",
+                            (*labels, ("le", _number(bound))),
+                            cumulative,
+                        )
+                    )
+                lines.extend([
+                    _sample(
+                        f"{metric}_bucket",
+                        (*labels, ("le", "+Inf")),
+                        histogram.count,
+                    ),
+                    _sample(f"{metric}_sum", labels, histogram.sum),
+                    _sample(f"{metric}_count", labels, histogram.count),
+                ])
+        return lines
+
+    def _render_caches(self) -> list[str]:
+        stats = [
+            ((("client", client), ("cache", cache)), hits, misses)
+            for (client, cache), (hits, misses) in sorted(
+                self._clients.cache_stats().items()
+            )
+        ]
+        if not stats:
+            return []
+        hits_metric = f"{self.namespace}_cache_hits_total"
+        misses_metric = f"{self.namespace}_cache_misses_total"
+        ratio_metric = f"{self.namespace}_cache_hit_ratio"
+        return [
+            f"# TYPE {hits_metric} counter",
+            *[_sample(hits_metric, labels, hits) for labels, hits, _ in stats],
+            f"# TYPE {misses_metric} counter",
+            *[
+                _sample(misses_metric, labels, misses)
+                for labels, _, misses in stats
+            ],
+            f"# TYPE {ratio_metric} gauge",
+            *[
+                _sample(ratio_metric, labels, hit_ratio(hits, misses))
+                for labels, hits, misses in stats
+            ],
+        ]
+
+    def _inc(self, name: str, labels: Labels, value: float = 1) -> None:
+        if value:
+            key = (name, labels)
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def _observe(self, labels: Labels, seconds: float) -> None:
+        histogram = self._histograms.get(labels)
+        if histogram is None:
+            histogram = _Histogram(self.buckets, [0] * len(self.buckets))
+            self._histograms[labels] = histogram
+        histogram.observe(seconds)
+
+
+def hit_ratio(hits: int, misses: int) -> float:
+    """
+    Compute the share of lookups that hit.
+
+    Args:
+        hits: Number of hits
+        misses: Number of misses
+
+    Returns:
+        Hit ratio, 0 without lookups
+    """
+    lookups = hits + misses
+    return hits / lookups if lookups else 0.0
+
+
+def httpx_event_hooks(
+    instrumentation: Instrumentation, client: str, *, is_async: bool
+) -> dict[str, list[Callable]]:
+    """
+    Build httpx event hooks reporting requests to an instrumentation.
+
+    Used by clients that send requests through plain httpx calls; the
+    network phase is the time until the response headers arrive.
+
+    Args:
+        instrumentation: Instrumentation receiving the events
+        client: Name of the client
+        is_async: Build coroutine hooks for an ``httpx.AsyncClient``
+
+    Returns:
+        ``event_hooks`` argument of an httpx client
+    """
+
+    def on_request(request: httpx.Request) -> None:
+        request.extensions[PHASES_EXTENSION] = {}
+        request.extensions["ufaas_started"] = time.perf_counter()
+        instrumentation.on_request(client, request)
+
+    def on_response(response: httpx.Response) -> None:
+        request = response.request
+        started = request.extensions.get("ufaas_started")
+        phases = request.extensions.get(PHASES_EXTENSION, {})
+        if started is not None:
+            phases["network"] = time.perf_counter() - started
+        instrumentation.on_response(
+            RequestEvent(
+                client=client,
+                method=request.method,
+                endpoint=endpoint_name(request.method, request.url.path),
+                status_code=response.status_code,
+                error=None,
+                attempts=1,
+                phases=phases,
+                request_bytes=int(request.headers.get("content-length", 0)),
+                response_bytes=int(response.headers.get("content-length", 0)),
+            )
+        )
+
+    if not is_async:
+        return {"request": [on_request], "response": [on_response]}
+
+    # httpx awaits the event hooks of async clients.
+    async def on_request_async(request: httpx.Request) -> None:  # ruff:ignore[unused-async]
+        on_request(request)
+
+    async def on_response_async(response: httpx.Response) -> None:  # ruff:ignore[unused-async]
+        on_response(response)
+
+    return {"request": [on_request_async], "response": [on_response_async]}
+
+
+def _sample(metric: str, labels: Labels, value: float) -> str:
+    if not labels:
+        return f"{metric} {_number(value)}"
+    pairs = ",".join(f'{key}="{_escape(value)}"' for key, value in labels)
+    return f"{metric}{{{pairs}}} {_number(value)}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
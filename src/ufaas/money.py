@@ -0,0 +1,230 @@
+"""Compact money values in integer minor units."""
+
+from collections.abc import Iterable
+from decimal import ROUND_HALF_EVEN, Decimal
+from operator import attrgetter
+from typing import Self
+
+from .amounts import minor_units
+from .currency import _CURRENCIES, currency_info
+
+# Decimal switches to exponent notation past six decimal places.
+_PLAIN_PLACES = 6
+
+_currency = attrgetter("currency")
+_units = attrgetter("units")
+
+
+class Money:
+    """
+    Amount of a currency held as integer minor units.
+
+    Adding, subtracting, negating and comparing money of one currency is
+    integer arithmetic; mixing currencies raises ValueError. Money never
+    equals a plain number, so it hashes by (units, currency).
+
+    Amount fields of the accounting schemas keep Money values passed to
+    them as is, and serialize them to JSON like the Decimal of the same
+    value at the currency's precision.
+    """
+
+    __slots__ = ("currency", "units")
+
+    units: int
+    currency: str
+
+    def __init__(self, units: int, currency: str) -> None:
+        """
+        Initialize Money.
+
+        Args:
+            units: Amount in minor units, e.g. cents
+            currency: Registered currency code
+
+        Raises:
+            KeyError: When the currency is not known
+            ValueError: When units is not a whole number; use ``Money.of``
+                to convert an amount in major units
+        """
+        if type(units) is not int:
+            if units != int(units):
+                raise ValueError(
+                    f"Minor units must be a whole number, not {units!r}; "
+                    "use Money.of for amounts in major units"
+                )
+            units = int(units)
+        self.units = units
+        self.currency = currency_info(currency).code
+
+    @classmethod
+    def of(
+        cls, amount: object, currency: str, *, rounding: str = ROUND_HALF_EVEN
+    ) -> Self:
+        """
+        Build money from an amount in major units.
+
+        Args:
+            amount: Decimal, int, float, numeric string or Decimal128
+            currency: Registered currency code
+            rounding: Decimal rounding mode for digits past the precision
+
+        Returns:
+            Money rounded to the currency's precision
+        """
+        return cls(minor_units(amount, currency, rounding=rounding), currency)
+
+    @classmethod
+    def total(cls, values: Iterable["Money"], currency: str) -> Self:
+        """
+        Sum money of one currency in a single integer addition.
+
+        Faster than ``sum`` for long sequences, which builds an
+        intermediate Money per addition.
+
+        Args:
+            values: Money to add up
+            currency: Currency of every value, and of an empty total
+
+        Returns:
+            Total
+
+        Raises:
+            ValueError: When a value is of another currency
+        """
+        values = list(values)
+        code = currency_info(currency).code
+        others = set(map(_currency, values)) - {code}
+        if others:
+            raise ValueError(
+                f"Cannot combine {code} and {', '.join(sorted(others))}"
+            )
+        return cls(sum(map(_units, values)), code)
+
+    def to_decimal(self) -> Decimal:
+        """
+        Convert to a Decimal in major units.
+
+        Returns:
+            Amount with exactly the currency's number of decimal places
+        """
+        precision = currency_info(self.currency).precision
+        return Decimal(self.units).scaleb(-precision)
+
+    def _with(self, units: int) -> Self:
+        # Results share the validated currency, so skip __init__.
+        money = object.__new__(type(self))
+        money.units = units
+        money.currency = self.currency
+        return money
+
+    def _units_of(self, other: "Money") -> int:
+        if other.currency != self.currency:
+            raise ValueError(
+                f"Cannot combine {self.currency} and {other.currency}"
+            )
+        return other.units
+
+    def __add__(self, other: object) -> Self:
+        """Add money of the same currency."""
+        if not isinstance(other, Money):
+            return NotImplemented
+        return self._with(self.units + self._units_of(other))
+
+    def __radd__(self, other: object) -> Self:
+        """Support ``sum``, which starts from the integer 0."""
+        if isinstance(other, int) and other == 0:
+            return self
+        return NotImplemented
+
+    def __sub__(self, other: object) -> Self:
+        """Subtract money of the same currency."""
+        if not isinstance(other, Money):
+            return NotImplemented
+        return self._with(self.units - self._units_of(other))
+
+    def __mul__(self, factor: object) -> Self:
+        """Multiply by an integer."""
+        if type(factor) is not int:
+            return NotImplemented
+        return self._with(self.units * factor)
+
+    __rmul__ = __mul__
+
+    def __neg__(self) -> Self:
+        """Negate the amount."""
+        return self._with(-self.units)
+
+    def __abs__(self) -> Self:
+        """Return the absolute amount."""
+        return self._with(abs(self.units))
+
+    def __bool__(self) -> bool:
+        """Check whether the amount is not zero."""
+        return self.units != 0
+
+    def __eq__(self, other: object) -> bool:
+        """Compare with money; plain numbers are never equal."""
+        if not isinstance(other, Money):
+            return NotImplemented
+        return self.units == other.units and self.currency == other.currency
+
+    def __hash__(self) -> int:
+        """Hash by units and currency."""
+        return hash((self.units, self.currency))
+
+    def __lt__(self, other: object) -> bool:
+        """Compare with money of the same currency."""
+        if not isinstance(other, Money):
+            return NotImplemented
+        return self.units < self._units_of(other)
+
+    def __le__(self, other: object) -> bool:
+        """Compare with money of the same currency."""
+        if not isinstance(other, Money):
+            return NotImplemented
+        return self.units <= self._units_of(other)
+
+    def __gt__(self, other: object) -> bool:
+        """Compare with money of the same currency."""
+        if not isinstance(other, Money):
+            return NotImplemented
+        return self.units > self._units_of(other)
+
+    def __ge__(self, other: object) -> bool:
+        """Compare with money of the same currency."""
+        if not isinstance(other, Money):
+            return NotImplemented
+        return self.units >= self._units_of(other)
+
+    def __str__(self) -> str:
+        """Format like the equivalent Decimal."""
+        info = _CURRENCIES[self.currency]
+        if not 0 < info.precision <= _PLAIN_PLACES:
+            return str(self.to_decimal())
+        whole, fraction = divmod(abs(self.units), info.scale)
+        sign = "-" if self.units < 0 else ""
+        return f"{sign}{whole}.{fraction:0{info.precision}d}"
+
+    def __repr__(self) -> str:
+        """Represent as a constructor call."""
+        return f"Money({self.units}, {self.currency!r})"
+
+
+def check_currency(currency: str, amounts: Iterable[object]) -> None:
+    """
+    Check that the Money among amounts is of the given currency.
+
+    Plain numbers carry no currency and always pass.
+
+    Args:
+        currency: Currency of the amounts
+        amounts: Amounts to check
+
+    Raises:
+        ValueError: When a Money amount is of another currency
+    """
+    for amount in amounts:
+        if isinstance(amount, Money) and amount.currency != currency:
+            raise ValueError(
+                f"Cannot use {amount.currency} money for a {currency} amount"
+            )
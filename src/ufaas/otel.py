@@ -0,0 +1,118 @@
+"""OpenTelemetry adapter for UFaaS instrumentation."""
+
+from collections.abc import Iterable
+
+from opentelemetry import metrics
+
+from .instrumentation import (
+    BoundClients,
+    CacheStatsSource,
+    Instrumentation,
+    RequestEvent,
+    hit_ratio,
+)
+
+
+class OpenTelemetryInstrumentation(Instrumentation):
+    """
+    Report client events as OpenTelemetry metrics.
+
+    Requires the ``opentelemetry`` extra. Metrics are recorded on the given
+    meter, or on the global meter provider's ``ufaas`` meter.
+    """
+
+    def __init__(self, meter: metrics.Meter | None = None) -> None:
+        """
+        Initialize OpenTelemetryInstrumentation.
+
+        Args:
+            meter: Meter creating the instruments
+        """
+        meter = meter or metrics.get_meter("ufaas")
+        self._clients = BoundClients()
+        self._requests = meter.create_counter(
+            "ufaas.client.requests",
+            description="Requests sent, by endpoint and status",
+        )
+        self._retries = meter.create_counter(
+            "ufaas.client.retries",
+            description="Attempts beyond the first, by endpoint",
+        )
+        self._payload = meter.create_counter(
+            "ufaas.client.payload.size",
+            unit="By",
+            description="Bytes sent and received, by direction",
+        )
+        self._duration = meter.create_histogram(
+            "ufaas.client.phase.duration",
+            unit="s",
+            description="Time spent per request phase",
+        )
+        meter.create_observable_gauge(
+            "ufaas.client.cache.hit_ratio",
+            callbacks=[self._observe_caches],
+            description="Share of cache lookups that hit",
+        )
+
+    def bind(self, client: CacheStatsSource) -> None:
+        """
+        Register a client whose cache hit ratios are observed.
+
+        Args:
+            client: Client exposing ``cache_stats``
+        """
+        self._clients.add(client)
+
+    def on_response(self, event: RequestEvent) -> None:
+        """
+        Record a request's outcome and phase timings.
+
+        Args:
+            event: Outcome and timings of the request
+        """
+        attributes = {"client": event.client, "endpoint": event.endpoint}
+        self._requests.add(
+            1,
+            {
+                **attributes,
+                "status": str(event.status_code or event.error or ""),
+            },
+        )
+        if event.attempts > 1:
+            self._retries.add(event.attempts - 1, attributes)
+        self._payload.add(
+            event.request_bytes, {**attributes, "direction": "request"}
+        )
+        self._payload.add(
+            event.response_bytes, {**attributes, "direction": "response"}
+        )
+        for phase, seconds in event.phases.items():
+            self._duration.record(seconds, {**attributes, "phase": phase})
+
+    def on_phase(
+        self, client: str, endpoint: str, phase: str, seconds: float
+    ) -> None:
+        """
+        Record time spent decoding or validating a response.
+
+        Args:
+            client: Name of the client
+            endpoint: Endpoint name
+            phase: Phase name
+            seconds: Seconds spent
+        """
+        self._duration.record(
+            seconds, {"client": client, "endpoint": endpoint, "phase": phase}
+        )
+
+    def _observe_caches(
+        self, options: metrics.CallbackOptions
+    ) -> Iterable[metrics.Observation]:
+        return [
+            metrics.Observation(
+                hit_ratio(hits, misses), {"client": client, "cache": cache}
+            )
+            for (client, cache), (hits, misses) in (
+                self._clients.cache_stats().items()
+            )
+        ]
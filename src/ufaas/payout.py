@@ -0,0 +1,219 @@
+"""Chunked multi-recipient payouts for UFaaS."""
+
+import uuid
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from fastapi_mongo_base.utils import bsontools
+
+from .batch import gather_bounded
+from .proposal import ProposalSchema
+from .services import AccountingClient
+
+
+@dataclass(slots=True, eq=False)
+class PayoutChunk:
+    """A slice of payout recipients submitted as one proposal."""
+
+    index: int
+    to_wallet_ids: list[str]
+    amounts: list[Decimal]
+    to_labels: list[str] | None = None
+    proposal: ProposalSchema | None = None
+    error: Exception | None = None
+    idempotency_key: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+    @property
+    def ok(self) -> bool:
+        """Whether the chunk's proposal was created."""
+        return self.proposal is not None
+
+    @property
+    def total(self) -> Decimal:
+        """Amount paid out by the chunk."""
+        return sum(self.amounts, Decimal(0))
+
+
+@dataclass(slots=True)
+class PayoutReport:
+    """Progress and outcome of a chunked payout."""
+
+    from_wallet_id: str
+    currency: str
+    chunks: list[PayoutChunk]
+    hold_id: str | None = None
+    description: str | None = None
+    note: str | None = None
+    from_label: str | None = None
+
+    @property
+    def completed(self) -> list[PayoutChunk]:
+        """Chunks whose proposal was created."""
+        return [chunk for chunk in self.chunks if chunk.ok]
+
+    @property
+    def failed(self) -> list[PayoutChunk]:
+        """Chunks that still have to be submitted."""
+        return [chunk for chunk in self.chunks if not chunk.ok]
+
+    @property
+    def ok(self) -> bool:
+        """Whether every chunk was paid out."""
+        return all(chunk.ok for chunk in self.chunks)
+
+    @property
+    def paid_amount(self) -> Decimal:
+        """Amount paid out by completed chunks."""
+        return sum((chunk.total for chunk in self.completed), Decimal(0))
+
+
+class PayoutEngine:
+    """
+    Pay many recipients through fixed-size multi-recipient proposals.
+
+    Recipients are split into chunks of ``chunk_size``; every chunk becomes
+    one proposal debiting the same source wallet (and hold, if any). Chunks
+    are submitted with bounded concurrency; submitting the same report
+    again resubmits only the chunks that failed, under the idempotency key
+    of their first attempt so a chunk accepted despite an error is not
+    paid twice.
+    """
+
+    def __init__(
+        self,
+        client: AccountingClient,
+        *,
+        chunk_size: int = 500,
+        concurrency: int = 4,
+        on_progress: Callable[[PayoutReport, PayoutChunk], None] | None = None,
+    ) -> None:
+        """
+        Initialize PayoutEngine.
+
+        Args:
+            client: Accounting client creating the proposals
+            chunk_size: Maximum number of recipients per proposal
+            concurrency: Maximum number of proposals in flight
+            on_progress: Called after every chunk is submitted, whether it
+                succeeded or failed.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        self.client = client
+        self.chunk_size = chunk_size
+        self.concurrency = concurrency
+        self.on_progress = on_progress
+
+    def plan(
+        self,
+        *,
+        from_wallet_id: str,
+        to_wallet_ids: Sequence[str],
+        currency: str,
+        amounts: Sequence[float | Decimal],
+        hold_id: str | None = None,
+        description: str | None = None,
+        note: str | None = None,
+        from_label: str | None = None,
+        to_labels: Sequence[str] | None = None,
+    ) -> PayoutReport:
+        """
+        Split a payout into chunks without submitting it.
+
+        Args:
+            from_wallet_id: Source wallet ID
+            to_wallet_ids: Destination wallet IDs
+            currency: Currency code
+            amounts: Amount of every destination wallet
+            hold_id: Optional hold ID debited by every chunk
+            description: Optional description
+            note: Optional note
+            from_label: Optional label for source wallet
+            to_labels: Optional labels for destination wallets
+
+        Returns:
+            Report with every chunk pending
+        """
+        if len(to_wallet_ids) != len(amounts):
+            raise ValueError("to_wallet_ids and amounts differ in length")
+        chunks = []
+        for index, start in enumerate(
+            range(0, len(to_wallet_ids), self.chunk_size)
+        ):
+            end = start + self.chunk_size
+            chunks.append(
+                PayoutChunk(
+                    index=index,
+                    to_wallet_ids=list(to_wallet_ids[start:end]),
+                    amounts=[
+                        bsontools.decimal_amount(amount)
+                        for amount in amounts[start:end]
+                    ],
+                    to_labels=(
+                        list(to_labels[start:end]) if to_labels else None
+                    ),
+                )
+            )
+        return PayoutReport(
+            from_wallet_id=from_wallet_id,
+            currency=currency,
+            chunks=chunks,
+            hold_id=hold_id,
+            description=description,
+            note=note,
+            from_label=from_label,
+        )
+
+    async def run(self, **payout: object) -> PayoutReport:
+        """
+        Plan and submit a payout.
+
+        Args:
+            **payout: Arguments of ``plan``
+
+        Returns:
+            Report of every chunk
+        """
+        return await self.submit(self.plan(**payout))
+
+    async def submit(self, report: PayoutReport) -> PayoutReport:
+        """
+        Submit the pending chunks of a payout.
+
+        Chunks that already succeeded are skipped, so a report can be
+        resubmitted to retry only its failed chunks.
+
+        Args:
+            report: Payout report
+
+        Returns:
+            The same report, updated
+        """
+
+        async def submit_chunk(chunk: PayoutChunk) -> None:
+            try:
+                chunk.proposal = (
+                    await self.client.create_multi_recipient_proposal(
+                        from_wallet_id=report.from_wallet_id,
+                        to_wallet_ids=chunk.to_wallet_ids,
+                        currency=report.currency,
+                        amounts=chunk.amounts,
+                        description=report.description,
+                        note=report.note,
+                        hold_id=report.hold_id,
+                        from_label=report.from_label,
+                        to_labels=chunk.to_labels,
+                        idempotency_key=chunk.idempotency_key,
+                    )
+                )
+                chunk.error = None
+            except Exception as exc:
+                chunk.error = exc
+            if self.on_progress is not None:
+                self.on_progress(report, chunk)
+
+        await gather_bounded(
+            report.failed, submit_chunk, concurrency=self.concurrency
+        )
+        return report
@@ -0,0 +1,159 @@
+"""Multi-tenant accounting client pool for UFaaS."""
+
+from collections import OrderedDict
+from typing import Self
+
+import httpx
+
+from .services import AccountingClient
+
+
+class _SharedTransport(httpx.AsyncBaseTransport):
+    """Transport wrapper that tenant clients cannot close."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport) -> None:
+        self.transport = transport
+
+    async def handle_async_request(
+        self, request: httpx.Request
+    ) -> httpx.Response:
+        return await self.transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        """Leave the shared transport open; the pool owns it."""
+
+
+class AccountingClientPool:
+    """
+    Tenant-aware facade over AccountingClient.
+
+    All tenants send requests through one bounded connection pool. Tenant
+    clients, together with their token caches, are kept in an LRU map of
+    at most ``max_tenants`` entries.
+    """
+
+    def __init__(
+        self,
+        *,
+        agent_id: str | None = None,
+        agent_private_key: str | None = None,
+        max_tenants: int = 1024,
+        max_connections: int | None = None,
+        max_keepalive_connections: int | None = None,
+        keepalive_expiry: float | None = None,
+        http2: bool = False,
+        transport: httpx.AsyncBaseTransport | None = None,
+        **client_kwargs: object,
+    ) -> None:
+        """
+        Initialize AccountingClientPool.
+
+        Args:
+            agent_id: Agent ID. Defaults to AGENT_ID env var.
+            agent_private_key: Private key for signing.
+                Defaults to AGENT_PRIVATE_KEY env var.
+            max_tenants: Number of tenant clients kept before the least
+                recently used one is evicted.
+            max_connections: Connection limit of the shared pool.
+                Defaults to 100.
+            max_keepalive_connections: Idle connections kept alive.
+                Defaults to 20.
+            keepalive_expiry: Seconds an idle connection is kept alive.
+                Defaults to 5.
+            http2: Multiplex requests over HTTP/2 connections.
+                Requires the ``http2`` extra.
+            transport: Transport to share instead of building one from
+                the limits above.
+            **client_kwargs: Additional AccountingClient arguments
+
+        Raises:
+            ValueError: When max_tenants is not positive, or transport is
+                given together with the limits or http2, which only
+                configure the transport built by the pool
+        """
+        if max_tenants < 1:
+            raise ValueError("max_tenants must be positive")
+        transport_settings = (
+            max_connections,
+            max_keepalive_connections,
+            keepalive_expiry,
+        )
+        if transport is not None and (
+            http2 or any(value is not None for value in transport_settings)
+        ):
+            raise ValueError(
+                "Connection limits and http2 configure the pool's own "
+                "transport; set them on the transport instead"
+            )
+        self.agent_id = agent_id
+        self.agent_private_key = agent_private_key
+        self.max_tenants = max_tenants
+        self.limits = httpx.Limits(
+            max_connections=100
+            if max_connections is None
+            else max_connections,
+            max_keepalive_connections=(
+                20
+                if max_keepalive_connections is None
+                else max_keepalive_connections
+            ),
+            keepalive_expiry=5.0
+            if keepalive_expiry is None
+            else keepalive_expiry,
+        )
+        self.transport = transport or httpx.AsyncHTTPTransport(
+            limits=self.limits, http2=http2
+        )
+        self.client_kwargs = client_kwargs
+        self.evictions = 0
+        self._shared_transport = _SharedTransport(self.transport)
+        self._clients: OrderedDict[str, AccountingClient] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of live tenant clients."""
+        return len(self._clients)
+
+    def __contains__(self, tenant_id: object) -> bool:
+        """Check whether a tenant client is live."""
+        return tenant_id in self._clients
+
+    def client(self, tenant_id: str) -> AccountingClient:
+        """
+        Get the accounting client of a tenant.
+
+        Args:
+            tenant_id: Tenant identifier
+
+        Returns:
+            AccountingClient sending through the shared connection pool
+        """
+        client = self._clients.get(tenant_id)
+        if client is not None and not client.is_closed:
+            self._clients.move_to_end(tenant_id)
+            return client
+
+        client = AccountingClient(
+            tenant_id,
+            agent_id=self.agent_id,
+            agent_private_key=self.agent_private_key,
+            transport=self._shared_transport,
+            **self.client_kwargs,
+        )
+        self._clients[tenant_id] = client
+        while len(self._clients) > self.max_tenants:
+            self._clients.popitem(last=False)
+            self.evictions += 1
+        return client
+
+    async def aclose(self) -> None:
+        """Close the shared connection pool."""
+        self._clients.clear()
+        await self.transport.aclose()
+
+    async def __aenter__(self) -> Self:
+        """Enter the pool context."""
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        """Close the pool on context exit."""
+        await self.aclose()
@@ -1,13 +1,18 @@
 """Proposal functionality for UFaaS."""
 
+from collections.abc import Sequence
 from decimal import Decimal
 from enum import StrEnum
+from typing import Self
 
 from fastapi_mongo_base.tasks import TaskMixin
-from fastapi_mongo_base.utils import bsontools
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, model_validator
 
-from ._schemas import TenantUserEntitySchema
+from ._schemas import DecimalAmount, TenantUserEntitySchema
+from .money import Money, check_currency
+
+type ParticipantEntry = tuple[str, Decimal | Money, str | None, str | None]
+"""Wallet ID, amount, hold ID and label of a trusted participant."""
 
 
 class ProposalStatus(StrEnum):
@@ -25,55 +30,27 @@ class Participant(BaseModel):
     """Schema for proposal participants."""
 
     wallet_id: str
-    amount: Decimal
+    amount: DecimalAmount
     hold_id: str | None = None
     label: str | None = None
 
-    @field_validator("amount", mode="before")
-    @classmethod
-    def validate_amount(cls, value: Decimal) -> Decimal:
-        """
-        Validate participant amount.
-
-        Args:
-            value: Amount to validate
-
-        Returns:
-            Validated decimal amount
-        """
-        return bsontools.decimal_amount(value)
-
 
 class ProposalSchema(TenantUserEntitySchema, TaskMixin):
     """Schema for proposal information with tenant and user scope."""
 
     issuer_id: str
-    amount: Decimal
+    amount: DecimalAmount
     description: str | None = None
     note: str | None = None
     currency: str
     status: ProposalStatus = ProposalStatus.init
     participants: list[Participant]
 
-    @field_validator("amount", mode="before")
-    @classmethod
-    def validate_amount(cls, value: Decimal) -> Decimal:
-        """
-        Validate proposal amount.
-
-        Args:
-            value: Amount to validate
-
-        Returns:
-            Validated decimal amount
-        """
-        return bsontools.decimal_amount(value)
-
 
 class ProposalCreateSchema(BaseModel):
     """Schema for creating proposals."""
 
-    amount: Decimal
+    amount: DecimalAmount
     description: str | None = None
     note: str | None = None
     currency: str
@@ -81,6 +58,104 @@ class ProposalCreateSchema(BaseModel):
     participants: list[Participant]
     meta_data: dict | None = None
 
+    @model_validator(mode="after")
+    def validate_double_entry(self) -> Self:
+        """Check the participant amounts balance the proposal amount."""
+        check_double_entry(
+            self.amount,
+            [participant.amount for participant in self.participants],
+            currency=self.currency,
+        )
+        return self
+
+
+def check_double_entry(
+    amount: Decimal | Money,
+    amounts: Sequence[Decimal | Money],
+    *,
+    currency: str | None = None,
+) -> None:
+    """
+    Check the double-entry invariant of a proposal.
+
+    Args:
+        amount: Proposal amount
+        amounts: Amount of every participant
+        currency: Currency of the proposal, which Money amounts must be
+            in. Not checked when omitted.
+
+    Raises:
+        ValueError: When Money is of another currency, the amounts mix
+            Money and numbers, do not add up to zero, or the positive
+            ones do not add up to the proposal amount
+    """
+    if currency is not None:
+        check_currency(currency, [amount, *amounts])
+    if len({isinstance(value, Money) for value in (amount, *amounts)}) > 1:
+        raise ValueError("Amounts must be all Money or all numbers")
+    zero = amount * 0
+    if sum(amounts, zero) != zero:
+        raise ValueError("Participant amounts must add up to zero")
+    if sum((value for value in amounts if value > zero), zero) != amount:
+        raise ValueError(
+            "Positive participant amounts must add up to the proposal amount"
+        )
+
+
+def proposal_payload(
+    *,
+    currency: str,
+    amount: Decimal | Money,
+    participants: Sequence[ParticipantEntry],
+    description: str | None = None,
+    note: str | None = None,
+    meta_data: dict | None = None,
+) -> dict:
+    """
+    Build the body of a proposal from trusted values.
+
+    Skips per-field validation: the values must already be of the field
+    types. Only the double-entry invariant is checked, with the same
+    check as ``ProposalCreateSchema``. The body equals the JSON dump of
+    the equivalent ``ProposalCreateSchema``.
+
+    Args:
+        currency: Currency code
+        amount: Proposal amount
+        participants: Wallet ID, amount, hold ID and label of every
+            participant
+        description: Optional description
+        note: Optional note
+        meta_data: Optional metadata
+
+    Returns:
+        JSON-ready proposal body
+
+    Raises:
+        ValueError: When the participant amounts do not balance or Money
+            is of another currency
+    """
+    check_double_entry(
+        amount, [entry[1] for entry in participants], currency=currency
+    )
+    return {
+        "amount": str(amount),
+        "description": description,
+        "note": note,
+        "currency": currency,
+        "status": ProposalStatus.init.value,
+        "participants": [
+            {
+                "wallet_id": wallet_id,
+                "amount": str(value),
+                "hold_id": hold_id,
+                "label": label,
+            }
+            for wallet_id, value, hold_id, label in participants
+        ],
+        "meta_data": meta_data,
+    }
+
 
 class ProposalUpdateSchema(BaseModel):
     """Schema for updating proposals."""
@@ -0,0 +1,210 @@
+"""Client-side rate limiting for UFaaS service clients."""
+
+import asyncio
+import time
+from dataclasses import dataclass
+
+from .exceptions import RateLimitedError
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+@dataclass(slots=True, frozen=True)
+class RateLimitMetrics:
+    """Snapshot of a token bucket's metrics."""
+
+    queue_depth: int
+    max_queue_depth: int
+    acquired: int
+    rejected: int
+    delayed: int
+    total_wait: float
+    max_wait: float
+
+    @property
+    def mean_wait(self) -> float:
+        """Mean seconds waited per acquired token."""
+        return self.total_wait / self.acquired if self.acquired else 0.0
+
+
+class TokenBucket:
+    """
+    Async token bucket queueing callers in arrival order.
+
+    Callers reserve a token as they arrive and sleep until it is refilled,
+    so waits are first come, first served without a lock. A caller whose
+    wait would exceed ``max_wait`` is rejected instead of queued.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        *,
+        burst: int | None = None,
+        max_wait: float | None = None,
+    ) -> None:
+        """
+        Initialize TokenBucket.
+
+        Args:
+            name: Name of the limit, used in errors
+            rate: Tokens refilled per second
+            burst: Bucket capacity. Defaults to one second of tokens.
+            max_wait: Longest a caller may queue, in seconds. Callers
+                queue without bound when omitted.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.name = name
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self.max_wait = max_wait
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.acquired = 0
+        self.rejected = 0
+        self.delayed = 0
+        self.total_wait = 0.0
+        self.max_waited = 0.0
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    @property
+    def metrics(self) -> RateLimitMetrics:
+        """Snapshot of the bucket's metrics."""
+        return RateLimitMetrics(
+            queue_depth=self.queue_depth,
+            max_queue_depth=self.max_queue_depth,
+            acquired=self.acquired,
+            rejected=self.rejected,
+            delayed=self.delayed,
+            total_wait=self.total_wait,
+            max_wait=self.max_waited,
+        )
+
+    async def acquire(self) -> float:
+        """
+        Take a token, waiting for it when the bucket is empty.
+
+        Returns:
+            Seconds waited
+
+        Raises:
+            RateLimitedError: When the wait would exceed max_wait
+        """
+        now = time.monotonic()
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+        wait = max(0.0, (1 - self._tokens) / self.rate)
+        if self.max_wait is not None and wait > self.max_wait:
+            self.rejected += 1
+            raise RateLimitedError(self.name, wait)
+        self._tokens -= 1
+        if wait:
+            self.delayed += 1
+            self.queue_depth += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+            try:
+                await asyncio.sleep(wait)
+            except BaseException:
+                # Hand the reserved token to the callers queued behind.
+                self._tokens += 1
+                raise
+            finally:
+                self.queue_depth -= 1
+        self.acquired += 1
+        self.total_wait += wait
+        self.max_waited = max(self.max_waited, wait)
+        return wait
+
+
+class RateLimiter:
+    """
+    Token buckets per tenant and request class.
+
+    GET, HEAD and OPTIONS requests are reads; every other method is a
+    write. Share one limiter between clients, for example through an
+    AccountingClientPool, to shape each tenant's traffic as a whole.
+    """
+
+    def __init__(
+        self,
+        *,
+        read_rate: float | None = None,
+        write_rate: float | None = None,
+        read_burst: int | None = None,
+        write_burst: int | None = None,
+        max_wait: float | None = 1.0,
+    ) -> None:
+        """
+        Initialize RateLimiter.
+
+        Args:
+            read_rate: Reads per second per tenant. Unlimited when omitted.
+            write_rate: Writes per second per tenant. Unlimited when
+                omitted.
+            read_burst: Reads allowed at once. Defaults to read_rate.
+            write_burst: Writes allowed at once. Defaults to write_rate.
+            max_wait: Longest a request may queue, in seconds, before
+                RateLimitedError is raised. None queues without bound.
+        """
+        self.limits = {
+            "read": (read_rate, read_burst),
+            "write": (write_rate, write_burst),
+        }
+        self.max_wait = max_wait
+        self._buckets: dict[tuple[str, str], TokenBucket] = {}
+
+    @property
+    def metrics(self) -> dict[tuple[str, str], RateLimitMetrics]:
+        """Metrics of every bucket, keyed by (tenant_id, request class)."""
+        return {key: bucket.metrics for key, bucket in self._buckets.items()}
+
+    def bucket(self, tenant_id: str, kind: str) -> TokenBucket | None:
+        """
+        Get the bucket of a tenant and request class.
+
+        Args:
+            tenant_id: Tenant identifier
+            kind: ``read`` or ``write``
+
+        Returns:
+            Token bucket, or None when the class is unlimited
+        """
+        key = (tenant_id, kind)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            rate, burst = self.limits[kind]
+            if rate is None:
+                return None
+            bucket = TokenBucket(
+                f"{kind}:{tenant_id}",
+                rate,
+                burst=burst,
+                max_wait=self.max_wait,
+            )
+            self._buckets[key] = bucket
+        return bucket
+
+    async def acquire(self, tenant_id: str, method: str) -> float:
+        """
+        Wait for a tenant's token for a request.
+
+        Args:
+            tenant_id: Tenant identifier
+            method: HTTP method of the request
+
+        Returns:
+            Seconds waited
+
+        Raises:
+            RateLimitedError: When the wait would exceed max_wait
+        """
+        kind = "read" if method in READ_METHODS else "write"
+        bucket = self.bucket(tenant_id, kind)
+        if bucket is None:
+            return 0.0
+        return await bucket.acquire()
@@ -0,0 +1,148 @@
+"""Retry policy for UFaaS service clients."""
+
+import random
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+
+@dataclass(slots=True, frozen=True)
+class RetryAttempt:
+    """One attempt of a request sent under a retry policy."""
+
+    method: str
+    path: str
+    attempt: int
+    status_code: int | None
+    error: Exception | None
+    failed: bool
+    delay: float
+    will_retry: bool
+
+
+@dataclass(slots=True)
+class RetryStats:
+    """Counters of attempts made under a retry policy, safe across threads."""
+
+    attempts: int = 0
+    retries: int = 0
+    exhausted: int = 0
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def record(self, attempt: RetryAttempt) -> None:
+        """
+        Count an attempt.
+
+        Args:
+            attempt: Attempt to count
+        """
+        with self._lock:
+            self.attempts += 1
+            if attempt.will_retry:
+                self.retries += 1
+            elif attempt.failed:
+                self.exhausted += 1
+
+
+@dataclass(slots=True, frozen=True)
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter for transient failures.
+
+    Only idempotent methods are retried. Writes carrying an idempotency
+    key are retried too when ``retry_writes`` is set, which is only safe
+    against a server that deduplicates requests by that key. A
+    ``Retry-After`` header overrides the computed backoff.
+    """
+
+    attempts: int = 3
+    base_delay: float = 0.1
+    max_delay: float = 5.0
+    retry_statuses: frozenset[int] = frozenset({429, 502, 503, 504})
+    idempotent_methods: frozenset[str] = frozenset({
+        "GET",
+        "HEAD",
+        "OPTIONS",
+        "PUT",
+        "DELETE",
+    })
+    respect_retry_after: bool = True
+    retry_writes: bool = False
+    on_attempt: Callable[[RetryAttempt], None] | None = field(
+        default=None, compare=False
+    )
+
+    def allows(self, request: httpx.Request) -> bool:
+        """
+        Check whether a request may be retried.
+
+        Args:
+            request: Outgoing request
+
+        Returns:
+            True for idempotent methods, and for requests with an
+            idempotency key when writes are retried
+        """
+        if self.attempts < 2:
+            return False
+        if request.method in self.idempotent_methods:
+            return True
+        return self.retry_writes and IDEMPOTENCY_HEADER in request.headers
+
+    def is_transient(
+        self, response: httpx.Response | None, error: Exception | None
+    ) -> bool:
+        """
+        Check whether an attempt failed in a way worth retrying.
+
+        Args:
+            response: Response of the attempt, if any
+            error: Transport error of the attempt, if any
+
+        Returns:
+            True for transport errors and retryable status codes
+        """
+        if error is not None:
+            return True
+        return response.status_code in self.retry_statuses
+
+    def delay(self, attempt: int, response: httpx.Response | None) -> float:
+        """
+        Compute the wait before the next attempt.
+
+        Args:
+            attempt: Number of the failed attempt, starting at 1
+            response: Response of the failed attempt, if any
+
+        Returns:
+            Seconds to wait
+        """
+        if self.respect_retry_after and response is not None:
+            retry_after = _retry_after(response)
+            if retry_after is not None:
+                return min(retry_after, self.max_delay)
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)  # ruff:ignore[suspicious-non-cryptographic-random-usage]
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(moment.timestamp() - time.time(), 0.0)
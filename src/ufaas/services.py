@@ -1,25 +1,1790 @@
-"""Accounting service client for UFaaS."""
+"""Accounting service clients for UFaaS."""
 
+import asyncio
+import contextlib
+import inspect
 import os
+import time
+import uuid
+from collections.abc import (
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Generator,
+    Iterable,
+)
+from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
 
-import httpx
-from usso.utils import agent
+import httpx
+from fastapi_mongo_base.utils import bsontools
+from pydantic import BaseModel, ValidationError
+from usso.utils import agent
+
+from ._schemas import Items
+from .amounts import to_decimal
+from .auth import AgentTokenAuth
+from .batch import BatchItemResult, gather_bounded
+from .cache import TTLCache
+from .circuit import CircuitBreaker, CircuitBreakers
+from .exceptions import (
+    BatchItemError,
+    CircuitOpenError,
+    NotFoundError,
+    UFaaSError,
+)
+from .hold import (
+    HoldStatus,
+    WalletHoldBatchItem,
+    WalletHoldCreateSchema,
+    WalletHoldSchema,
+    WalletHoldUpdateSchema,
+)
+from .instrumentation import (
+    ATTEMPTS_EXTENSION,
+    PHASES_EXTENSION,
+    Instrumentation,
+    RequestEvent,
+    add_phase,
+    endpoint_name,
+)
+from .money import Money
+from .proposal import ProposalSchema, proposal_payload
+from .ratelimit import RateLimiter
+from .retry import IDEMPOTENCY_HEADER, RetryAttempt, RetryPolicy, RetryStats
+from .singleflight import SingleFlight, ThreadSingleFlight
+from .token_cache import TokenCache
+from .wallet import BalanceSchema, WalletDetailSchema, WalletUpdateSchema
+
+DEFAULT_PAGE_SIZE = 100
+
+# Literal path segments; every other segment is an identifier.
+_ENDPOINT_SEGMENTS = frozenset({"wallets", "holds", "proposals", "bulk"})
+
+ACCOUNTING_SCOPES = frozenset({
+    f"{action}:finance/accounting/{resource}"
+    for action in ("read", "create", "update")
+    for resource in ("wallet", "hold", "proposal")
+})
+
+type BalanceFallback = Callable[
+    [str, str], BalanceSchema | Awaitable[BalanceSchema | None] | None
+]
+
+
+@dataclass(slots=True, frozen=True)
+class _Call:
+    """Request of a flow, sent by the client's ``request`` method."""
+
+    method: str
+    url: str
+    kwargs: dict[str, object]
+
+
+type _Flow[T] = Generator[_Call, httpx.Response, T]
+"""
+Steps of one operation: yields its requests, receives their responses and
+returns its result. The clients only differ in how they send the requests.
+"""
+
+
+@dataclass(slots=True)
+class _Exchange:
+    """Response of a request, filled in by the block sending it."""
+
+    response: httpx.Response | None = None
+
+
+def _response_bytes(response: httpx.Response | None) -> int:
+    if response is None:
+        return 0
+    return response.num_bytes_downloaded or int(
+        response.headers.get("content-length", 0)
+    )
+
+
+def _copy_model[TSchema: BaseModel](model: TSchema) -> TSchema:
+    return model.model_copy(deep=True)
+
+
+def _idempotency_headers(idempotency_key: str | None) -> dict[str, str]:
+    if idempotency_key is None:
+        return {}
+    return {IDEMPOTENCY_HEADER: idempotency_key}
+
+
+def _copy_models[TSchema: BaseModel](models: list[TSchema]) -> list[TSchema]:
+    return [model.model_copy(deep=True) for model in models]
+
+
+def _http_settings(
+    *,
+    transport: httpx.BaseTransport | httpx.AsyncBaseTransport | None,
+    http2: bool,
+    limits: httpx.Limits | None,
+    keepalive_expiry: float | None,
+    timeout: float,
+    connect_timeout: float | None,
+    read_timeout: float | None,
+    pool_timeout: float | None,
+) -> dict[str, object]:
+    # httpx applies http2 and limits to the transport it builds, so they
+    # would be silently dropped next to a transport of the caller's.
+    if transport is not None and (
+        http2 or limits is not None or keepalive_expiry is not None
+    ):
+        raise ValueError(
+            "http2, limits and keepalive_expiry configure the default "
+            "transport; set them on the transport instead"
+        )
+    accounting_service_url = os.getenv(
+        "ACCOUNTING_SERVICE_URL", "https://wallets.uln.me"
+    )
+    phase_timeouts = {
+        phase: value
+        for phase, value in (
+            ("connect", connect_timeout),
+            ("read", read_timeout),
+            ("pool", pool_timeout),
+        )
+        if value is not None
+    }
+    limits = limits or httpx.Limits()
+    if keepalive_expiry is not None:
+        limits = httpx.Limits(
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+    return {
+        "base_url": f"{accounting_service_url}/api/accounting/v1",
+        "http2": http2,
+        "limits": limits,
+        "timeout": httpx.Timeout(timeout, **phase_timeouts),
+    }
+
+
+class _AccountingCore:
+    """
+    Request building, caching and decoding shared by the accounting clients.
+
+    Mixed into an httpx client. Every operation is written once as a flow
+    yielding its requests; AccountingClient and SyncAccountingClient only
+    send them, asynchronously or blocking, through ``_run``.
+    """
+
+    audience = "accounting"
+
+    def _setup(
+        self,
+        tenant_id: str,
+        *,
+        agent_id: str | None,
+        agent_private_key: str | None,
+        token_cache: TokenCache | None,
+        token_expiry_margin: float,
+        scopes: Iterable[str] | None,
+        learn_scopes: bool,
+        default_wallets: TTLCache[tuple[str, str | None], str] | None,
+        balance_cache_ttl: float | None,
+        coalesce_reads: bool,
+        single_flight: type[SingleFlight | ThreadSingleFlight],
+        retry_policy: RetryPolicy | None,
+        idempotent_results: TTLCache[tuple[str, str, str], BaseModel] | None,
+        circuit_breakers: CircuitBreakers | None,
+        balance_fallback: Callable | None,
+        instrumentation: Instrumentation | None,
+    ) -> None:
+        self.agent_id = agent_id or os.getenv("AGENT_ID") or ""
+        self.agent_private_key = (
+            agent_private_key or os.getenv("AGENT_PRIVATE_KEY") or ""
+        )
+        self.tenant_id = tenant_id
+        if not self.agent_id or not self.agent_private_key:
+            raise ValueError("agent_id and agent_private_key are required")
+        if token_cache is None:
+            token_cache = TokenCache(expiry_margin=token_expiry_margin)
+        self.token_cache = token_cache
+        self.scopes = frozenset(scopes or ())
+        self.learn_scopes = learn_scopes
+        if default_wallets is None:
+            default_wallets = TTLCache(ttl=300)
+        self.default_wallets = default_wallets
+        self.balances: TTLCache[tuple[str, str], BalanceSchema] | None = (
+            TTLCache(ttl=balance_cache_ttl) if balance_cache_ttl else None
+        )
+        self.inflight_reads = single_flight() if coalesce_reads else None
+        self.retry_policy = retry_policy
+        self.retry_stats = RetryStats()
+        if idempotent_results is None:
+            idempotent_results = TTLCache(maxsize=4096, ttl=3600)
+        self.idempotent_results = idempotent_results
+        self._idempotent_writes = single_flight()
+        self.circuit_breakers = circuit_breakers
+        self.balance_fallback = balance_fallback
+        self.instrumentation = instrumentation
+        if instrumentation is not None:
+            instrumentation.bind(self)
+
+    def auth(self, scopes: str | list[str]) -> AgentTokenAuth:
+        """
+        Build per-request authentication for the given scopes.
+
+        Args:
+            scopes: Permission scopes required by the request
+
+        Returns:
+            httpx auth flow attaching a bearer token to the request
+        """
+        return AgentTokenAuth(self.get_token, scopes)
+
+    def cache_stats(self) -> dict[str, tuple[int, int]]:
+        """
+        Report the hit and miss counters of the client's caches.
+
+        Coalesced reads count joined calls as hits and calls that went
+        to the server as misses.
+
+        Returns:
+            (hits, misses) per cache name
+        """
+        stats = {
+            "token": (
+                self.token_cache.hits + self.token_cache.coalesced,
+                self.token_cache.misses,
+            ),
+            "default_wallet": (
+                self.default_wallets.hits,
+                self.default_wallets.misses,
+            ),
+            "idempotent_result": (
+                self.idempotent_results.hits,
+                self.idempotent_results.misses,
+            ),
+        }
+        if self.balances is not None:
+            stats["balance"] = (self.balances.hits, self.balances.misses)
+        if self.inflight_reads is not None:
+            stats["read_coalescing"] = (
+                self.inflight_reads.collapsed,
+                self.inflight_reads.leaders,
+            )
+        return stats
+
+    def _token_request(
+        self, scopes: str | list[str]
+    ) -> tuple[tuple[str, str, frozenset[str], str], list[str]]:
+        if isinstance(scopes, str):
+            scopes = [scopes]
+
+        requested = self.scopes.union(scopes)
+        if self.learn_scopes:
+            self.scopes = requested
+        key = (self.tenant_id, self.agent_id, requested, self.audience)
+        return key, sorted(requested)
+
+    def _agent_jwt(self, scopes: list[str]) -> str:
+        return agent.generate_agent_jwt(
+            scopes=scopes,
+            aud=self.audience,
+            tenant_id=self.tenant_id,
+            agent_id=self.agent_id,
+            private_key=self.agent_private_key,
+        )
+
+    def _endpoint(self, request: httpx.Request) -> str:
+        return endpoint_name(
+            request.method,
+            request.url.path.removeprefix(self.base_url.path.rstrip("/")),
+            _ENDPOINT_SEGMENTS,
+        )
+
+    def _json(self, response: httpx.Response) -> object:
+        if self.instrumentation is None:
+            return response.json()
+        started = time.perf_counter()
+        data = response.json()
+        self.instrumentation.on_phase(
+            self.audience,
+            self._endpoint(response.request),
+            "decode",
+            time.perf_counter() - started,
+        )
+        return data
+
+    def _decode[TSchema: BaseModel](
+        self, response: httpx.Response, schema: type[TSchema]
+    ) -> TSchema:
+        """
+        Validate a response body straight from bytes into a model.
+
+        Args:
+            response: Response to decode
+            schema: Schema of the body
+
+        Returns:
+            Validated model
+        """
+        if self.instrumentation is None:
+            return schema.model_validate_json(response.content)
+        started = time.perf_counter()
+        model = schema.model_validate_json(response.content)
+        self.instrumentation.on_phase(
+            self.audience,
+            self._endpoint(response.request),
+            "decode",
+            time.perf_counter() - started,
+        )
+        return model
+
+    def _decode_items[TSchema: BaseModel](
+        self, response: httpx.Response, schema: type[TSchema]
+    ) -> list[TSchema]:
+        return self._decode(response, Items[schema]).items
+
+    def _request_event(
+        self,
+        request: httpx.Request,
+        response: httpx.Response | None,
+        error: Exception | None,
+    ) -> RequestEvent:
+        return RequestEvent(
+            client=self.audience,
+            method=request.method,
+            endpoint=self._endpoint(request),
+            status_code=response.status_code if response else None,
+            error=type(error).__name__ if error else None,
+            attempts=request.extensions.get(ATTEMPTS_EXTENSION, 1),
+            phases=request.extensions[PHASES_EXTENSION],
+            request_bytes=int(request.headers.get("content-length", 0)),
+            response_bytes=_response_bytes(response),
+        )
+
+    @contextlib.contextmanager
+    def _observed(self, request: httpx.Request) -> Generator[_Exchange]:
+        """Report a request and its final outcome to the instrumentation."""
+        request.extensions[PHASES_EXTENSION] = {}
+        self.instrumentation.on_request(self.audience, request)
+        exchange = _Exchange()
+        error = None
+        try:
+            yield exchange
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            self.instrumentation.on_response(
+                self._request_event(request, exchange.response, error)
+            )
+
+    def _retry_delay(
+        self,
+        policy: RetryPolicy,
+        request: httpx.Request,
+        attempt: int,
+        response: httpx.Response | None,
+        error: Exception | None,
+    ) -> float | None:
+        """
+        Settle one attempt of a request under the retry policy.
+
+        Args:
+            policy: Retry policy of the request
+            request: Request sent
+            attempt: Number of the attempt, starting at 1
+            response: Response of the attempt, if any
+            error: Transport error of the attempt, if any
+
+        Returns:
+            Seconds to wait before the next attempt, or None when the
+            response is final
+
+        Raises:
+            httpx.TransportError: The error of a final failed attempt
+        """
+        failed = policy.is_transient(response, error)
+        will_retry = failed and attempt < policy.attempts
+        outcome = RetryAttempt(
+            method=request.method,
+            path=request.url.path,
+            attempt=attempt,
+            status_code=response.status_code if response else None,
+            error=error,
+            failed=failed,
+            delay=policy.delay(attempt, response) if will_retry else 0.0,
+            will_retry=will_retry,
+        )
+        self.retry_stats.record(outcome)
+        if policy.on_attempt is not None:
+            policy.on_attempt(outcome)
+        if will_retry:
+            return outcome.delay
+        if error is not None:
+            raise error
+        return None
+
+    def _breaker(self, request: httpx.Request) -> CircuitBreaker | None:
+        if self.circuit_breakers is None:
+            return None
+        return self.circuit_breakers[self._endpoint(request)]
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _guarded(breaker: CircuitBreaker) -> Generator[_Exchange]:
+        """
+        Admit an attempt through a circuit breaker and record its outcome.
+
+        Transport errors, 5xx responses and, when configured, slow
+        responses count as failures of the endpoint.
+
+        Raises:
+            CircuitOpenError: When the endpoint's circuit is open
+        """
+        breaker.acquire()
+        exchange = _Exchange()
+        started = time.monotonic()
+        try:
+            yield exchange
+        except httpx.TransportError:
+            breaker.record(ok=False, duration=time.monotonic() - started)
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+        breaker.record(
+            ok=exchange.response.status_code < 500,
+            duration=time.monotonic() - started,
+        )
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _network_phase(request: httpx.Request) -> Generator[None]:
+        phases = request.extensions[PHASES_EXTENSION]
+        token = phases.get("token", 0.0)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            # Token exchange happens inside send, in the auth flow.
+            token = phases.get("token", 0.0) - token
+            add_phase(
+                request, "network", time.perf_counter() - started - token
+            )
+
+    def _call(
+        self, method: str, url: str, scope: str, **kwargs: object
+    ) -> _Call:
+        return _Call(method, url, {"auth": self.auth(scope), **kwargs})
+
+    def _read[T](
+        self,
+        key: tuple | None,
+        flow: _Flow[T],
+        copy: Callable[[T], T],
+    ) -> T | Awaitable[T]:
+        """
+        Run a read flow, sharing it with identical reads in flight.
+
+        Args:
+            key: Identity of the read, or None to always run it alone
+            flow: Flow performing the read
+            copy: Copies the result for callers joining the read
+
+        Returns:
+            Result of the read; an awaitable of it on the async client
+        """
+        if key is None or self.inflight_reads is None:
+            return self._run(flow)
+        return self.inflight_reads.do(key, lambda: self._run(flow), copy=copy)
+
+    def _idempotent[TSchema: BaseModel](
+        self, path: str, idempotency_key: str, flow: _Flow[TSchema]
+    ) -> TSchema | Awaitable[TSchema]:
+        """
+        Run a write once per idempotency key.
+
+        A stored result is returned for a key that already succeeded, and
+        concurrent calls with the same key share one request. Failures are
+        not stored, so the caller may retry with the same key.
+
+        Args:
+            path: Endpoint of the write
+            idempotency_key: Idempotency key of the write
+            flow: Flow performing the write
+
+        Returns:
+            Result of the write; an awaitable of it on the async client
+        """
+        key = (self.tenant_id, path, idempotency_key)
+        return self._idempotent_writes.do(
+            key,
+            lambda: self._run(self._stored_flow(key, flow)),
+            copy=_copy_model,
+        )
+
+    def _stored_flow[TSchema: BaseModel](
+        self, key: tuple[str, str, str], flow: _Flow[TSchema]
+    ) -> _Flow[TSchema]:
+        stored = self.idempotent_results.get(key)
+        if stored is not None:
+            return _copy_model(stored)
+        result = yield from flow
+        self.idempotent_results.set(key, _copy_model(result))
+        return result
+
+    def _page[TSchema: BaseModel](
+        self, response: httpx.Response, schema: type[TSchema] | None
+    ) -> tuple[list[TSchema] | list[dict], int | None, int | None]:
+        if schema is None:
+            page = self._json(response)
+            return page.get("items", []), page.get("total"), page.get("limit")
+        page = self._decode(response, Items[schema])
+        return page.items, page.total, page.limit
+
+    @staticmethod
+    def _has_more(
+        items: list,
+        offset: int,
+        total: int | None,
+        limit: int | None,
+        page_size: int,
+    ) -> bool:
+        return bool(items) and (
+            offset < total
+            if total is not None
+            else len(items) >= (limit or page_size)
+        )
+
+    @staticmethod
+    def _first_uid(items: list) -> object:
+        if not items:
+            return None
+        item = items[0]
+        if isinstance(item, dict):
+            return item.get("uid")
+        return getattr(item, "uid", None)
+
+    def _default_wallet(
+        self, response: httpx.Response, default_key: tuple[str, str | None]
+    ) -> WalletDetailSchema:
+        for item in self._json(response).get("items", []):
+            if item.get("is_default"):
+                wallet = WalletDetailSchema.model_validate(item)
+                self.default_wallets.set(default_key, wallet.uid)
+                return self._cache_balances(wallet)
+
+        raise NotFoundError("Wallet not found")
+
+    def _cached_balance(
+        self, wallet_id: str, currency: str
+    ) -> BalanceSchema | None:
+        if self.balances is None:
+            return None
+        balance = self.balances.get((wallet_id, currency))
+        return None if balance is None else _copy_model(balance)
+
+    def _cache_balances(
+        self, wallet: WalletDetailSchema
+    ) -> WalletDetailSchema:
+        if self.balances is not None:
+            for currency, balance in wallet.balance.items():
+                self.balances.set((wallet.uid, currency), _copy_model(balance))
+        return wallet
+
+    def _adjust_held_balance(
+        self, wallet_id: str, currency: str, amount: Decimal
+    ) -> None:
+        if self.balances is None:
+            return
+        balance = self.balances.get((wallet_id, currency))
+        if balance is not None:
+            self.balances.set(
+                (wallet_id, currency),
+                balance.model_copy(
+                    update={
+                        "held": balance.held + amount,
+                        "available": balance.available - amount,
+                    }
+                ),
+            )
+
+    def _forget_balances(
+        self, wallet_ids: Iterable[str], currency: str
+    ) -> None:
+        if self.balances is not None:
+            for wallet_id in wallet_ids:
+                self.balances.pop((wallet_id, currency))
+
+    @staticmethod
+    def _hold_filters(
+        currency: str | None, status: HoldStatus | None
+    ) -> dict[str, object]:
+        params: dict[str, object] = {}
+        if currency is not None:
+            params["currency"] = currency
+        if status is not None:
+            params["status"] = status
+        return params
+
+    def _updated_wallet(
+        self, response: httpx.Response, data: WalletUpdateSchema
+    ) -> WalletDetailSchema:
+        wallet = self._decode(response, WalletDetailSchema)
+        if data.is_default is not None:
+            self.default_wallets.pop((self.tenant_id, None))
+            self.default_wallets.pop((self.tenant_id, wallet.workspace_id))
+            if wallet.is_default:
+                self.default_wallets.set(
+                    (self.tenant_id, wallet.workspace_id), wallet.uid
+                )
+        return wallet
+
+    def _created_hold(
+        self, wallet_id: str, response: httpx.Response
+    ) -> WalletHoldSchema:
+        hold = self._decode(response, WalletHoldSchema)
+        self._adjust_held_balance(wallet_id, hold.currency, hold.amount)
+        return hold
+
+    def _released_hold(
+        self, wallet_id: str, response: httpx.Response
+    ) -> WalletHoldSchema:
+        hold = self._decode(response, WalletHoldSchema)
+        # The previous hold status is unknown, so the release cannot be
+        # applied to the cached balance reliably.
+        self._forget_balances([wallet_id], hold.currency)
+        return hold
+
+    def _created_proposal(self, response: httpx.Response) -> ProposalSchema:
+        proposal = self._decode(response, ProposalSchema)
+        self._forget_balances(
+            (participant.wallet_id for participant in proposal.participants),
+            proposal.currency,
+        )
+        return proposal
+
+    @staticmethod
+    def _held_amount(item: dict, currency: str, status: HoldStatus) -> Decimal:
+        if item.get("currency") != currency or item.get("status") != status:
+            return Decimal(0)
+        return bsontools.decimal_amount(item.get("amount") or 0)
+
+    @staticmethod
+    def _keyed_hold(hold: WalletHoldBatchItem) -> WalletHoldBatchItem:
+        meta_data = hold.meta_data or {}
+        if meta_data.get("idempotency_key"):
+            return hold
+        return hold.model_copy(
+            update={
+                "meta_data": {
+                    **meta_data,
+                    "idempotency_key": uuid.uuid4().hex,
+                }
+            }
+        )
+
+    @staticmethod
+    def _new_hold(
+        currency: str,
+        amount: float | Decimal | Money,
+        expires_at: datetime,
+        idempotency_key: str,
+    ) -> WalletHoldCreateSchema:
+        return WalletHoldCreateSchema(
+            currency=currency,
+            amount=amount,
+            expires_at=expires_at,
+            status=HoldStatus.ACTIVE,
+            meta_data={"idempotency_key": idempotency_key},
+        )
+
+    @staticmethod
+    def _new_proposal(
+        *,
+        from_wallet_id: str,
+        to_wallet_ids: list[str],
+        currency: str,
+        amounts: list[float | Decimal | Money],
+        description: str | None,
+        note: str | None,
+        hold_id: str | None,
+        from_label: str | None,
+        to_labels: list[str | None] | None,
+        idempotency_key: str,
+    ) -> dict:
+        # The values come from this client, so the body is assembled
+        # directly instead of validating and dumping a schema per
+        # participant; proposal_payload still checks the balances.
+        money = [isinstance(amount, Money) for amount in amounts]
+        if any(money) and not all(money):
+            raise ValueError("amounts must be all Money or all numbers")
+        if any(money):
+            total_amount = Money.total(amounts, currency)
+        else:
+            amounts = [to_decimal(amount) for amount in amounts]
+            total_amount = sum(amounts, Decimal(0))
+        to_labels = to_labels or []
+        return proposal_payload(
+            currency=currency,
+            amount=total_amount,
+            participants=[
+                (from_wallet_id, -total_amount, hold_id, from_label),
+                *[
+                    (
+                        to_wallet_id,
+                        amounts[i],
+                        None,
+                        to_labels[i] if i < len(to_labels) else None,
+                    )
+                    for i, to_wallet_id in enumerate(to_wallet_ids)
+                ],
+            ],
+            description=description,
+            note=note,
+            meta_data={"idempotency_key": idempotency_key},
+        )
+
+    def _get_wallet_flow(
+        self,
+        wallet_id: str | None,
+        *,
+        workspace_id: str | None,
+        **kwargs: object,
+    ) -> _Flow[WalletDetailSchema]:
+        params = kwargs.pop("params", {}) or {}
+        if workspace_id is not None:
+            params.update({"workspace_id": workspace_id})
+
+        def read(path: str) -> _Call:
+            return self._call(
+                "GET",
+                path,
+                "read:finance/accounting/wallet",
+                params=params,
+                **kwargs,
+            )
+
+        default_key = (self.tenant_id, workspace_id)
+        if not wallet_id:
+            default_id = self.default_wallets.get(default_key)
+            if default_id is not None:
+                response = yield read(f"/wallets/{default_id}")
+                if response.status_code != 404:
+                    response.raise_for_status()
+                    return self._cache_balances(
+                        self._decode(response, WalletDetailSchema)
+                    )
+                self.default_wallets.pop(default_key)
+
+        response = yield read(
+            f"/wallets/{wallet_id}" if wallet_id else "/wallets"
+        )
+        response.raise_for_status()
+        if wallet_id:
+            return self._cache_balances(
+                self._decode(response, WalletDetailSchema)
+            )
+        return self._default_wallet(response, default_key)
+
+    def _get_wallets_flow(
+        self, *, workspace_id: str | None, **kwargs: object
+    ) -> _Flow[list[WalletDetailSchema]]:
+        params = kwargs.pop("params", {}) or {}
+        if workspace_id is not None:
+            params.update({"workspace_id": workspace_id})
+        response = yield self._call(
+            "GET",
+            "/wallets",
+            "read:finance/accounting/wallet",
+            params=params,
+            **kwargs,
+        )
+        response.raise_for_status()
+        return self._decode_items(response, WalletDetailSchema)
+
+    def _update_wallet_flow(
+        self, wallet_id: str, data: WalletUpdateSchema
+    ) -> _Flow[WalletDetailSchema]:
+        response = yield self._call(
+            "PATCH",
+            f"/wallets/{wallet_id}",
+            "update:finance/accounting/wallet",
+            json=data.model_dump(mode="json"),
+        )
+        response.raise_for_status()
+        return self._updated_wallet(response, data)
+
+    def _page_flow[TSchema: BaseModel](
+        self,
+        path: str,
+        scope: str,
+        schema: type[TSchema] | None,
+        params: dict[str, object],
+        offset: int,
+        page_size: int,
+    ) -> _Flow[tuple[list[TSchema] | list[dict], int | None, int | None]]:
+        response = yield self._call(
+            "GET",
+            path,
+            scope,
+            params={**params, "offset": offset, "limit": page_size},
+        )
+        response.raise_for_status()
+        return self._page(response, schema)
+
+    def _get_holds_flow(self, wallet_id: str) -> _Flow[list[WalletHoldSchema]]:
+        response = yield self._call(
+            "GET",
+            f"/wallets/{wallet_id}/holds",
+            "read:finance/accounting/hold",
+        )
+        response.raise_for_status()
+        return self._decode_items(response, WalletHoldSchema)
+
+    def _create_hold_flow(
+        self,
+        wallet_id: str,
+        data: WalletHoldCreateSchema,
+        idempotency_key: str,
+    ) -> _Flow[WalletHoldSchema]:
+        response = yield self._call(
+            "POST",
+            f"/wallets/{wallet_id}/holds",
+            "create:finance/accounting/hold",
+            json=data.model_dump(mode="json"),
+            headers=_idempotency_headers(idempotency_key),
+        )
+        response.raise_for_status()
+        return self._created_hold(wallet_id, response)
+
+    def _release_hold_flow(
+        self, wallet_id: str, hold_id: str
+    ) -> _Flow[WalletHoldSchema]:
+        response = yield self._call(
+            "PATCH",
+            f"/wallets/{wallet_id}/holds/{hold_id}",
+            "update:finance/accounting/hold",
+            json=WalletHoldUpdateSchema(status=HoldStatus.RELEASED).model_dump(
+                mode="json"
+            ),
+        )
+        response.raise_for_status()
+        return self._released_hold(wallet_id, response)
+
+    def _create_proposal_flow(
+        self, data: dict, idempotency_key: str
+    ) -> _Flow[ProposalSchema]:
+        response = yield self._call(
+            "POST",
+            "/proposals",
+            "create:finance/accounting/proposal",
+            json=data,
+            headers=_idempotency_headers(idempotency_key),
+        )
+        response.raise_for_status()
+        return self._created_proposal(response)
+
+    def _create_hold(
+        self,
+        wallet_id: str,
+        currency: str,
+        amount: float | Decimal | Money,
+        expires_at: datetime,
+        idempotency_key: str | None,
+    ) -> WalletHoldSchema | Awaitable[WalletHoldSchema]:
+        idempotency_key = idempotency_key or uuid.uuid4().hex
+        return self._idempotent(
+            f"/wallets/{wallet_id}/holds",
+            idempotency_key,
+            self._create_hold_flow(
+                wallet_id,
+                self._new_hold(currency, amount, expires_at, idempotency_key),
+                idempotency_key,
+            ),
+        )
+
+    def _create_proposal(
+        self,
+        *,
+        from_wallet_id: str,
+        to_wallet_ids: list[str],
+        currency: str,
+        amounts: list[float | Decimal | Money],
+        description: str | None,
+        note: str | None,
+        hold_id: str | None,
+        from_label: str | None,
+        to_labels: list[str | None] | None,
+        idempotency_key: str | None,
+    ) -> ProposalSchema | Awaitable[ProposalSchema]:
+        idempotency_key = idempotency_key or uuid.uuid4().hex
+        data = self._new_proposal(
+            from_wallet_id=from_wallet_id,
+            to_wallet_ids=to_wallet_ids,
+            currency=currency,
+            amounts=amounts,
+            description=description,
+            note=note,
+            hold_id=hold_id,
+            from_label=from_label,
+            to_labels=to_labels,
+            idempotency_key=idempotency_key,
+        )
+        return self._idempotent(
+            "/proposals",
+            idempotency_key,
+            self._create_proposal_flow(data, idempotency_key),
+        )
+
+
+class AccountingClient(_AccountingCore, httpx.AsyncClient):
+    """Async client for accounting service operations."""
+
+    bulk_holds_path = "/holds/bulk"
+
+    def __init__(
+        self,
+        tenant_id: str,
+        *,
+        agent_id: str | None = None,
+        agent_private_key: str | None = None,
+        token_cache: TokenCache | None = None,
+        token_expiry_margin: float = 30.0,
+        scopes: Iterable[str] | None = None,
+        learn_scopes: bool = False,
+        transport: httpx.AsyncBaseTransport | None = None,
+        http2: bool = False,
+        limits: httpx.Limits | None = None,
+        keepalive_expiry: float | None = None,
+        timeout: float = 5.0,
+        connect_timeout: float | None = None,
+        read_timeout: float | None = None,
+        pool_timeout: float | None = None,
+        default_wallets: TTLCache[tuple[str, str | None], str] | None = None,
+        balance_cache_ttl: float | None = None,
+        coalesce_reads: bool = True,
+        bulk_holds: bool | None = None,
+        retry_policy: RetryPolicy | None = RetryPolicy(),
+        idempotent_results: TTLCache[tuple[str, str, str], BaseModel]
+        | None = None,
+        circuit_breakers: CircuitBreakers | None = None,
+        balance_fallback: BalanceFallback | None = None,
+        rate_limiter: RateLimiter | None = None,
+        instrumentation: Instrumentation | None = None,
+    ) -> None:
+        """
+        Initialize AccountingClient.
+
+        Args:
+            tenant_id: Tenant identifier for authentication
+            agent_id: Agent ID. Defaults to AGENT_ID env var.
+            agent_private_key: Private key for signing.
+                Defaults to AGENT_PRIVATE_KEY env var.
+            token_cache: Token cache to share between clients.
+                A private cache is created when omitted.
+            token_expiry_margin: Seconds before expiry at which cached
+                tokens are refreshed. Ignored when token_cache is given.
+            scopes: Scopes minted into every token, so one token covers
+                a whole workflow. Use ACCOUNTING_SCOPES for all of them.
+            learn_scopes: Add every requested scope to ``scopes`` so
+                later tokens cover the union of scopes used so far.
+            transport: Transport to send requests through, for example
+                one shared by an AccountingClientPool. Configure its
+                HTTP/2 and limits on the transport itself.
+            http2: Multiplex concurrent requests over HTTP/2 connections.
+                Requires the ``http2`` extra.
+            limits: Connection pool limits
+            keepalive_expiry: Seconds an idle connection is kept alive.
+                Overrides the value in limits.
+            timeout: Default timeout for every phase of a request
+            connect_timeout: Connection timeout. Defaults to timeout.
+            read_timeout: Read timeout. Defaults to timeout.
+            pool_timeout: Timeout waiting for a pooled connection.
+                Defaults to timeout.
+            default_wallets: Cache of default wallet IDs keyed by
+                (tenant_id, workspace_id). A five-minute cache is created
+                when omitted.
+            balance_cache_ttl: Seconds wallet balances are cached for
+                get_balance. Balance caching is disabled when omitted.
+            coalesce_reads: Share one request between identical
+                concurrent get_wallet, get_wallets and get_holds calls.
+            bulk_holds: Whether the server offers the bulk holds endpoint.
+                Detected on the first batch when omitted.
+            retry_policy: Policy retrying transient failures of idempotent
+                requests. Writes are retried only under
+                ``RetryPolicy(retry_writes=True)``, which needs a server
+                deduplicating them by Idempotency-Key. Pass None to
+                disable retries.
+            idempotent_results: Cache of created holds and proposals keyed
+                by (tenant_id, path, idempotency_key), so repeated writes
+                return the stored result. A one-hour cache is created
+                when omitted.
+            circuit_breakers: Breakers failing requests fast with
+                CircuitOpenError while an endpoint is failing or slow.
+                Share one instance between clients to share their state.
+                Circuit breaking is disabled when omitted.
+            balance_fallback: Called with (wallet_id, currency) by
+                get_balance when the circuit is open, for example to serve
+                a stale balance from another cache. May be a coroutine
+                function.
+            rate_limiter: Token buckets shaping this tenant's reads and
+                writes. Share one limiter between clients to limit each
+                tenant as a whole. Rate limiting is disabled when omitted.
+            instrumentation: Receives per-request events with phase
+                timings (queue, token, network, backoff, decode), payload
+                sizes and attempt counts, and reads the client's cache
+                counters. Disabled when omitted.
+
+        Raises:
+            ValueError: When transport is given together with http2,
+                limits or keepalive_expiry, which only configure the
+                default transport
+        """
+        super().__init__(
+            transport=transport,
+            **_http_settings(
+                transport=transport,
+                http2=http2,
+                limits=limits,
+                keepalive_expiry=keepalive_expiry,
+                timeout=timeout,
+                connect_timeout=connect_timeout,
+                read_timeout=read_timeout,
+                pool_timeout=pool_timeout,
+            ),
+        )
+        self.bulk_holds = bulk_holds
+        self.rate_limiter = rate_limiter
+        self._setup(
+            tenant_id,
+            agent_id=agent_id,
+            agent_private_key=agent_private_key,
+            token_cache=token_cache,
+            token_expiry_margin=token_expiry_margin,
+            scopes=scopes,
+            learn_scopes=learn_scopes,
+            default_wallets=default_wallets,
+            balance_cache_ttl=balance_cache_ttl,
+            coalesce_reads=coalesce_reads,
+            single_flight=SingleFlight,
+            retry_policy=retry_policy,
+            idempotent_results=idempotent_results,
+            circuit_breakers=circuit_breakers,
+            balance_fallback=balance_fallback,
+            instrumentation=instrumentation,
+        )
+
+    async def get_token(self, scopes: str | list[str]) -> str:
+        """
+        Get authentication token for accounting service.
+
+        Tokens are cached per (tenant_id, agent_id, scopes, audience) and
+        reused
+        until shortly before they expire. The token is minted for the
+        union of the requested and the client's declared scopes.
+
+        Args:
+            scopes: Permission scopes required
+
+        Returns:
+            JWT token string
+        """
+        key, requested = self._token_request(scopes)
+        return await self.token_cache.get_or_fetch(
+            key, lambda: self._exchange_token(requested)
+        )
+
+    async def _exchange_token(self, scopes: list[str]) -> str:
+        return await agent.get_agent_token_async(self._agent_jwt(scopes))
+
+    async def send(
+        self, request: httpx.Request, **kwargs: object
+    ) -> httpx.Response:
+        """
+        Send a request, retrying transient failures under the retry policy.
+
+        Args:
+            request: Request to send
+            **kwargs: Arguments of ``httpx.AsyncClient.send``
+
+        Returns:
+            Response of the last attempt
+        """
+        if self.instrumentation is None:
+            return await self._send_retrying(request, **kwargs)
+        with self._observed(request) as exchange:
+            exchange.response = await self._send_retrying(request, **kwargs)
+        return exchange.response
+
+    async def _send_retrying(
+        self, request: httpx.Request, **kwargs: object
+    ) -> httpx.Response:
+        policy = self.retry_policy
+        if policy is None or not policy.allows(request):
+            return await self._send_once(request, **kwargs)
+
+        attempt = 0
+        while True:
+            attempt += 1
+            request.extensions[ATTEMPTS_EXTENSION] = attempt
+            response, error = None, None
+            try:
+                response = await self._send_once(request, **kwargs)
+            except httpx.TransportError as exc:
+                error = exc
+            delay = self._retry_delay(
+                policy, request, attempt, response, error
+            )
+            if delay is None:
+                return response
+            if response is not None:
+                await response.aclose()
+            await asyncio.sleep(delay)
+            add_phase(request, "backoff", delay)
+
+    async def _send_once(
+        self, request: httpx.Request, **kwargs: object
+    ) -> httpx.Response:
+        """
+        Send one attempt through the rate limiter and circuit breaker.
+
+        The attempt first waits for the tenant's rate limit.
+
+        Args:
+            request: Request to send
+            **kwargs: Arguments of ``httpx.AsyncClient.send``
+
+        Returns:
+            Response of the attempt
+
+        Raises:
+            RateLimitedError: When the rate limit cannot be met in time
+            CircuitOpenError: When the endpoint's circuit is open
+        """
+        if self.rate_limiter is not None:
+            add_phase(
+                request,
+                "queue",
+                await self.rate_limiter.acquire(
+                    self.tenant_id, request.method
+                ),
+            )
+        breaker = self._breaker(request)
+        if breaker is None:
+            return await self._transmit(request, **kwargs)
+        with self._guarded(breaker) as exchange:
+            exchange.response = await self._transmit(request, **kwargs)
+        return exchange.response
+
+    async def _transmit(
+        self, request: httpx.Request, **kwargs: object
+    ) -> httpx.Response:
+        if PHASES_EXTENSION not in request.extensions:
+            return await super().send(request, **kwargs)
+        with self._network_phase(request):
+            return await super().send(request, **kwargs)
+
+    async def _run[T](self, flow: _Flow[T]) -> T:
+        """
+        Send the requests of a flow and return its result.
+
+        Args:
+            flow: Flow of the operation
+
+        Returns:
+            Value returned by the flow
+        """
+        try:
+            call = next(flow)
+            while True:
+                response = await self.request(
+                    call.method, call.url, **call.kwargs
+                )
+                call = flow.send(response)
+        except StopIteration as stop:
+            return stop.value
+
+    async def get_wallet(
+        self,
+        wallet_id: str | None = None,
+        *,
+        workspace_id: str | None = None,
+        **kwargs: object,
+    ) -> WalletDetailSchema:
+        """
+        Get wallet information.
+
+        Args:
+            wallet_id: Specific wallet ID (optional)
+            workspace_id: Workspace ID filter (optional)
+            **kwargs: Additional keyword arguments
+
+        Returns:
+            Wallet detail schema
+
+        Raises:
+            NotFoundError: When wallet not found
+        """
+        return await self._read(
+            None if kwargs else ("get_wallet", wallet_id, workspace_id),
+            self._get_wallet_flow(
+                wallet_id, workspace_id=workspace_id, **kwargs
+            ),
+            _copy_model,
+        )
+
+    async def get_balance(
+        self, wallet_id: str, currency: str
+    ) -> BalanceSchema | None:
+        """
+        Get the balance of a wallet in one currency.
+
+        Served from the balance cache when enabled and fresh; otherwise
+        the wallet is fetched and its balances are cached. While the
+        wallet endpoint's circuit is open, the balance fallback is used
+        when configured.
+
+        Args:
+            wallet_id: Wallet identifier
+            currency: Currency code
+
+        Returns:
+            Balance schema, or None when the wallet has no such balance
+        """
+        balance = self._cached_balance(wallet_id, currency)
+        if balance is not None:
+            return balance
+        try:
+            wallet = await self.get_wallet(wallet_id)
+        except CircuitOpenError:
+            if self.balance_fallback is None:
+                raise
+            balance = self.balance_fallback(wallet_id, currency)
+            if inspect.isawaitable(balance):
+                balance = await balance
+            return balance
+        return wallet.balance.get(currency)
+
+    async def update_wallet(
+        self, wallet_id: str, data: WalletUpdateSchema
+    ) -> WalletDetailSchema:
+        """
+        Update a wallet.
+
+        Changing ``is_default`` invalidates the cached default wallet of
+        the wallet's workspace.
+
+        Args:
+            wallet_id: Wallet identifier
+            data: Fields to update
+
+        Returns:
+            Updated wallet detail schema
+        """
+        return await self._run(self._update_wallet_flow(wallet_id, data))
+
+    async def get_wallets(
+        self,
+        *,
+        workspace_id: str | None = None,
+        **kwargs: object,
+    ) -> list[WalletDetailSchema]:
+        """
+        Get all wallets for a workspace.
+
+        Args:
+            workspace_id: Workspace ID filter (optional)
+            **kwargs: Additional keyword arguments
+
+        Returns:
+            List of wallet detail schemas
+        """
+        return await self._read(
+            None if kwargs else ("get_wallets", workspace_id),
+            self._get_wallets_flow(workspace_id=workspace_id, **kwargs),
+            _copy_models,
+        )
+
+    async def _iter_pages[TSchema: BaseModel](
+        self,
+        path: str,
+        scope: str,
+        schema: type[TSchema] | None,
+        params: dict[str, object],
+        page_size: int,
+    ) -> AsyncGenerator[TSchema | dict]:
+        """
+        Walk an offset/limit paginated endpoint lazily.
+
+        The next page is requested while the caller consumes the current
+        one, so at most two pages are held in memory. Stops at a page
+        starting with the same item as the previous one, so a server
+        ignoring the offset cannot loop forever.
+
+        Args:
+            path: Endpoint path
+            scope: Permission scope required by the endpoint
+            schema: Schema of the page items, or None for raw dicts
+            params: Query parameters sent with every page
+            page_size: Number of items requested per page
+
+        Yields:
+            Page items, validated when a schema is given
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be positive")
+
+        def fetch(
+            offset: int,
+        ) -> Awaitable[
+            tuple[list[TSchema] | list[dict], int | None, int | None]
+        ]:
+            return self._run(
+                self._page_flow(path, scope, schema, params, offset, page_size)
+            )
+
+        offset, previous = 0, None
+        items, total, limit = await fetch(offset)
+        while True:
+            first = self._first_uid(items)
+            if first is not None and first == previous:
+                return
+            previous = first
+            offset += len(items)
+            has_more = self._has_more(items, offset, total, limit, page_size)
+            next_page = (
+                asyncio.create_task(fetch(offset)) if has_more else None
+            )
+            try:
+                for item in items:
+                    yield item
+            except BaseException:
+                if next_page is not None:
+                    next_page.cancel()
+                raise
+            if next_page is None:
+                return
+            items, total, limit = await next_page
+
+    def iter_wallets(
+        self,
+        *,
+        workspace_id: str | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> AsyncGenerator[WalletDetailSchema]:
+        """
+        Iterate over all wallets, fetching pages lazily.
+
+        Args:
+            workspace_id: Workspace ID filter (optional)
+            page_size: Number of wallets requested per page
+
+        Returns:
+            Async iterator of wallet detail schemas
+        """
+        params = {}
+        if workspace_id is not None:
+            params["workspace_id"] = workspace_id
+        return self._iter_pages(
+            "/wallets",
+            "read:finance/accounting/wallet",
+            WalletDetailSchema,
+            params,
+            page_size,
+        )
+
+    def iter_holds(
+        self,
+        wallet_id: str,
+        *,
+        currency: str | None = None,
+        status: HoldStatus | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> AsyncGenerator[WalletHoldSchema]:
+        """
+        Iterate over all holds of a wallet, fetching pages lazily.
+
+        Args:
+            wallet_id: Wallet identifier
+            currency: Currency filter applied by the server (optional)
+            status: Hold status filter applied by the server (optional)
+            page_size: Number of holds requested per page
+
+        Returns:
+            Async iterator of wallet hold schemas
+        """
+        return self._iter_pages(
+            f"/wallets/{wallet_id}/holds",
+            "read:finance/accounting/hold",
+            WalletHoldSchema,
+            self._hold_filters(currency, status),
+            page_size,
+        )
+
+    async def get_holds(self, wallet_id: str) -> list[WalletHoldSchema]:
+        """
+        Get holds for a wallet.
+
+        Args:
+            wallet_id: Wallet identifier
+
+        Returns:
+            List of wallet hold schemas
+        """
+        return await self._read(
+            ("get_holds", wallet_id),
+            self._get_holds_flow(wallet_id),
+            _copy_models,
+        )
+
+    async def total_held_amount(
+        self,
+        wallet_id: str,
+        currency: str,
+        status: HoldStatus = HoldStatus.ACTIVE,
+        *,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Decimal:
+        """
+        Calculate total held amount for a wallet.
+
+        The currency and status filters are sent to the server and applied
+        again locally, so servers ignoring them still give the right sum.
+        Holds are summed page by page without building full models.
+
+        Args:
+            wallet_id: Wallet identifier
+            currency: Currency to filter by
+            status: Hold status to filter by
+            page_size: Number of holds requested per page
+
+        Returns:
+            Exact total held amount
+        """
+        total = Decimal(0)
+        async for item in self._iter_pages(
+            f"/wallets/{wallet_id}/holds",
+            "read:finance/accounting/hold",
+            None,
+            self._hold_filters(currency, status),
+            page_size,
+        ):
+            total += self._held_amount(item, currency, status)
+        return total
+
+    async def create_hold(
+        self,
+        wallet_id: str,
+        currency: str,
+        amount: float | Decimal | Money,
+        expires_at: datetime,
+        *,
+        idempotency_key: str | None = None,
+    ) -> WalletHoldSchema:
+        """
+        Create a wallet hold.
+
+        Args:
+            wallet_id: Wallet identifier
+            currency: Currency code
+            amount: Amount to hold
+            expires_at: Expiration datetime
+            idempotency_key: Key making retries of this call safe.
+                Generated when omitted.
+
+        Returns:
+            Created wallet hold schema
+        """
+        return await self._create_hold(
+            wallet_id, currency, amount, expires_at, idempotency_key
+        )
+
+    async def create_holds(
+        self,
+        holds: Iterable[WalletHoldBatchItem],
+        *,
+        concurrency: int = 10,
+    ) -> list[BatchItemResult[WalletHoldBatchItem, WalletHoldSchema]]:
+        """
+        Create many wallet holds.
+
+        Uses the bulk holds endpoint when the server offers it, otherwise
+        creates the holds one by one with bounded concurrency, each like
+        ``create_hold``.
+
+        Every hold is sent with an idempotency key in its ``meta_data``,
+        generated when missing. The results carry the keyed holds, so
+        failed items can be passed again without creating them twice.
+
+        Args:
+            holds: Holds to create
+            concurrency: Maximum number of requests in flight when
+                falling back to one request per hold
+
+        Returns:
+            Per-hold results, in input order
+        """
+        holds = [self._keyed_hold(hold) for hold in holds]
+        results = await self._bulk_holds(
+            "POST",
+            "create:finance/accounting/hold",
+            holds,
+            [hold.model_dump(mode="json") for hold in holds],
+        )
+        if results is None:
+            results = await gather_bounded(
+                holds, self._create_batch_hold, concurrency=concurrency
+            )
+        return results
+
+    async def _create_batch_hold(
+        self, hold: WalletHoldBatchItem
+    ) -> WalletHoldSchema:
+        idempotency_key = hold.meta_data["idempotency_key"]
+        return await self._idempotent(
+            f"/wallets/{hold.wallet_id}/holds",
+            idempotency_key,
+            self._create_hold_flow(
+                hold.wallet_id,
+                WalletHoldCreateSchema.model_validate(
+                    hold.model_dump(exclude={"wallet_id"})
+                ),
+                idempotency_key,
+            ),
+        )
 
-from .exceptions import NotFoundError
-from .hold import (
-    HoldStatus,
-    WalletHoldCreateSchema,
-    WalletHoldSchema,
-    WalletHoldUpdateSchema,
-)
-from .proposal import Participant, ProposalCreateSchema, ProposalSchema
-from .wallet import WalletDetailSchema
+    async def release_holds(
+        self,
+        holds: Iterable[tuple[str, str]],
+        *,
+        concurrency: int = 10,
+    ) -> list[BatchItemResult[tuple[str, str], WalletHoldSchema]]:
+        """
+        Release many wallet holds.
 
+        Uses the bulk holds endpoint when the server offers it, otherwise
+        releases the holds one by one with bounded concurrency.
 
-class AccountingClient(httpx.AsyncClient):
-    """Async client for accounting service operations."""
+        Args:
+            holds: (wallet_id, hold_id) pairs to release
+            concurrency: Maximum number of requests in flight when
+                falling back to one request per hold
+
+        Returns:
+            Per-hold results, in input order
+        """
+        holds = list(holds)
+        update = WalletHoldUpdateSchema(status=HoldStatus.RELEASED)
+        results = await self._bulk_holds(
+            "PATCH",
+            "update:finance/accounting/hold",
+            holds,
+            [
+                {
+                    "wallet_id": wallet_id,
+                    "uid": hold_id,
+                    **update.model_dump(mode="json"),
+                }
+                for wallet_id, hold_id in holds
+            ],
+        )
+        if results is None:
+            results = await gather_bounded(
+                holds,
+                lambda hold: self.release_hold(*hold),
+                concurrency=concurrency,
+            )
+        return results
+
+    async def _bulk_holds[TItem](
+        self,
+        method: str,
+        scope: str,
+        items: list[TItem],
+        payloads: list[dict],
+    ) -> list[BatchItemResult[TItem, WalletHoldSchema]] | None:
+        """
+        Send a batch to the bulk holds endpoint.
+
+        The endpoint takes ``{"items": [...]}`` and answers with one entry
+        per item, in order: either the hold or an object with an ``error``
+        detail and optional ``status_code``.
+
+        Args:
+            method: POST to create holds, PATCH to update them
+            scope: Permission scope required by the request
+            items: Batch items, for the results
+            payloads: Request body of every item
+
+        Returns:
+            Per-item results, or None when the server has no bulk endpoint
+        """
+        if not items or self.bulk_holds is False:
+            return None
+        try:
+            response = await self.request(
+                method,
+                self.bulk_holds_path,
+                auth=self.auth(scope),
+                json={"items": payloads},
+            )
+            if response.status_code in {404, 405, 501}:
+                self.bulk_holds = False
+                return None
+            response.raise_for_status()
+            entries = self._json(response).get("items", [])
+        except (httpx.HTTPError, UFaaSError) as exc:
+            # An open circuit or exhausted rate limit fails every item.
+            return [BatchItemResult(item, error=exc) for item in items]
+
+        self.bulk_holds = True
+        return [
+            self._bulk_hold_result(
+                method, item, entries[index] if index < len(entries) else None
+            )
+            for index, item in enumerate(items)
+        ]
+
+    def _bulk_hold_result[TItem](
+        self, method: str, item: TItem, entry: dict | None
+    ) -> BatchItemResult[TItem, WalletHoldSchema]:
+        if entry is None or "error" in entry:
+            entry = entry or {"error": "Missing from bulk response"}
+            return BatchItemResult(
+                item,
+                error=BatchItemError(
+                    str(entry["error"]), entry.get("status_code", 400)
+                ),
+            )
+        try:
+            hold = WalletHoldSchema.model_validate(entry)
+        except ValidationError as exc:
+            return BatchItemResult(item, error=exc)
+        if method == "POST":
+            self._adjust_held_balance(
+                hold.wallet_id, hold.currency, hold.amount
+            )
+        else:
+            self._forget_balances([hold.wallet_id], hold.currency)
+        return BatchItemResult(item, result=hold)
+
+    async def release_hold(
+        self, wallet_id: str, hold_id: str
+    ) -> WalletHoldSchema:
+        """
+        Release a wallet hold.
+
+        Args:
+            wallet_id: Wallet identifier
+            hold_id: Hold identifier to release
+
+        Returns:
+            Updated wallet hold schema
+        """
+        return await self._run(self._release_hold_flow(wallet_id, hold_id))
+
+    async def create_proposal(
+        self,
+        *,
+        from_wallet_id: str,
+        to_wallet_id: str,
+        currency: str,
+        amount: float | Decimal | Money,
+        description: str | None = None,
+        note: str | None = None,
+        hold_id: str | None = None,
+        from_label: str | None = None,
+        to_label: str | None = None,
+        idempotency_key: str | None = None,
+    ) -> ProposalSchema:
+        """
+        Create a transfer proposal.
+
+        Args:
+            from_wallet_id: Source wallet ID
+            to_wallet_id: Destination wallet ID
+            currency: Currency code
+            amount: Transfer amount
+            description: Optional description
+            note: Optional note
+            hold_id: Optional hold ID to use
+            from_label: Optional label for source wallet
+            to_label: Optional label for destination wallet
+            idempotency_key: Key making retries of this call safe.
+                Generated when omitted.
+
+        Returns:
+            Created proposal schema
+        """
+        return await self._create_proposal(
+            from_wallet_id=from_wallet_id,
+            to_wallet_ids=[to_wallet_id],
+            currency=currency,
+            amounts=[amount],
+            description=description,
+            note=note,
+            hold_id=hold_id,
+            from_label=from_label,
+            to_labels=[to_label],
+            idempotency_key=idempotency_key,
+        )
+
+    async def create_multi_recipient_proposal(
+        self,
+        *,
+        from_wallet_id: str,
+        to_wallet_ids: list[str],
+        currency: str,
+        amounts: list[float | Decimal | Money],
+        description: str | None = None,
+        note: str | None = None,
+        hold_id: str | None = None,
+        from_label: str | None = None,
+        to_labels: list[str] | None = None,
+        idempotency_key: str | None = None,
+    ) -> ProposalSchema:
+        """
+        Create a transfer proposal.
+
+        Args:
+            from_wallet_id: Source wallet ID
+            to_wallet_ids: Destination wallet IDs
+            currency: Currency code
+            amounts: Transfer amounts
+            description: Optional description
+            note: Optional note
+            hold_id: Optional hold ID to use
+            from_label: Optional label for source wallet
+            to_labels: Optional labels for destination wallets
+            idempotency_key: Key making retries of this call safe.
+                Generated when omitted.
+
+        Returns:
+            Created proposal schema
+        """
+        return await self._create_proposal(
+            from_wallet_id=from_wallet_id,
+            to_wallet_ids=to_wallet_ids,
+            currency=currency,
+            amounts=amounts,
+            description=description,
+            note=note,
+            hold_id=hold_id,
+            from_label=from_label,
+            to_labels=to_labels,
+            idempotency_key=idempotency_key,
+        )
+
+
+class SyncAccountingClient(_AccountingCore, httpx.Client):
+    """
+    Blocking client for accounting service operations.
+
+    Builds requests, caches tokens and decodes responses like
+    AccountingClient. One instance, with its connection pool, is safe to
+    share between the threads of a worker pool.
+    """
 
     def __init__(
         self,
@@ -27,56 +1792,227 @@ class AccountingClient(httpx.AsyncClient):
         *,
         agent_id: str | None = None,
         agent_private_key: str | None = None,
+        token_cache: TokenCache | None = None,
+        token_expiry_margin: float = 30.0,
+        scopes: Iterable[str] | None = None,
+        learn_scopes: bool = False,
+        transport: httpx.BaseTransport | None = None,
+        http2: bool = False,
+        limits: httpx.Limits | None = None,
+        keepalive_expiry: float | None = None,
+        timeout: float = 5.0,
+        connect_timeout: float | None = None,
+        read_timeout: float | None = None,
+        pool_timeout: float | None = None,
+        default_wallets: TTLCache[tuple[str, str | None], str] | None = None,
+        balance_cache_ttl: float | None = None,
+        coalesce_reads: bool = True,
+        retry_policy: RetryPolicy | None = RetryPolicy(),
+        idempotent_results: TTLCache[tuple[str, str, str], BaseModel]
+        | None = None,
+        circuit_breakers: CircuitBreakers | None = None,
+        balance_fallback: Callable[[str, str], BalanceSchema | None]
+        | None = None,
+        instrumentation: Instrumentation | None = None,
     ) -> None:
         """
-        Initialize AccountingClient.
+        Initialize SyncAccountingClient.
 
         Args:
             tenant_id: Tenant identifier for authentication
             agent_id: Agent ID. Defaults to AGENT_ID env var.
             agent_private_key: Private key for signing.
                 Defaults to AGENT_PRIVATE_KEY env var.
+            token_cache: Token cache to share between clients, sync or
+                async. A private cache is created when omitted.
+            token_expiry_margin: Seconds before expiry at which cached
+                tokens are refreshed. Ignored when token_cache is given.
+            scopes: Scopes minted into every token, so one token covers
+                a whole workflow. Use ACCOUNTING_SCOPES for all of them.
+            learn_scopes: Add every requested scope to ``scopes`` so
+                later tokens cover the union of scopes used so far.
+            transport: Transport to send requests through. Configure its
+                HTTP/2 and limits on the transport itself.
+            http2: Multiplex concurrent requests over HTTP/2 connections.
+                Requires the ``http2`` extra.
+            limits: Connection pool limits
+            keepalive_expiry: Seconds an idle connection is kept alive.
+                Overrides the value in limits.
+            timeout: Default timeout for every phase of a request
+            connect_timeout: Connection timeout. Defaults to timeout.
+            read_timeout: Read timeout. Defaults to timeout.
+            pool_timeout: Timeout waiting for a pooled connection.
+                Defaults to timeout.
+            default_wallets: Cache of default wallet IDs keyed by
+                (tenant_id, workspace_id). A five-minute cache is created
+                when omitted.
+            balance_cache_ttl: Seconds wallet balances are cached for
+                get_balance. Balance caching is disabled when omitted.
+            coalesce_reads: Share one request between identical
+                get_wallet, get_wallets and get_holds calls made by
+                concurrent threads.
+            retry_policy: Policy retrying transient failures of idempotent
+                requests. Writes are retried only under
+                ``RetryPolicy(retry_writes=True)``, which needs a server
+                deduplicating them by Idempotency-Key. Pass None to
+                disable retries.
+            idempotent_results: Cache of created holds and proposals keyed
+                by (tenant_id, path, idempotency_key), so repeated writes
+                return the stored result. A one-hour cache is created
+                when omitted.
+            circuit_breakers: Breakers failing requests fast with
+                CircuitOpenError while an endpoint is failing or slow.
+                Share one instance between clients to share their state.
+                Circuit breaking is disabled when omitted.
+            balance_fallback: Called with (wallet_id, currency) by
+                get_balance when the circuit is open, for example to serve
+                a stale balance from another cache.
+            instrumentation: Receives per-request events with phase
+                timings (token, network, backoff, decode), payload sizes
+                and attempt counts, and reads the client's cache counters.
+                Disabled when omitted.
+
+        Raises:
+            ValueError: When transport is given together with http2,
+                limits or keepalive_expiry, which only configure the
+                default transport
         """
-        accounting_service_url = os.getenv(
-            "ACCOUNTING_SERVICE_URL", "https://wallets.uln.me"
-        )
         super().__init__(
-            base_url=f"{accounting_service_url}/api/accounting/v1"
+            transport=transport,
+            **_http_settings(
+                transport=transport,
+                http2=http2,
+                limits=limits,
+                keepalive_expiry=keepalive_expiry,
+                timeout=timeout,
+                connect_timeout=connect_timeout,
+                read_timeout=read_timeout,
+                pool_timeout=pool_timeout,
+            ),
         )
-
-        self.agent_id = agent_id or os.getenv("AGENT_ID") or ""
-        self.agent_private_key = (
-            agent_private_key or os.getenv("AGENT_PRIVATE_KEY") or ""
+        self._setup(
+            tenant_id,
+            agent_id=agent_id,
+            agent_private_key=agent_private_key,
+            token_cache=token_cache,
+            token_expiry_margin=token_expiry_margin,
+            scopes=scopes,
+            learn_scopes=learn_scopes,
+            default_wallets=default_wallets,
+            balance_cache_ttl=balance_cache_ttl,
+            coalesce_reads=coalesce_reads,
+            single_flight=ThreadSingleFlight,
+            retry_policy=retry_policy,
+            idempotent_results=idempotent_results,
+            circuit_breakers=circuit_breakers,
+            balance_fallback=balance_fallback,
+            instrumentation=instrumentation,
         )
-        self.tenant_id = tenant_id
-        if not self.agent_id or not self.agent_private_key:
-            raise ValueError("agent_id and agent_private_key are required")
 
-    async def get_token(self, scopes: str | list[str]) -> str:
+    def get_token(self, scopes: str | list[str]) -> str:
         """
         Get authentication token for accounting service.
 
+        Tokens are cached per (tenant_id, agent_id, scopes, audience) and
+        reused
+        until shortly before they expire; threads missing the same token
+        share one exchange.
+
         Args:
             scopes: Permission scopes required
 
         Returns:
             JWT token string
         """
-        if isinstance(scopes, str):
-            scopes = [scopes]
-
-        jwt = agent.generate_agent_jwt(
-            scopes=scopes,
-            aud="accounting",
-            tenant_id=self.tenant_id,
-            agent_id=self.agent_id,
-            private_key=self.agent_private_key,
+        key, requested = self._token_request(scopes)
+        return self.token_cache.get_or_fetch_sync(
+            key, lambda: self._exchange_token(requested)
         )
-        token = await agent.get_agent_token_async(jwt)
-        self.headers["Authorization"] = f"Bearer {token}"
-        return token
 
-    async def get_wallet(
+    def _exchange_token(self, scopes: list[str]) -> str:
+        return agent.get_agent_token(self._agent_jwt(scopes))
+
+    def send(self, request: httpx.Request, **kwargs: object) -> httpx.Response:
+        """
+        Send a request, retrying transient failures under the retry policy.
+
+        Args:
+            request: Request to send
+            **kwargs: Arguments of ``httpx.Client.send``
+
+        Returns:
+            Response of the last attempt
+        """
+        if self.instrumentation is None:
+            return self._send_retrying(request, **kwargs)
+        with self._observed(request) as exchange:
+            exchange.response = self._send_retrying(request, **kwargs)
+        return exchange.response
+
+    def _send_retrying(
+        self, request: httpx.Request, **kwargs: object
+    ) -> httpx.Response:
+        policy = self.retry_policy
+        if policy is None or not policy.allows(request):
+            return self._send_once(request, **kwargs)
+
+        attempt = 0
+        while True:
+            attempt += 1
+            request.extensions[ATTEMPTS_EXTENSION] = attempt
+            response, error = None, None
+            try:
+                response = self._send_once(request, **kwargs)
+            except httpx.TransportError as exc:
+                error = exc
+            delay = self._retry_delay(
+                policy, request, attempt, response, error
+            )
+            if delay is None:
+                return response
+            if response is not None:
+                response.close()
+            time.sleep(delay)
+            add_phase(request, "backoff", delay)
+
+    def _send_once(
+        self, request: httpx.Request, **kwargs: object
+    ) -> httpx.Response:
+        breaker = self._breaker(request)
+        if breaker is None:
+            return self._transmit(request, **kwargs)
+        with self._guarded(breaker) as exchange:
+            exchange.response = self._transmit(request, **kwargs)
+        return exchange.response
+
+    def _transmit(
+        self, request: httpx.Request, **kwargs: object
+    ) -> httpx.Response:
+        if PHASES_EXTENSION not in request.extensions:
+            return super().send(request, **kwargs)
+        with self._network_phase(request):
+            return super().send(request, **kwargs)
+
+    def _run[T](self, flow: _Flow[T]) -> T:
+        """
+        Send the requests of a flow and return its result.
+
+        Args:
+            flow: Flow of the operation
+
+        Returns:
+            Value returned by the flow
+        """
+        try:
+            call = next(flow)
+            while True:
+                call = flow.send(
+                    self.request(call.method, call.url, **call.kwargs)
+                )
+        except StopIteration as stop:
+            return stop.value
+
+    def get_wallet(
         self,
         wallet_id: str | None = None,
         *,
@@ -97,27 +2033,62 @@ class AccountingClient(httpx.AsyncClient):
         Raises:
             NotFoundError: When wallet not found
         """
-        await self.get_token("read:finance/accounting/wallet")
-
-        params = kwargs.pop("params", {}) or {}
-        if workspace_id is not None:
-            params.update({"workspace_id": workspace_id})
-        response = await self.get(
-            f"/wallets/{wallet_id}" if wallet_id else "/wallets",
-            params=params,
-            **kwargs,
+        return self._read(
+            None if kwargs else ("get_wallet", wallet_id, workspace_id),
+            self._get_wallet_flow(
+                wallet_id, workspace_id=workspace_id, **kwargs
+            ),
+            _copy_model,
         )
-        response.raise_for_status()
-        if wallet_id:
-            return WalletDetailSchema.model_validate(response.json())
 
-        for item in response.json().get("items", []):
-            if item.get("is_default"):
-                return WalletDetailSchema.model_validate(item)
+    def get_balance(
+        self, wallet_id: str, currency: str
+    ) -> BalanceSchema | None:
+        """
+        Get the balance of a wallet in one currency.
 
-        raise NotFoundError("Wallet not found")
+        Served from the balance cache when enabled and fresh; otherwise
+        the wallet is fetched and its balances are cached. While the
+        wallet endpoint's circuit is open, the balance fallback is used
+        when configured.
 
-    async def get_wallets(
+        Args:
+            wallet_id: Wallet identifier
+            currency: Currency code
+
+        Returns:
+            Balance schema, or None when the wallet has no such balance
+        """
+        balance = self._cached_balance(wallet_id, currency)
+        if balance is not None:
+            return balance
+        try:
+            wallet = self.get_wallet(wallet_id)
+        except CircuitOpenError:
+            if self.balance_fallback is None:
+                raise
+            return self.balance_fallback(wallet_id, currency)
+        return wallet.balance.get(currency)
+
+    def update_wallet(
+        self, wallet_id: str, data: WalletUpdateSchema
+    ) -> WalletDetailSchema:
+        """
+        Update a wallet.
+
+        Changing ``is_default`` invalidates the cached default wallet of
+        the wallet's workspace.
+
+        Args:
+            wallet_id: Wallet identifier
+            data: Fields to update
+
+        Returns:
+            Updated wallet detail schema
+        """
+        return self._run(self._update_wallet_flow(wallet_id, data))
+
+    def get_wallets(
         self,
         *,
         workspace_id: str | None = None,
@@ -133,24 +2104,109 @@ class AccountingClient(httpx.AsyncClient):
         Returns:
             List of wallet detail schemas
         """
-        await self.get_token("read:finance/accounting/wallet")
+        return self._read(
+            None if kwargs else ("get_wallets", workspace_id),
+            self._get_wallets_flow(workspace_id=workspace_id, **kwargs),
+            _copy_models,
+        )
 
-        params = kwargs.pop("params", {}) or {}
-        ws_id = workspace_id
-        if ws_id is not None:
-            params.update({"workspace_id": ws_id})
-        response = await self.get(
+    def _iter_pages[TSchema: BaseModel](
+        self,
+        path: str,
+        scope: str,
+        schema: type[TSchema] | None,
+        params: dict[str, object],
+        page_size: int,
+    ) -> Generator[TSchema | dict]:
+        """
+        Walk an offset/limit paginated endpoint lazily, page by page.
+
+        Stops at a page starting with the same item as the previous one,
+        so a server ignoring the offset cannot loop forever.
+
+        Args:
+            path: Endpoint path
+            scope: Permission scope required by the endpoint
+            schema: Schema of the page items, or None for raw dicts
+            params: Query parameters sent with every page
+            page_size: Number of items requested per page
+
+        Yields:
+            Page items, validated when a schema is given
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be positive")
+
+        offset, previous = 0, None
+        while True:
+            items, total, limit = self._run(
+                self._page_flow(path, scope, schema, params, offset, page_size)
+            )
+            first = self._first_uid(items)
+            if first is not None and first == previous:
+                return
+            previous = first
+            yield from items
+            offset += len(items)
+            if not self._has_more(items, offset, total, limit, page_size):
+                return
+
+    def iter_wallets(
+        self,
+        *,
+        workspace_id: str | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Generator[WalletDetailSchema]:
+        """
+        Iterate over all wallets, fetching pages lazily.
+
+        Args:
+            workspace_id: Workspace ID filter (optional)
+            page_size: Number of wallets requested per page
+
+        Returns:
+            Iterator of wallet detail schemas
+        """
+        params = {}
+        if workspace_id is not None:
+            params["workspace_id"] = workspace_id
+        return self._iter_pages(
             "/wallets",
-            params=params,
-            **kwargs,
+            "read:finance/accounting/wallet",
+            WalletDetailSchema,
+            params,
+            page_size,
         )
-        response.raise_for_status()
-        return [
-            WalletDetailSchema.model_validate(item)
-            for item in response.json().get("items", [])
-        ]
 
-    async def get_holds(self, wallet_id: str) -> list[WalletHoldSchema]:
+    def iter_holds(
+        self,
+        wallet_id: str,
+        *,
+        currency: str | None = None,
+        status: HoldStatus | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Generator[WalletHoldSchema]:
+        """
+        Iterate over all holds of a wallet, fetching pages lazily.
+
+        Args:
+            wallet_id: Wallet identifier
+            currency: Currency filter applied by the server (optional)
+            status: Hold status filter applied by the server (optional)
+            page_size: Number of holds requested per page
+
+        Returns:
+            Iterator of wallet hold schemas
+        """
+        return self._iter_pages(
+            f"/wallets/{wallet_id}/holds",
+            "read:finance/accounting/hold",
+            WalletHoldSchema,
+            self._hold_filters(currency, status),
+            page_size,
+        )
+
+    def get_holds(self, wallet_id: str) -> list[WalletHoldSchema]:
         """
         Get holds for a wallet.
 
@@ -160,44 +2216,58 @@ class AccountingClient(httpx.AsyncClient):
         Returns:
             List of wallet hold schemas
         """
-        await self.get_token("read:finance/accounting/hold")
-        response = await self.get(f"/wallets/{wallet_id}/holds")
-        response.raise_for_status()
-        return [
-            WalletHoldSchema.model_validate(item)
-            for item in response.json().get("items", [])
-        ]
+        return self._read(
+            ("get_holds", wallet_id),
+            self._get_holds_flow(wallet_id),
+            _copy_models,
+        )
 
-    async def total_held_amount(
+    def total_held_amount(
         self,
         wallet_id: str,
         currency: str,
         status: HoldStatus = HoldStatus.ACTIVE,
-    ) -> float:
+        *,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Decimal:
         """
         Calculate total held amount for a wallet.
 
+        The currency and status filters are sent to the server and applied
+        again locally, so servers ignoring them still give the right sum.
+        Holds are summed page by page without building full models.
+
         Args:
             wallet_id: Wallet identifier
             currency: Currency to filter by
             status: Hold status to filter by
+            page_size: Number of holds requested per page
 
         Returns:
-            Total held amount
+            Exact total held amount
         """
-        holds = await self.get_holds(wallet_id)
         return sum(
-            hold.amount
-            for hold in holds
-            if hold.currency == currency and hold.status == status
+            (
+                self._held_amount(item, currency, status)
+                for item in self._iter_pages(
+                    f"/wallets/{wallet_id}/holds",
+                    "read:finance/accounting/hold",
+                    None,
+                    self._hold_filters(currency, status),
+                    page_size,
+                )
+            ),
+            Decimal(0),
         )
 
-    async def create_hold(
+    def create_hold(
         self,
         wallet_id: str,
         currency: str,
-        amount: float,
+        amount: float | Decimal | Money,
         expires_at: datetime,
+        *,
+        idempotency_key: str | None = None,
     ) -> WalletHoldSchema:
         """
         Create a wallet hold.
@@ -207,26 +2277,17 @@ class AccountingClient(httpx.AsyncClient):
             currency: Currency code
             amount: Amount to hold
             expires_at: Expiration datetime
+            idempotency_key: Key making retries of this call safe.
+                Generated when omitted.
 
         Returns:
             Created wallet hold schema
         """
-        await self.get_token("create:finance/accounting/hold")
-        response = await self.post(
-            f"/wallets/{wallet_id}/holds",
-            json=WalletHoldCreateSchema(
-                currency=currency,
-                amount=amount,
-                expires_at=expires_at,
-                status=HoldStatus.ACTIVE,
-            ).model_dump(mode="json"),
+        return self._create_hold(
+            wallet_id, currency, amount, expires_at, idempotency_key
         )
-        response.raise_for_status()
-        return WalletHoldSchema.model_validate(response.json())
 
-    async def release_hold(
-        self, wallet_id: str, hold_id: str
-    ) -> WalletHoldSchema:
+    def release_hold(self, wallet_id: str, hold_id: str) -> WalletHoldSchema:
         """
         Release a wallet hold.
 
@@ -237,28 +2298,21 @@ class AccountingClient(httpx.AsyncClient):
         Returns:
             Updated wallet hold schema
         """
-        await self.get_token("update:finance/accounting/hold")
-        response = await self.patch(
-            f"/wallets/{wallet_id}/holds/{hold_id}",
-            json=WalletHoldUpdateSchema(status=HoldStatus.RELEASED).model_dump(
-                mode="json"
-            ),
-        )
-        response.raise_for_status()
-        return WalletHoldSchema.model_validate(response.json())
+        return self._run(self._release_hold_flow(wallet_id, hold_id))
 
-    async def create_proposal(
+    def create_proposal(
         self,
         *,
         from_wallet_id: str,
         to_wallet_id: str,
         currency: str,
-        amount: float | Decimal,
+        amount: float | Decimal | Money,
         description: str | None = None,
         note: str | None = None,
         hold_id: str | None = None,
         from_label: str | None = None,
         to_label: str | None = None,
+        idempotency_key: str | None = None,
     ) -> ProposalSchema:
         """
         Create a transfer proposal.
@@ -273,48 +2327,38 @@ class AccountingClient(httpx.AsyncClient):
             hold_id: Optional hold ID to use
             from_label: Optional label for source wallet
             to_label: Optional label for destination wallet
+            idempotency_key: Key making retries of this call safe.
+                Generated when omitted.
 
         Returns:
             Created proposal schema
         """
-        await self.get_token("create:finance/accounting/proposal")
-        response = await self.post(
-            "/proposals",
-            json=ProposalCreateSchema(
-                participants=[
-                    Participant(
-                        wallet_id=from_wallet_id,
-                        amount=-amount,
-                        hold_id=hold_id,
-                        label=from_label,
-                    ),
-                    Participant(
-                        wallet_id=to_wallet_id,
-                        amount=amount,
-                        label=to_label,
-                    ),
-                ],
-                amount=amount,
-                currency=currency,
-                description=description,
-                note=note,
-            ).model_dump(mode="json"),
+        return self._create_proposal(
+            from_wallet_id=from_wallet_id,
+            to_wallet_ids=[to_wallet_id],
+            currency=currency,
+            amounts=[amount],
+            description=description,
+            note=note,
+            hold_id=hold_id,
+            from_label=from_label,
+            to_labels=[to_label],
+            idempotency_key=idempotency_key,
         )
-        response.raise_for_status()
-        return ProposalSchema.model_validate(response.json())
 
-    async def create_multi_recipient_proposal(
+    def create_multi_recipient_proposal(
         self,
         *,
         from_wallet_id: str,
         to_wallet_ids: list[str],
         currency: str,
-        amounts: list[float | Decimal],
+        amounts: list[float | Decimal | Money],
         description: str | None = None,
         note: str | None = None,
         hold_id: str | None = None,
         from_label: str | None = None,
         to_labels: list[str] | None = None,
+        idempotency_key: str | None = None,
     ) -> ProposalSchema:
         """
         Create a transfer proposal.
@@ -329,40 +2373,21 @@ class AccountingClient(httpx.AsyncClient):
             hold_id: Optional hold ID to use
             from_label: Optional label for source wallet
             to_labels: Optional labels for destination wallets
+            idempotency_key: Key making retries of this call safe.
+                Generated when omitted.
 
         Returns:
             Created proposal schema
         """
-        await self.get_token("create:finance/accounting/proposal")
-        total_amount = sum(amounts)
-        response = await self.post(
-            "/proposals",
-            json=ProposalCreateSchema(
-                participants=[
-                    Participant(
-                        wallet_id=from_wallet_id,
-                        amount=-total_amount,
-                        hold_id=hold_id,
-                        label=from_label,
-                    ),
-                    *[
-                        Participant(
-                            wallet_id=to_wallet_id,
-                            amount=amounts[i],
-                            label=(
-                                to_labels[i]
-                                if to_labels and i < len(to_labels)
-                                else None
-                            ),
-                        )
-                        for i, to_wallet_id in enumerate(to_wallet_ids)
-                    ],
-                ],
-                amount=total_amount,
-                currency=currency,
-                description=description,
-                note=note,
-            ).model_dump(mode="json"),
+        return self._create_proposal(
+            from_wallet_id=from_wallet_id,
+            to_wallet_ids=to_wallet_ids,
+            currency=currency,
+            amounts=amounts,
+            description=description,
+            note=note,
+            hold_id=hold_id,
+            from_label=from_label,
+            to_labels=to_labels,
+            idempotency_key=idempotency_key,
         )
-        response.raise_for_status()
-        return ProposalSchema.model_validate(response.json())
@@ -0,0 +1,129 @@
+"""Request coalescing for identical concurrent calls."""
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Hashable
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """
+    Share one in-flight call between concurrent callers of the same key.
+
+    The first caller of a key (the leader) starts the call; callers
+    arriving while it runs await the same result instead of starting their
+    own. Cancelling a caller never cancels the shared call.
+    """
+
+    def __init__(self) -> None:
+        """Initialize SingleFlight."""
+        self.leaders = 0
+        self.collapsed = 0
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        """Return the number of calls in flight."""
+        return len(self._calls)
+
+    async def do[T](
+        self,
+        key: Hashable,
+        call: Callable[[], Awaitable[T]],
+        copy: Callable[[T], T] | None = None,
+    ) -> T:
+        """
+        Run a call, or join the identical call already in flight.
+
+        Args:
+            key: Identity of the call
+            call: Coroutine factory performing the call
+            copy: Function applied to the result handed to callers that
+                joined an in-flight call, so they do not share mutable
+                objects with the leader.
+
+        Returns:
+            Result of the call
+        """
+        future = self._calls.get(key)
+        if future is not None:
+            self.collapsed += 1
+            result = await asyncio.shield(future)
+            return copy(result) if copy is not None else result
+
+        self.leaders += 1
+        future = asyncio.ensure_future(call())
+        self._calls[key] = future
+        future.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(future)
+
+    def _finish(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        # Retrieve the exception even if every caller was cancelled.
+        if not future.cancelled():
+            future.exception()
+
+
+class ThreadSingleFlight:
+    """
+    Share one in-flight call between threads calling the same key.
+
+    The blocking counterpart of ``SingleFlight``: the first thread runs
+    the call while threads arriving with the same key wait for its result.
+    """
+
+    def __init__(self) -> None:
+        """Initialize ThreadSingleFlight."""
+        self.leaders = 0
+        self.collapsed = 0
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, Future] = {}
+
+    def __len__(self) -> int:
+        """Return the number of calls in flight."""
+        return len(self._calls)
+
+    def do[T](
+        self,
+        key: Hashable,
+        call: Callable[[], T],
+        copy: Callable[[T], T] | None = None,
+    ) -> T:
+        """
+        Run a call, or wait for the identical call already in flight.
+
+        Args:
+            key: Identity of the call
+            call: Function performing the call
+            copy: Function applied to the result handed to threads that
+                waited for an in-flight call, so they do not share mutable
+                objects with the leader.
+
+        Returns:
+            Result of the call
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                self.leaders += 1
+                future = self._calls[key] = Future()
+            else:
+                self.collapsed += 1
+
+        if not leader:
+            result = future.result()
+            return copy(result) if copy is not None else result
+
+        try:
+            result = call()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                if self._calls.get(key) is future:
+                    del self._calls[key]
@@ -0,0 +1,198 @@
+"""Expiry-aware cache for agent access tokens."""
+
+import base64
+import json
+import threading
+import time
+from collections.abc import Awaitable, Callable, Hashable
+
+from .singleflight import SingleFlight, ThreadSingleFlight
+
+
+def token_expiry(token: str) -> float | None:
+    """
+    Read the ``exp`` claim of a JWT without verifying its signature.
+
+    Args:
+        token: Encoded JWT string
+
+    Returns:
+        Expiry as a POSIX timestamp, or None when it cannot be read
+    """
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+    except (IndexError, ValueError):
+        return None
+    exp = claims.get("exp") if isinstance(claims, dict) else None
+    if isinstance(exp, bool) or not isinstance(exp, int | float):
+        return None
+    return float(exp)
+
+
+class TokenCache:
+    """
+    Cache access tokens per (tenant_id, agent_id, scopes, audience) key.
+
+    Tokens are reused until ``expiry_margin`` seconds before their ``exp``
+    claim. Concurrent misses on the same key share one in-flight fetch,
+    whether they come from coroutines or from threads, and the counters
+    are safe to update from several threads.
+    """
+
+    def __init__(
+        self,
+        *,
+        expiry_margin: float = 30.0,
+        default_ttl: float = 60.0,
+    ) -> None:
+        """
+        Initialize TokenCache.
+
+        Args:
+            expiry_margin: Seconds before expiry at which a token is
+                considered stale and refreshed.
+            default_ttl: Lifetime assumed for tokens without an ``exp``
+                claim.
+        """
+        self.expiry_margin = expiry_margin
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._tokens: dict[Hashable, tuple[str, float]] = {}
+        self._exchanges = SingleFlight()
+        self._thread_exchanges = ThreadSingleFlight()
+
+    def __len__(self) -> int:
+        """Return the number of cached tokens."""
+        return len(self._tokens)
+
+    @property
+    def coalesced(self) -> int:
+        """Number of lookups that joined an in-flight exchange."""
+        return self._exchanges.collapsed + self._thread_exchanges.collapsed
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of lookups served without a token exchange."""
+        lookups = self.hits + self.misses + self.coalesced
+        return (self.hits + self.coalesced) / lookups if lookups else 0.0
+
+    def get(self, key: Hashable) -> str | None:
+        """
+        Get a fresh token for a key.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached token, or None when missing or about to expire
+        """
+        entry = self._tokens.get(key)
+        if entry is None:
+            return None
+        token, expires_at = entry
+        if expires_at - self.expiry_margin <= time.time():
+            self._tokens.pop(key, None)
+            return None
+        return token
+
+    def set(self, key: Hashable, token: str) -> None:
+        """
+        Store a token under a key.
+
+        Args:
+            key: Cache key
+            token: Encoded JWT access token
+        """
+        expires_at = token_expiry(token)
+        if expires_at is None:
+            expires_at = time.time() + self.default_ttl
+        self._tokens[key] = (token, expires_at)
+
+    def invalidate(self, key: Hashable | None = None) -> None:
+        """
+        Drop one cached token, or all of them when key is None.
+
+        Args:
+            key: Cache key to drop
+        """
+        if key is None:
+            self._tokens.clear()
+        else:
+            self._tokens.pop(key, None)
+
+    async def get_or_fetch(
+        self, key: Hashable, fetch: Callable[[], Awaitable[str]]
+    ) -> str:
+        """
+        Get a cached token or fetch and cache a new one.
+
+        Args:
+            key: Cache key
+            fetch: Coroutine factory performing the token exchange
+
+        Returns:
+            Access token
+        """
+        token = self._lookup(key)
+        if token is not None:
+            return token
+        return await self._exchanges.do(key, lambda: self._fetch(key, fetch))
+
+    def _lookup(self, key: Hashable) -> str | None:
+        token = self.get(key)
+        if token is not None:
+            with self._lock:
+                self.hits += 1
+        return token
+
+    def _count_miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    async def _fetch(
+        self, key: Hashable, fetch: Callable[[], Awaitable[str]]
+    ) -> str:
+        # A caller that missed just before the previous exchange stored
+        # its token leads a new flight; reuse that token instead.
+        token = self._lookup(key)
+        if token is not None:
+            return token
+        self._count_miss()
+        token = await fetch()
+        self.set(key, token)
+        return token
+
+    def get_or_fetch_sync(
+        self, key: Hashable, fetch: Callable[[], str]
+    ) -> str:
+        """
+        Get a cached token or fetch and cache a new one, blocking.
+
+        Args:
+            key: Cache key
+            fetch: Function performing the token exchange
+
+        Returns:
+            Access token
+        """
+        token = self._lookup(key)
+        if token is not None:
+            return token
+        return self._thread_exchanges.do(
+            key, lambda: self._fetch_sync(key, fetch)
+        )
+
+    def _fetch_sync(self, key: Hashable, fetch: Callable[[], str]) -> str:
+        # A thread that missed just before the previous leader stored its
+        # token leads a new flight; reuse that token instead.
+        token = self._lookup(key)
+        if token is not None:
+            return token
+        self._count_miss()
+        token = fetch()
+        self.set(key, token)
+        return token
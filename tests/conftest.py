@@ -1,9 +1,14 @@
 """Shared pytest fixtures for testing."""
 
+import asyncio
+import base64
+import json
 import os
+import time
 
 import dotenv
 import pytest
+from usso.utils import agent
 
 dotenv.load_dotenv()
 
@@ -16,3 +21,42 @@ def setup_debugpy() -> None:
 
         debugpy.listen(("127.0.0.1", 3020))  # ruff:ignore[debugger]
         debugpy.wait_for_client()  # ruff:ignore[debugger]
+
+
+def make_jwt(claims: dict) -> str:
+    """Build an unsigned JWT carrying the given claims."""
+
+    def encode(part: dict) -> str:
+        raw = json.dumps(part).encode()
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+    return f"{encode({'alg': 'none'})}.{encode(claims)}.sig"
+
+
+@pytest.fixture
+def agent_tokens(monkeypatch: pytest.MonkeyPatch) -> list[list[str]]:
+    """Replace the USSO agent token exchange with a local fake."""
+    exchanges: list[list[str]] = []
+
+    def generate_agent_jwt(scopes: list[str], **kwargs: object) -> str:
+        return json.dumps(scopes)
+
+    def get_agent_token(jwt: str) -> str:
+        scopes = json.loads(jwt)
+        exchanges.append(scopes)
+        # Let concurrent threads reach the exchange before it completes.
+        time.sleep(0.01)
+        return make_jwt({"scopes": scopes, "exp": time.time() + 600})
+
+    async def get_agent_token_async(jwt: str) -> str:
+        scopes = json.loads(jwt)
+        exchanges.append(scopes)
+        await asyncio.sleep(0)
+        return make_jwt({"scopes": scopes, "exp": time.time() + 600})
+
+    monkeypatch.setattr(agent, "generate_agent_jwt", generate_agent_jwt)
+    monkeypatch.setattr(agent, "get_agent_token", get_agent_token)
+    monkeypatch.setattr(agent, "get_agent_token_async", get_agent_token_async)
+    monkeypatch.setenv("AGENT_ID", "agent")
+    monkeypatch.setenv("AGENT_PRIVATE_KEY", "key")
+    return exchanges
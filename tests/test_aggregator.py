@@ -0,0 +1,190 @@
+"""Test micro-charge aggregation."""
+
+import asyncio
+import json
+from decimal import Decimal
+from pathlib import Path
+
+import httpx
+import pytest
+
+from src.ufaas.aggregator import ProposalAggregator
+from src.ufaas.services import AccountingClient
+
+
+class ProposalService:
+    """Record created proposals, optionally failing them."""
+
+    def __init__(self) -> None:
+        self.proposals: list[dict] = []
+        self.failing = False
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if self.failing:
+            return httpx.Response(503, json={"detail": "Unavailable"})
+        body = json.loads(request.content)
+        self.proposals.append(body)
+        return httpx.Response(
+            201,
+            json={
+                "tenant_id": "tenant",
+                "user_id": "user",
+                "issuer_id": "agent",
+                **body,
+            },
+        )
+
+
+async def charge(aggregator: ProposalAggregator, to: str = "b") -> None:
+    """Record a one-cent charge."""
+    await aggregator.add(
+        from_wallet_id="a",
+        to_wallet_id=to,
+        currency="USD",
+        amount=Decimal("0.01"),
+    )
+
+
+@pytest.mark.asyncio
+async def test_charges_are_flushed_per_key(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test charges are summed per key on threshold and close."""
+    service = ProposalService()
+    async with (
+        AccountingClient(
+            "tenant", transport=httpx.MockTransport(service)
+        ) as client,
+        ProposalAggregator(client, max_charges=3) as aggregator,
+    ):
+        for _ in range(4):
+            await charge(aggregator)
+        await charge(aggregator, to="c")
+        assert len(service.proposals) == 1
+
+    assert [proposal["amount"] for proposal in service.proposals] == [
+        "0.03",
+        "0.01",
+        "0.01",
+    ]
+    assert aggregator.flushed_charges == 5
+
+
+@pytest.mark.asyncio
+async def test_unflushed_charges_are_replayed(
+    agent_tokens: list[list[str]], tmp_path: Path
+) -> None:
+    """Test charges left in the log are replayed on start."""
+    log_path = tmp_path / "charges.log"
+    service = ProposalService()
+    async with AccountingClient(
+        "tenant", transport=httpx.MockTransport(service)
+    ) as client:
+        service.failing = True
+        async with ProposalAggregator(client, log_path=log_path) as aggregator:
+            for _ in range(5):
+                await charge(aggregator)
+        assert aggregator.pending == {("a", "b", "USD"): Decimal("0.05")}
+
+        service.failing = False
+        async with ProposalAggregator(client, log_path=log_path) as aggregator:
+            assert aggregator.pending == {("a", "b", "USD"): Decimal("0.05")}
+
+    assert [proposal["amount"] for proposal in service.proposals] == ["0.05"]
+    assert log_path.read_text() == ""
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_idempotency_key(
+    agent_tokens: list[list[str]], tmp_path: Path
+) -> None:
+    """Test a failed flush is retried unchanged under the same key."""
+    log_path = tmp_path / "charges.log"
+    service = ProposalService()
+    async with AccountingClient(
+        "tenant", transport=httpx.MockTransport(service), retry_policy=None
+    ) as client:
+        service.failing = True
+        async with ProposalAggregator(client, log_path=log_path) as aggregator:
+            for _ in range(2):
+                await charge(aggregator)
+        key = json.loads(log_path.read_text())["idempotency_key"]
+
+        service.failing = False
+        async with ProposalAggregator(client, log_path=log_path) as aggregator:
+            await charge(aggregator)
+
+    replayed, new = service.proposals
+    assert replayed["amount"] == "0.02"
+    assert replayed["meta_data"]["idempotency_key"] == key
+    assert new["amount"] == "0.01"
+    assert aggregator.flushed_charges == 3
+
+
+@pytest.mark.asyncio
+async def test_invalid_charges_move_to_failed(
+    agent_tokens: list[list[str]], tmp_path: Path
+) -> None:
+    """Test a proposal that can never succeed is not retried."""
+    log_path = tmp_path / "charges.log"
+    service = ProposalService()
+    async with AccountingClient(
+        "tenant", transport=httpx.MockTransport(service)
+    ) as client:
+        async with ProposalAggregator(client, log_path=log_path) as aggregator:
+            await charge(aggregator)
+            await aggregator.add(
+                from_wallet_id="a",
+                to_wallet_id="c",
+                currency="USD",
+                amount=Decimal("-0.01"),
+            )
+            await aggregator.flush()
+            await aggregator.flush()
+            assert aggregator.pending == {}
+
+        async with ProposalAggregator(client, log_path=log_path) as aggregator:
+            assert aggregator.failed == {("a", "c", "USD"): Decimal("-0.01")}
+
+    assert [proposal["amount"] for proposal in service.proposals] == ["0.01"]
+    [record] = map(json.loads, log_path.read_text().splitlines())
+    assert record["key"] == ["a", "c", "USD"]
+    assert "ValueError" in record["error"]
+
+
+@pytest.mark.asyncio
+async def test_timer_survives_failed_compaction(
+    agent_tokens: list[list[str]],
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test a failing log rewrite does not stop time-based flushing."""
+    service = ProposalService()
+    rewrite = ProposalAggregator._rewrite
+    failures = [OSError("disk full")]
+
+    def flaky_rewrite(self: ProposalAggregator, lines: list[str]) -> None:
+        if failures:
+            raise failures.pop()
+        rewrite(self, lines)
+
+    monkeypatch.setattr(ProposalAggregator, "_rewrite", flaky_rewrite)
+    async with (
+        AccountingClient(
+            "tenant", transport=httpx.MockTransport(service)
+        ) as client,
+        ProposalAggregator(
+            client, window=0.02, log_path=tmp_path / "charges.log"
+        ) as aggregator,
+    ):
+        await charge(aggregator)
+        for _ in range(50):
+            await asyncio.sleep(0.01)
+            if service.proposals:
+                break
+
+        assert not failures
+        assert [proposal["amount"] for proposal in service.proposals] == [
+            "0.01"
+        ]
+        assert not aggregator._timer.done()
@@ -0,0 +1,95 @@
+"""Test batch amount arithmetic."""
+
+from decimal import ROUND_HALF_UP, Decimal
+
+import pytest
+
+from src.ufaas import amounts
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(
+    request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch
+) -> str:
+    """Run a test with and without NumPy."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(amounts, "np", None)
+    return request.param
+
+
+@pytest.mark.usefixtures("backend")
+def test_quantize_and_sum() -> None:
+    """Test amounts are rounded to the precision and summed exactly."""
+    values = [Decimal("0.105"), 0.1, "0.125", 2]
+
+    assert amounts.quantize(values, "USD") == [
+        Decimal("0.10"),
+        Decimal("0.10"),
+        Decimal("0.12"),
+        Decimal("2.00"),
+    ]
+    assert list(amounts.to_minor_units(values, "USD")) == [10, 10, 12, 200]
+    assert amounts.exact_sum(values, "USD") == Decimal("2.32")
+    assert amounts.exact_sum(values, "USD", rounding=ROUND_HALF_UP) == (
+        Decimal("2.34")
+    )
+    assert amounts.exact_sum([0.1] * 10, "IRR") == 0
+    assert amounts.exact_sum([], "USD") == 0
+
+
+@pytest.mark.usefixtures("backend")
+def test_sum_does_not_overflow() -> None:
+    """Test totals past int64 stay exact."""
+    huge = Decimal(2**62)
+    assert amounts.exact_sum([huge] * 4, "IRR") == huge * 4
+    assert amounts.exact_sum([huge * 4, -huge], "IRR") == huge * 3
+
+
+@pytest.mark.usefixtures("backend")
+def test_split_uses_largest_remainders() -> None:
+    """Test shares add up to the total with fair rounding."""
+    assert amounts.split(Decimal(100), [1, 1, 1], "USD") == [
+        Decimal("33.34"),
+        Decimal("33.33"),
+        Decimal("33.33"),
+    ]
+    assert amounts.split("10", ["0.5", "0.3", "0.2"], "IRR") == [5, 3, 2]
+    assert amounts.split(Decimal("-0.05"), [1, 2], "USD") == [
+        Decimal("-0.02"),
+        Decimal("-0.03"),
+    ]
+    shares = amounts.split(Decimal("1000.01"), range(1, 1001), "USD")
+    assert sum(shares) == Decimal("1000.01")
+
+
+@pytest.mark.usefixtures("backend")
+def test_split_rejects_bad_weights() -> None:
+    """Test empty, negative and all-zero weights are rejected."""
+    for weights in ([], [1, -1], [0, 0], ["NaN"]):
+        with pytest.raises(ValueError, match="weights"):
+            amounts.split_minor_units(10, weights)
+
+
+def test_split_oversized_weights() -> None:
+    """Test weights beyond int64 fall back to exact integers."""
+    assert list(amounts.split_minor_units(0, [2**63, 1])) == [0, 0]
+    assert list(amounts.split_minor_units(3, [2**64, 2**64, 2**64])) == [
+        1,
+        1,
+        1,
+    ]
+
+
+def test_backends_agree() -> None:
+    """Test NumPy and pure Python give the same shares."""
+    pytest.importorskip("numpy")
+    weights = [Decimal(index % 7) / 3 for index in range(1, 500)]
+    vectorized = amounts.split_minor_units(123_457, weights)
+    amounts_np, amounts.np = amounts.np, None
+    try:
+        fallback = amounts.split_minor_units(123_457, weights)
+    finally:
+        amounts.np = amounts_np
+    assert list(vectorized) == fallback
@@ -0,0 +1,99 @@
+"""Test per-request agent authentication."""
+
+import asyncio
+import base64
+import json
+from datetime import UTC, datetime, timedelta
+
+import httpx
+import pytest
+from usso.utils import agent
+
+from src.ufaas.auth import AgentTokenAuth
+from src.ufaas.services import AccountingClient
+
+from .test_services import hold_payload, wallet_payload
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_keep_their_own_scope(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test each request carries the token minted for its own scope."""
+    accounting = AccountingClient("tenant")
+    tokens = {
+        scope: await accounting.get_token(scope)
+        for scope in ("read:wallet", "create:hold")
+    }
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200, json={"authorization": request.headers["Authorization"]}
+        )
+
+    async with httpx.AsyncClient(
+        base_url="http://accounting", transport=httpx.MockTransport(handler)
+    ) as client:
+        scopes = ["read:wallet", "create:hold"] * 50
+        responses = await asyncio.gather(*[
+            client.get("/", auth=AgentTokenAuth(accounting.get_token, scope))
+            for scope in scopes
+        ])
+
+    for scope, response in zip(scopes, responses, strict=True):
+        assert response.json() == {"authorization": f"Bearer {tokens[scope]}"}
+    assert "Authorization" not in accounting.headers
+
+
+@pytest.mark.asyncio
+async def test_concurrent_client_calls_across_tenants_and_scopes(
+    agent_tokens: list[list[str]], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test concurrent client calls each send their own tenant's token."""
+    monkeypatch.setattr(
+        agent,
+        "generate_agent_jwt",
+        lambda scopes, tenant_id, **kwargs: json.dumps([
+            *scopes,
+            f"tenant:{tenant_id}",
+        ]),
+    )
+    sent: list[tuple[str, str, set[str]]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        token = request.headers["Authorization"].removeprefix("Bearer ")
+        claims = token.split(".")[1]
+        scopes = json.loads(base64.urlsafe_b64decode(claims + "=="))
+        sent.append((request.method, request.url.path, set(scopes["scopes"])))
+        wallet_id = request.url.path.split("/")[5]
+        if request.method == "GET":
+            return httpx.Response(200, json=wallet_payload(wallet_id))
+        return httpx.Response(201, json=hold_payload(0, wallet_id=wallet_id))
+
+    transport = httpx.MockTransport(handler)
+    expires_at = datetime.now(UTC) + timedelta(hours=1)
+    async with (
+        AccountingClient("a", transport=transport) as first,
+        AccountingClient("b", transport=transport) as second,
+    ):
+        await asyncio.gather(*[
+            call
+            for index in range(20)
+            for client in (first, second)
+            for call in (
+                client.get_wallet(f"{client.tenant_id}-{index}"),
+                client.create_hold(
+                    f"{client.tenant_id}-{index}", "USD", 1, expires_at
+                ),
+            )
+        ])
+
+    assert len(sent) == 80
+    for method, path, scopes in sent:
+        tenant = path.split("/")[5].split("-")[0]
+        action = "read:finance/accounting/wallet"
+        if method == "POST":
+            action = "create:finance/accounting/hold"
+        assert scopes == {action, f"tenant:{tenant}"}
+    assert "Authorization" not in first.headers
+    assert "Authorization" not in second.headers
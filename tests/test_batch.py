@@ -0,0 +1,218 @@
+"""Test batch hold operations."""
+
+import json
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+import httpx
+import pytest
+
+from src.ufaas.circuit import CircuitBreakers
+from src.ufaas.exceptions import BatchItemError, CircuitOpenError
+from src.ufaas.hold import WalletHoldBatchItem
+from src.ufaas.retry import RetryPolicy
+from src.ufaas.services import AccountingClient
+
+
+def hold_response(wallet_id: str, body: dict, index: int) -> dict:
+    """Build the hold the service answers with."""
+    return {
+        "uid": f"hold-{index}",
+        "tenant_id": "tenant",
+        "workspace_id": "workspace",
+        "wallet_id": wallet_id,
+        **body,
+    }
+
+
+def batch_items(*wallet_ids: str) -> list[WalletHoldBatchItem]:
+    """Build hold batch items."""
+    expires_at = datetime.now(UTC) + timedelta(hours=1)
+    return [
+        WalletHoldBatchItem(
+            wallet_id=wallet_id,
+            currency="USD",
+            amount=5,
+            expires_at=expires_at,
+        )
+        for wallet_id in wallet_ids
+    ]
+
+
+@pytest.mark.asyncio
+async def test_create_holds_falls_back_to_fan_out(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test holds are created one by one without a bulk endpoint."""
+    paths: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path.removeprefix("/api/accounting/v1")
+        paths.append(path)
+        if path == "/holds/bulk" or path.startswith("/wallets/missing"):
+            return httpx.Response(404, json={"detail": "Not found"})
+        wallet_id = path.split("/")[2]
+        body = json.loads(request.content)
+        return httpx.Response(
+            201, json=hold_response(wallet_id, body, len(paths))
+        )
+
+    async with AccountingClient(
+        "tenant", transport=httpx.MockTransport(handler)
+    ) as client:
+        results = await client.create_holds(
+            batch_items("a", "missing", "b"), concurrency=2
+        )
+        await client.create_holds(batch_items("c"))
+
+    assert [result.ok for result in results] == [True, False, True]
+    assert isinstance(results[1].error, httpx.HTTPStatusError)
+    assert results[2].result.wallet_id == "b"
+    assert client.bulk_holds is False
+    assert paths.count("/holds/bulk") == 1
+
+
+@pytest.mark.asyncio
+async def test_release_holds_uses_bulk_endpoint(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test holds are released in one bulk request."""
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        items = json.loads(request.content)["items"]
+        entries = [
+            hold_response(
+                item.pop("wallet_id"), {**item, "currency": "USD"}, index
+            )
+            if item["uid"] != "gone"
+            else {"error": "Hold not found", "status_code": 404}
+            for index, item in enumerate(items)
+        ]
+        entries[0]["amount"] = "5"
+        return httpx.Response(200, json={"items": entries})
+
+    async with AccountingClient(
+        "tenant", transport=httpx.MockTransport(handler)
+    ) as client:
+        results = await client.release_holds([
+            ("a", "hold-1"),
+            ("a", "gone"),
+        ])
+
+    assert len(requests) == 1
+    assert requests[0].method == "PATCH"
+    assert results[0].result.status == "released"
+    assert isinstance(results[0].result.amount, Decimal)
+    assert isinstance(results[1].error, BatchItemError)
+    assert results[1].error.status_code == 404
+    assert results[1].error.detail == "Hold not found"
+    assert results[1].error.message["en"] == "Batch item failed"
+
+
+@pytest.mark.asyncio
+async def test_release_holds_falls_back_to_fan_out(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test holds are released one by one without a bulk endpoint."""
+    paths: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path.removeprefix("/api/accounting/v1")
+        paths.append(f"{request.method} {path}")
+        if path == "/holds/bulk":
+            return httpx.Response(404, json={"detail": "Not found"})
+        _, _, wallet_id, _, hold_id = path.split("/")
+        body = json.loads(request.content)
+        return httpx.Response(
+            200,
+            json=hold_response(
+                wallet_id, {"currency": "USD", "amount": "5", **body}, 0
+            )
+            | {"uid": hold_id},
+        )
+
+    async with AccountingClient(
+        "tenant", transport=httpx.MockTransport(handler)
+    ) as client:
+        results = await client.release_holds([("a", "h1"), ("b", "h2")])
+
+    assert [result.item for result in results] == [("a", "h1"), ("b", "h2")]
+    assert [result.result.uid for result in results] == ["h1", "h2"]
+    assert all(result.result.status == "released" for result in results)
+    assert paths[0] == "PATCH /holds/bulk"
+    assert sorted(paths[1:]) == [
+        "PATCH /wallets/a/holds/h1",
+        "PATCH /wallets/b/holds/h2",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_bulk_holds_report_open_circuit_per_item(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test an open circuit fails every item instead of the batch."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(503, json={"detail": "Unavailable"})
+
+    async with AccountingClient(
+        "tenant",
+        transport=httpx.MockTransport(handler),
+        circuit_breakers=CircuitBreakers(min_calls=1),
+    ) as client:
+        # One failure opens the breaker of each bulk endpoint.
+        await client.create_holds(batch_items("a"))
+        await client.release_holds([("a", "h1")])
+        created = await client.create_holds(batch_items("a", "b"))
+        released = await client.release_holds([("a", "h1"), ("b", "h2")])
+
+    for results in (created, released):
+        assert len(results) == 2
+        assert all(
+            isinstance(result.error, CircuitOpenError) for result in results
+        )
+
+
+@pytest.mark.asyncio
+async def test_create_holds_send_idempotency_keys(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test every hold keeps one idempotency key across both paths."""
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        path = request.url.path.removeprefix("/api/accounting/v1")
+        if path == "/holds/bulk":
+            return httpx.Response(404, json={"detail": "Not found"})
+        if len(requests) == 2:
+            return httpx.Response(503, json={"detail": "Unavailable"})
+        body = json.loads(request.content)
+        return httpx.Response(
+            201, json=hold_response(path.split("/")[2], body, len(requests))
+        )
+
+    holds = batch_items("a", "b")
+    holds[0].meta_data = {"idempotency_key": "given"}
+    async with AccountingClient(
+        "tenant",
+        transport=httpx.MockTransport(handler),
+        retry_policy=RetryPolicy(base_delay=0.001, retry_writes=True),
+    ) as client:
+        results = await client.create_holds(holds, concurrency=1)
+
+    bulk_keys = [
+        item["meta_data"]["idempotency_key"]
+        for item in json.loads(requests[0].content)["items"]
+    ]
+    sent_keys = [
+        request.headers["Idempotency-Key"] for request in requests[1:]
+    ]
+    assert all(result.ok for result in results)
+    assert bulk_keys[0] == "given"
+    assert sent_keys == [bulk_keys[0], bulk_keys[0], bulk_keys[1]]
+    assert [
+        result.item.meta_data["idempotency_key"] for result in results
+    ] == bulk_keys
@@ -0,0 +1,119 @@
+"""Test circuit breaking of failing endpoints."""
+
+import asyncio
+from decimal import Decimal
+
+import httpx
+import pytest
+
+from src.ufaas.circuit import CircuitBreaker, CircuitBreakers, CircuitState
+from src.ufaas.exceptions import CircuitOpenError
+from src.ufaas.services import AccountingClient
+from src.ufaas.wallet import BalanceSchema
+
+
+class FlakyService:
+    """Answer 503 while failing, otherwise serve wallet "w"."""
+
+    def __init__(self) -> None:
+        self.failing = True
+        self.paths: list[str] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.paths.append(request.url.path)
+        if self.failing:
+            return httpx.Response(503)
+        return httpx.Response(
+            200,
+            json={
+                "uid": "w",
+                "tenant_id": "tenant",
+                "workspace_id": "workspace",
+                "balance": {
+                    "USD": {
+                        "currency": "USD",
+                        "total": "5",
+                        "held": "0",
+                        "available": "5",
+                    }
+                },
+            },
+        )
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_and_recovers(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test an endpoint fails fast while open and closes after a probe."""
+    service = FlakyService()
+    breakers = CircuitBreakers(min_calls=2, reset_timeout=0.05)
+    async with AccountingClient(
+        "tenant",
+        transport=httpx.MockTransport(service),
+        circuit_breakers=breakers,
+        retry_policy=None,
+    ) as client:
+        for wallet_id in ("a", "b"):
+            with pytest.raises(httpx.HTTPStatusError):
+                await client.get_wallet(wallet_id)
+        assert breakers.states == {"GET /wallets/{id}": CircuitState.OPEN}
+
+        with pytest.raises(CircuitOpenError) as error:
+            await client.get_wallet("c")
+        assert error.value.status_code == 503
+        assert len(service.paths) == 2
+
+        # Other endpoints are unaffected.
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.get_wallets()
+
+        await asyncio.sleep(0.05)
+        service.failing = False
+        wallet = await client.get_wallet("w")
+
+    assert wallet.uid == "w"
+    assert breakers["GET /wallets/{id}"].state is CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_balance_fallback(agent_tokens: list[list[str]]) -> None:
+    """Test get_balance serves the fallback while the circuit is open."""
+    stale = {
+        ("w", "USD"): BalanceSchema(
+            currency="USD", total=Decimal(4), held=0, available=Decimal(4)
+        )
+    }
+
+    async with AccountingClient(
+        "tenant",
+        transport=httpx.MockTransport(FlakyService()),
+        circuit_breakers=CircuitBreakers(min_calls=1),
+        retry_policy=None,
+        balance_fallback=lambda wallet_id, currency: stale[
+            wallet_id, currency
+        ],
+    ) as client:
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.get_balance("w", "USD")
+        balance = await client.get_balance("w", "USD")
+
+    assert balance.total == Decimal(4)
+
+
+def test_slow_calls_open_the_circuit() -> None:
+    """Test calls over the latency threshold count as failures."""
+    transitions = []
+    breaker = CircuitBreaker(
+        "GET /wallets",
+        slow_call_duration=1.0,
+        min_calls=4,
+        on_state_change=lambda _, state: transitions.append(state),
+    )
+    for duration in (0.1, 2.0, 0.1, 3.0):
+        breaker.acquire()
+        breaker.record(ok=True, duration=duration)
+
+    assert transitions == [CircuitState.OPEN]
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire()
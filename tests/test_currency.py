@@ -0,0 +1,69 @@
+"""Test currency metadata."""
+
+import dataclasses
+from collections.abc import Generator
+from decimal import Decimal
+
+import pytest
+
+from src.ufaas.currency import (
+    _CURRENCIES,
+    currency_info,
+    register_currency,
+    registered_currencies,
+)
+from src.ufaas.enums import Currency
+
+
+@pytest.fixture
+def restore_currencies() -> Generator[None]:
+    """Drop currencies registered by a test."""
+    saved = dict(_CURRENCIES)
+    yield
+    _CURRENCIES.clear()
+    _CURRENCIES.update(saved)
+
+
+def test_enum_reads_the_table() -> None:
+    """Test enum properties keep their values."""
+    assert Currency.IRR.precision == 0
+    assert Currency.USD.precision == 2
+    assert Currency.EUR.symbol == "EUR"
+    assert Currency.IRR.name == {"fa": "ریال", "en": "Iranian Rial"}
+    assert Currency.USD.is_crypto is False
+    assert Currency.USD.info.quantum == Decimal("0.01")
+    assert Currency.USD.info.scale == 100
+    assert Currency.EUR.properties[Currency.EUR]["color"] == "#26a17b"
+
+
+def test_metadata_is_immutable() -> None:
+    """Test records and their names cannot be changed."""
+    info = currency_info("USD")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        info.precision = 4
+    with pytest.raises(TypeError):
+        info.name["en"] = "Buck"
+    with pytest.raises(TypeError):
+        registered_currencies()["USD"] = info
+
+
+@pytest.mark.usefixtures("restore_currencies")
+def test_register_currency_from_config() -> None:
+    """Test extra currencies are registered without the enum."""
+    config = {
+        "code": "USDT",
+        "name": {"en": "Tether"},
+        "precision": 6,
+        "is_crypto": True,
+    }
+    info = register_currency(**config)
+
+    assert currency_info("USDT") is info
+    assert info.symbol == "USDT"
+    assert info.quantum == Decimal("0.000001")
+    with pytest.raises(ValueError, match="already registered"):
+        register_currency(**config)
+    replaced = register_currency(**{**config, "precision": 2}, replace=True)
+    assert currency_info("USDT") is replaced
+    with pytest.raises(KeyError):
+        currency_info("BTC")
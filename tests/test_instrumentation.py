@@ -0,0 +1,142 @@
+"""Test instrumentation of client requests."""
+
+import httpx
+import pytest
+
+from src.ufaas.instrumentation import (
+    Instrumentation,
+    MetricsRegistry,
+    RequestEvent,
+    httpx_event_hooks,
+)
+from src.ufaas.retry import RetryPolicy
+from src.ufaas.services import AccountingClient
+
+
+class Recorder(Instrumentation):
+    """Keep every event."""
+
+    def __init__(self) -> None:
+        self.events: list[RequestEvent] = []
+        self.phases: list[str] = []
+
+    def on_response(self, event: RequestEvent) -> None:
+        self.events.append(event)
+
+    def on_phase(
+        self, client: str, endpoint: str, phase: str, seconds: float
+    ) -> None:
+        self.phases.append(phase)
+
+
+def wallet_service() -> httpx.MockTransport:
+    """Serve wallet "w" after one transient failure."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(503)
+        return httpx.Response(
+            200,
+            json={"uid": "w", "tenant_id": "tenant", "workspace_id": "ws"},
+        )
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.mark.asyncio
+async def test_request_phases_are_reported(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test a request reports its phases, size and attempts."""
+    recorder = Recorder()
+    async with AccountingClient(
+        "tenant",
+        transport=wallet_service(),
+        retry_policy=RetryPolicy(base_delay=0.001),
+        instrumentation=recorder,
+    ) as client:
+        await client.get_wallet("w")
+
+    [event] = recorder.events
+    assert event.endpoint == "GET /wallets/{id}"
+    assert event.status_code == 200
+    assert event.attempts == 2
+    assert event.response_bytes > 0
+    assert set(event.phases) == {"token", "network", "backoff"}
+    assert recorder.phases == ["decode"]
+
+
+@pytest.mark.asyncio
+async def test_metrics_registry_renders_prometheus_text(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test the registry renders counters, histograms and cache ratios."""
+    registry = MetricsRegistry()
+    async with AccountingClient(
+        "tenant",
+        transport=wallet_service(),
+        retry_policy=RetryPolicy(base_delay=0.001),
+        instrumentation=registry,
+    ) as client:
+        await client.get_wallet("w")
+        await client.get_wallet("w")
+        text = registry.render()
+
+    labels = 'client="accounting",endpoint="GET /wallets/{id}"'
+    assert f'ufaas_requests_total{{{labels},status="200"}} 2' in text
+    assert f"ufaas_retries_total{{{labels}}} 1" in text
+    assert f'ufaas_phase_seconds_count{{{labels},phase="decode"}} 2' in text
+    assert 'ufaas_cache_hit_ratio{client="accounting",cache="token"}' in text
+
+
+@pytest.mark.asyncio
+async def test_httpx_event_hooks() -> None:
+    """Test plain httpx clients report requests through event hooks."""
+    recorder = Recorder()
+    async with httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(204)),
+        event_hooks=httpx_event_hooks(recorder, "ufaas", is_async=True),
+    ) as client:
+        await client.post("https://ufaas.io/v1/files/42", content=b"data")
+
+    [event] = recorder.events
+    assert event.endpoint == "POST /v1/files/{id}"
+    assert event.request_bytes == 4
+    assert "network" in event.phases
+
+
+@pytest.mark.asyncio
+async def test_opentelemetry_adapter(agent_tokens: list[list[str]]) -> None:
+    """Test events are recorded as OpenTelemetry metrics."""
+    sdk = pytest.importorskip("opentelemetry.sdk.metrics")
+    export = pytest.importorskip("opentelemetry.sdk.metrics.export")
+    from src.ufaas.otel import OpenTelemetryInstrumentation
+
+    reader = export.InMemoryMetricReader()
+    provider = sdk.MeterProvider(metric_readers=[reader])
+    async with AccountingClient(
+        "tenant",
+        transport=wallet_service(),
+        retry_policy=RetryPolicy(base_delay=0.001),
+        instrumentation=OpenTelemetryInstrumentation(
+            provider.get_meter("test")
+        ),
+    ) as client:
+        await client.get_wallet("w")
+        data = reader.get_metrics_data()
+
+    names = {
+        metric.name
+        for resource in data.resource_metrics
+        for scope in resource.scope_metrics
+        for metric in scope.metrics
+    }
+    assert names == {
+        "ufaas.client.requests",
+        "ufaas.client.retries",
+        "ufaas.client.payload.size",
+        "ufaas.client.phase.duration",
+        "ufaas.client.cache.hit_ratio",
+    }
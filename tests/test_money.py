@@ -0,0 +1,162 @@
+"""Test the minor-unit money type."""
+
+import json
+from datetime import datetime
+from decimal import Decimal
+
+import httpx
+import pytest
+
+from src.ufaas.compound_proposal import CompoundProposalLeg
+from src.ufaas.enums import Currency
+from src.ufaas.hold import WalletHoldCreateSchema
+from src.ufaas.money import Money
+from src.ufaas.proposal import Participant, ProposalCreateSchema
+from src.ufaas.services import AccountingClient
+
+
+def test_money_arithmetic() -> None:
+    """Test money adds, compares and formats in minor units."""
+    price = Money.of("1.505", "USD")
+
+    assert price == Money(150, Currency.USD)
+    assert repr(price) == "Money(150, 'USD')"
+    assert str(price) == "1.50"
+    assert price.to_decimal() == Decimal("1.50")
+    assert sum([price, price, Money(1, "USD")]) == Money(301, "USD")
+    assert price - Money(200, "USD") == -Money(50, "USD")
+    assert abs(Money(-5, "USD")) == 5 * Money(1, "USD")
+    assert Money(0, "USD") < price <= Money(150, "USD")
+    assert not Money(0, "USD")
+    assert str(Money(7, "IRR")) == "7"
+    assert len({price, Money(150, "USD"), Money(150, "EUR")}) == 2
+    assert price != Decimal("1.50")
+
+
+def test_money_rejects_mixed_currencies() -> None:
+    """Test money of different currencies does not combine."""
+    with pytest.raises(ValueError, match="USD and EUR"):
+        Money(1, "USD") + Money(1, "EUR")
+    with pytest.raises(ValueError, match="Cannot combine"):
+        sorted([Money(1, "USD"), Money(1, "EUR")])
+    with pytest.raises(TypeError):
+        Money(1, "USD") + 1
+    with pytest.raises(KeyError):
+        Money(1, "XYZ")
+
+
+def test_money_rejects_fractional_units() -> None:
+    """Test minor units must be whole instead of being truncated."""
+    assert Money(Decimal(2), "USD") == Money(2.0, "USD") == Money(2, "USD")
+    for units in (1.7, Decimal("2.9")):
+        with pytest.raises(ValueError, match="whole number"):
+            Money(units, "USD")
+
+
+def test_money_amount_fields() -> None:
+    """Test amount fields keep money and dump it like a Decimal."""
+    participant = Participant(wallet_id="a", amount=Money(150, "USD"))
+
+    assert participant.amount == Money(150, "USD")
+    assert (
+        participant.model_dump_json()
+        == Participant(wallet_id="a", amount=Decimal("1.50")).model_dump_json()
+    )
+    assert Participant.model_validate_json(
+        participant.model_dump_json()
+    ).amount == Decimal("1.50")
+    schema = ProposalCreateSchema.model_json_schema(mode="serialization")
+    assert schema["$defs"]["Participant"]["properties"]["amount"] == {
+        "title": "Amount",
+        "type": "string",
+    }
+
+
+@pytest.mark.asyncio
+async def test_money_proposal_body(agent_tokens: list[list[str]]) -> None:
+    """Test a proposal of money sends the same body as one of Decimals."""
+    bodies = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        del body["meta_data"]
+        bodies.append(body)
+        return httpx.Response(
+            201,
+            json={
+                "tenant_id": "tenant",
+                "user_id": "user",
+                "issuer_id": "agent",
+                **body,
+            },
+        )
+
+    async with AccountingClient(
+        "tenant", transport=httpx.MockTransport(handler)
+    ) as client:
+        for amounts in (
+            [Money(125, "USD"), Money(75, "USD")],
+            [Decimal("1.25"), Decimal("0.75")],
+        ):
+            await client.create_multi_recipient_proposal(
+                from_wallet_id="a",
+                to_wallet_ids=["b", "c"],
+                currency="USD",
+                amounts=amounts,
+            )
+
+    assert bodies[0] == bodies[1]
+    assert bodies[0]["amount"] == "2.00"
+
+
+def test_money_total() -> None:
+    """Test totals add minor units and reject other currencies."""
+    values = [Money(index, "USD") for index in range(10)]
+
+    assert Money.total(values, "USD") == sum(values) == Money(45, "USD")
+    assert Money.total([], "IRR") == Money(0, "IRR")
+    with pytest.raises(ValueError, match="USD and EUR"):
+        Money.total([*values, Money(1, "EUR")], "USD")
+
+
+@pytest.mark.asyncio
+async def test_money_proposal_rejects_mixed_amounts(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test money and numbers are not mixed in one proposal."""
+    async with AccountingClient("tenant") as client:
+        for amounts in (
+            [Money(125, "USD"), Decimal("0.75")],
+            [Decimal("1.25"), Money(75, "USD")],
+        ):
+            with pytest.raises(ValueError, match="all Money or all numbers"):
+                await client.create_multi_recipient_proposal(
+                    from_wallet_id="a",
+                    to_wallet_ids=["b", "c"],
+                    currency="USD",
+                    amounts=amounts,
+                )
+
+
+@pytest.mark.asyncio
+async def test_money_of_another_currency_is_rejected(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test Money must be in the currency of the amount it fills."""
+    message = "Cannot use IRR money for a USD amount"
+    with pytest.raises(ValueError, match=message):
+        WalletHoldCreateSchema(currency="USD", amount=Money(500, "IRR"))
+    with pytest.raises(ValueError, match=message):
+        CompoundProposalLeg(
+            currency="USD",
+            amount=Money(500, "USD"),
+            participants=[
+                {"wallet_id": "a", "amount": Money(-500, "IRR")},
+                {"wallet_id": "b", "amount": Money(500, "USD")},
+            ],
+        )
+    async with AccountingClient("tenant") as client:
+        with pytest.raises(ValueError, match=message):
+            await client.create_hold(
+                "wallet", "USD", Money(500, "IRR"), datetime(2030, 1, 1)
+            )
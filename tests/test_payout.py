@@ -0,0 +1,63 @@
+"""Test chunked multi-recipient payouts."""
+
+import json
+from decimal import Decimal
+
+import httpx
+import pytest
+
+from src.ufaas.payout import PayoutEngine
+from src.ufaas.services import AccountingClient
+
+
+@pytest.mark.asyncio
+async def test_payout_retries_only_failed_chunks(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test recipients are chunked and failed chunks are resubmitted."""
+    submitted: list[list[str]] = []
+    failing = {"r3"}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        recipients = [p["wallet_id"] for p in body["participants"][1:]]
+        if failing.intersection(recipients):
+            return httpx.Response(503, json={"detail": "Unavailable"})
+        submitted.append(recipients)
+        return httpx.Response(
+            201,
+            json={
+                "tenant_id": "tenant",
+                "user_id": "user",
+                "issuer_id": "agent",
+                **body,
+            },
+        )
+
+    progress: list[int] = []
+    async with AccountingClient(
+        "tenant", transport=httpx.MockTransport(handler)
+    ) as client:
+        engine = PayoutEngine(
+            client,
+            chunk_size=2,
+            concurrency=2,
+            on_progress=lambda report, chunk: progress.append(chunk.index),
+        )
+        report = await engine.run(
+            from_wallet_id="treasury",
+            to_wallet_ids=[f"r{index}" for index in range(5)],
+            currency="USD",
+            amounts=[Decimal(1)] * 5,
+            hold_id="hold",
+        )
+        assert [chunk.index for chunk in report.failed] == [1]
+        assert report.paid_amount == 3
+
+        failing.clear()
+        await engine.submit(report)
+
+    assert report.ok
+    assert sorted(progress) == [0, 1, 1, 2]
+    assert submitted[-1] == ["r2", "r3"]
+    assert len(submitted) == 3
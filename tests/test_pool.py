@@ -0,0 +1,61 @@
+"""Test the multi-tenant accounting client pool."""
+
+import httpx
+import pytest
+
+from src.ufaas.pool import AccountingClientPool
+
+
+def wallet_handler(request: httpx.Request) -> httpx.Response:
+    """Serve a single wallet."""
+    return httpx.Response(
+        200,
+        json={
+            "uid": "wallet",
+            "tenant_id": "tenant",
+            "workspace_id": "workspace",
+            "balance": {},
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_pool_evicts_least_recently_used_tenant(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test tenant clients are evicted in LRU order."""
+    async with AccountingClientPool(
+        max_tenants=2, transport=httpx.MockTransport(wallet_handler)
+    ) as pool:
+        first = pool.client("a")
+        pool.client("b")
+        assert pool.client("a") is first
+        pool.client("c")
+
+        assert "a" in pool
+        assert "b" not in pool
+        assert pool.evictions == 1
+
+
+@pytest.mark.asyncio
+async def test_pool_shares_transport_across_tenants(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test tenants share one transport that survives client closing."""
+    transport = httpx.MockTransport(wallet_handler)
+    async with AccountingClientPool(transport=transport) as pool:
+        for tenant_id in ("a", "b"):
+            async with pool.client(tenant_id) as client:
+                wallet = await client.get_wallet("wallet")
+                assert wallet.uid == "wallet"
+
+        assert pool.client("a")._transport.transport is transport
+        assert len(agent_tokens) == 2
+
+
+def test_pool_rejects_limits_next_to_transport() -> None:
+    """Test transport settings are not silently dropped."""
+    transport = httpx.MockTransport(wallet_handler)
+    for settings in ({"http2": True}, {"max_connections": 10}):
+        with pytest.raises(ValueError, match="transport"):
+            AccountingClientPool(transport=transport, **settings)
@@ -0,0 +1,95 @@
+"""Test proposal schemas and trusted proposal bodies."""
+
+from decimal import Decimal
+
+import pytest
+
+from src.ufaas.money import Money
+from src.ufaas.proposal import ProposalCreateSchema, proposal_payload
+
+
+@pytest.mark.parametrize(
+    "amounts",
+    [
+        [Decimal("1.25"), Decimal("0.75"), Decimal(3)],
+        [Money(125, "USD"), Money(75, "USD"), Money(300, "USD")],
+    ],
+    ids=["decimal", "money"],
+)
+def test_payload_matches_schema_dump(amounts: list[object]) -> None:
+    """Test a trusted body equals the dump of the validated schema."""
+    total = sum(amounts[1:], amounts[0])
+    payload = proposal_payload(
+        currency="USD",
+        amount=total,
+        participants=[
+            ("source", -total, "hold", "from"),
+            *[
+                (f"wallet-{index}", amount, None, None)
+                for index, amount in enumerate(amounts)
+            ],
+        ],
+        note="note",
+        meta_data={"idempotency_key": "key"},
+    )
+
+    assert payload["amount"] == "5.00"
+    assert (
+        ProposalCreateSchema.model_validate(payload).model_dump(mode="json")
+        == payload
+    )
+
+
+@pytest.mark.parametrize(
+    ("amount", "participants", "message"),
+    [
+        (
+            Decimal(2),
+            [("a", Decimal(-2), None, None), ("b", Decimal(1), None, None)],
+            "add up to zero",
+        ),
+        (
+            Decimal(2),
+            [
+                ("a", Decimal(-1), None, None),
+                ("b", Decimal(3), None, None),
+                ("c", Decimal(-2), None, None),
+            ],
+            "proposal amount",
+        ),
+        (
+            Money(200, "USD"),
+            [
+                ("a", Money(-200, "USD"), None, None),
+                ("b", Decimal(2), None, None),
+            ],
+            "all Money or all numbers",
+        ),
+        (
+            Money(200, "USD"),
+            [
+                ("a", Money(-200, "EUR"), None, None),
+                ("b", Money(200, "EUR"), None, None),
+            ],
+            "Cannot use EUR money for a USD amount",
+        ),
+    ],
+    ids=["unbalanced", "excess", "mixed", "currency"],
+)
+def test_double_entry_is_checked(
+    amount: Decimal | Money, participants: list[tuple], message: str
+) -> None:
+    """Test trusted bodies and schemas reject unbalanced participants."""
+    with pytest.raises(ValueError, match=message):
+        proposal_payload(
+            currency="USD", amount=amount, participants=participants
+        )
+    with pytest.raises(ValueError, match=message):
+        ProposalCreateSchema(
+            amount=amount,
+            currency="USD",
+            participants=[
+                {"wallet_id": wallet_id, "amount": value}
+                for wallet_id, value, _, _ in participants
+            ],
+        )
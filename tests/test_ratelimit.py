@@ -0,0 +1,66 @@
+"""Test client-side rate limiting."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.ufaas.exceptions import RateLimitedError
+from src.ufaas.ratelimit import RateLimiter, TokenBucket
+from src.ufaas.services import AccountingClient
+
+
+@pytest.mark.asyncio
+async def test_bucket_queues_bursts() -> None:
+    """Test callers beyond the burst wait for refilled tokens."""
+    bucket = TokenBucket("test", rate=100, burst=2)
+    waits = await asyncio.gather(*[bucket.acquire() for _ in range(4)])
+
+    assert waits[:2] == [0, 0]
+    assert 0 < waits[2] < waits[3] <= 0.03
+    metrics = bucket.metrics
+    assert metrics.acquired == 4
+    assert metrics.delayed == 2
+    assert metrics.max_queue_depth == 2
+    assert metrics.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_bucket_rejects_long_waits() -> None:
+    """Test callers are rejected when the wait exceeds max_wait."""
+    bucket = TokenBucket("test", rate=1, burst=1, max_wait=0.5)
+    await bucket.acquire()
+    with pytest.raises(RateLimitedError) as error:
+        await bucket.acquire()
+
+    assert error.value.status_code == 429
+    assert error.value.retry_after > 0.5
+    assert bucket.metrics.rejected == 1
+
+
+@pytest.mark.asyncio
+async def test_client_limits_per_tenant_and_class(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test reads and writes of each tenant have their own bucket."""
+    limiter = RateLimiter(read_rate=1, write_rate=1, max_wait=0)
+    transport = httpx.MockTransport(lambda request: httpx.Response(200))
+    async with (
+        AccountingClient(
+            "a", transport=transport, rate_limiter=limiter
+        ) as tenant_a,
+        AccountingClient(
+            "b", transport=transport, rate_limiter=limiter
+        ) as tenant_b,
+    ):
+        await tenant_a.get("/wallets")
+        await tenant_a.post("/proposals")
+        await tenant_b.get("/wallets")
+        with pytest.raises(RateLimitedError):
+            await tenant_a.get("/wallets")
+
+    assert set(limiter.metrics) == {
+        ("a", "read"),
+        ("a", "write"),
+        ("b", "read"),
+    }
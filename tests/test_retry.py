@@ -0,0 +1,140 @@
+"""Test retries of transient failures."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from src.ufaas.retry import (
+    IDEMPOTENCY_HEADER,
+    RetryAttempt,
+    RetryPolicy,
+    RetryStats,
+)
+from src.ufaas.services import AccountingClient
+
+
+def flaky(failures: int, status: int = 503, **headers: str) -> tuple:
+    """Fail the first requests with a transient status, then succeed."""
+    calls: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) <= failures:
+            return httpx.Response(status, headers=headers)
+        return httpx.Response(200, json={"ok": True})
+
+    return calls, httpx.MockTransport(handler)
+
+
+@pytest.mark.asyncio
+async def test_idempotent_request_is_retried(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test a GET failing transiently is retried until it succeeds."""
+    attempts = []
+    calls, transport = flaky(2)
+    policy = RetryPolicy(base_delay=0.001, on_attempt=attempts.append)
+    async with AccountingClient(
+        "tenant", transport=transport, retry_policy=policy
+    ) as client:
+        response = await client.get("/wallets")
+
+    assert response.status_code == 200
+    assert len(calls) == 3
+    assert [attempt.will_retry for attempt in attempts] == [
+        True,
+        True,
+        False,
+    ]
+    assert client.retry_stats.retries == 2
+    assert client.retry_stats.exhausted == 0
+
+
+@pytest.mark.asyncio
+async def test_retries_are_exhausted(agent_tokens: list[list[str]]) -> None:
+    """Test the last transient response is returned after all attempts."""
+    calls, transport = flaky(5, status=429, **{"Retry-After": "0"})
+    async with AccountingClient(
+        "tenant",
+        transport=transport,
+        retry_policy=RetryPolicy(attempts=2, base_delay=10),
+    ) as client:
+        response = await client.get("/wallets")
+
+    assert response.status_code == 429
+    assert len(calls) == 2
+    assert client.retry_stats.exhausted == 1
+
+
+@pytest.mark.asyncio
+async def test_non_idempotent_request_is_not_retried(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test a POST is retried only when opted in and carrying a key."""
+    calls, transport = flaky(3)
+    async with AccountingClient(
+        "tenant",
+        transport=transport,
+        retry_policy=RetryPolicy(base_delay=0.001),
+    ) as client:
+        response = await client.post(
+            "/holds", json={}, headers={IDEMPOTENCY_HEADER: "key"}
+        )
+        assert response.status_code == 503
+        assert len(calls) == 1
+
+    policy = RetryPolicy(base_delay=0.001, retry_writes=True)
+    async with AccountingClient(
+        "tenant", transport=transport, retry_policy=policy
+    ) as client:
+        response = await client.post("/holds", json={})
+        assert response.status_code == 503
+        assert len(calls) == 2
+
+        response = await client.post(
+            "/holds", json={}, headers={IDEMPOTENCY_HEADER: "key"}
+        )
+        assert response.status_code == 200
+        assert len(calls) == 4
+
+
+@pytest.mark.asyncio
+async def test_transport_error_is_retried(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test connection errors are retried and re-raised when exhausted."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        raise httpx.ConnectError("refused", request=request)
+
+    async with AccountingClient(
+        "tenant",
+        transport=httpx.MockTransport(handler),
+        retry_policy=RetryPolicy(base_delay=0.001),
+    ) as client:
+        with pytest.raises(httpx.ConnectError):
+            await client.get("/wallets")
+
+    assert len(calls) == 3
+
+
+def test_retry_after_caps_delay() -> None:
+    """Test Retry-After overrides the backoff up to the maximum delay."""
+    policy = RetryPolicy(max_delay=2)
+    response = httpx.Response(503, headers={"Retry-After": "30"})
+    assert policy.delay(1, response) == 2
+    assert 0 <= policy.delay(3, httpx.Response(503)) <= 0.4
+
+
+def test_retry_stats_count_across_threads() -> None:
+    """Test attempts recorded from many threads are all counted."""
+    stats = RetryStats()
+    attempt = RetryAttempt("GET", "/wallets", 1, 503, None, True, 0, True)
+    with ThreadPoolExecutor(8) as pool:
+        for _ in range(8):
+            pool.submit(lambda: [stats.record(attempt) for _ in range(5000)])
+
+    assert (stats.attempts, stats.retries) == (40_000, 40_000)
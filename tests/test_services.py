@@ -0,0 +1,415 @@
+"""Test the accounting service client."""
+
+import asyncio
+import json
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+import httpx
+import pytest
+
+from src.ufaas.services import AccountingClient
+from src.ufaas.wallet import WalletUpdateSchema
+
+
+@pytest.mark.asyncio
+async def test_transport_settings(agent_tokens: list[list[str]]) -> None:
+    """Test timeouts and limits are applied to the client."""
+    async with AccountingClient(
+        "tenant",
+        limits=httpx.Limits(max_connections=50),
+        keepalive_expiry=30,
+        timeout=10,
+        connect_timeout=2,
+    ) as client:
+        assert client.timeout == httpx.Timeout(10, connect=2)
+        pool = client._transport._pool
+        assert pool._max_connections == 50
+        assert pool._keepalive_expiry == 30
+
+
+@pytest.mark.usefixtures("agent_tokens")
+def test_transport_settings_need_default_transport() -> None:
+    """Test http2 and limits are rejected next to a custom transport."""
+    transport = httpx.MockTransport(lambda request: httpx.Response(200))
+    for settings in (
+        {"http2": True},
+        {"limits": httpx.Limits(max_connections=5)},
+        {"keepalive_expiry": 10},
+    ):
+        with pytest.raises(ValueError, match="transport"):
+            AccountingClient("tenant", transport=transport, **settings)
+
+
+def hold_payload(index: int, **fields: object) -> dict:
+    """Build a wallet hold payload."""
+    return {
+        "uid": f"hold-{index}",
+        "tenant_id": "tenant",
+        "workspace_id": "workspace",
+        "wallet_id": "wallet",
+        "currency": "USD",
+        "amount": "1.5",
+        "status": "active",
+        **fields,
+    }
+
+
+def paginated(items: list[dict]) -> httpx.MockTransport:
+    """Serve items from an offset/limit paginated endpoint."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        offset = int(request.url.params["offset"])
+        limit = int(request.url.params["limit"])
+        return httpx.Response(
+            200,
+            json={
+                "items": items[offset : offset + limit],
+                "total": len(items),
+                "offset": offset,
+                "limit": limit,
+            },
+        )
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.mark.asyncio
+async def test_iter_holds_walks_every_page(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test iter_holds yields items across all pages."""
+    holds = [hold_payload(index) for index in range(25)]
+    async with AccountingClient(
+        "tenant", transport=paginated(holds)
+    ) as client:
+        uids = [
+            hold.uid
+            async for hold in client.iter_holds("wallet", page_size=10)
+        ]
+
+    assert uids == [hold["uid"] for hold in holds]
+
+
+@pytest.mark.asyncio
+async def test_iter_holds_stops_when_offset_is_ignored(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test a server repeating the first page does not loop forever."""
+    holds = [hold_payload(index) for index in range(10)]
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json={"items": holds})
+
+    async with AccountingClient(
+        "tenant", transport=httpx.MockTransport(handler)
+    ) as client:
+        uids = [
+            hold.uid
+            async for hold in client.iter_holds("wallet", page_size=10)
+        ]
+        total = await client.total_held_amount("wallet", "USD", page_size=10)
+
+    assert uids == [hold["uid"] for hold in holds]
+    assert total == Decimal(15)
+    assert len(calls) == 4
+
+
+@pytest.mark.asyncio
+async def test_iter_holds_stops_prefetch_on_close(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test closing the iterator early leaves no pending prefetch."""
+    holds = [hold_payload(index) for index in range(25)]
+    async with AccountingClient(
+        "tenant", transport=paginated(holds)
+    ) as client:
+        iterator = client.iter_holds("wallet", page_size=10)
+        first = await anext(iterator)
+        await iterator.aclose()
+
+    assert first.uid == "hold-0"
+
+
+@pytest.mark.asyncio
+async def test_total_held_amount_filters_and_sums_exactly(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test holds are filtered by currency and status and summed exactly."""
+    holds = [
+        *[hold_payload(index, amount="0.1") for index in range(30)],
+        hold_payload(30, currency="EUR"),
+        hold_payload(31, status="released"),
+    ]
+    async with AccountingClient(
+        "tenant", transport=paginated(holds)
+    ) as client:
+        total = await client.total_held_amount("wallet", "USD", page_size=7)
+
+    assert total == Decimal("3.0")
+    assert isinstance(total, Decimal)
+
+
+@pytest.mark.asyncio
+async def test_holds_decode_numeric_amounts_exactly(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test JSON numbers decode to the Decimal of their literal."""
+    holds = [hold_payload(0, amount=1.1), hold_payload(1, amount=2)]
+    async with AccountingClient(
+        "tenant", transport=paginated(holds)
+    ) as client:
+        decoded = [hold async for hold in client.iter_holds("wallet")]
+
+    assert [hold.amount for hold in decoded] == [Decimal("1.1"), Decimal(2)]
+
+
+def wallet_payload(uid: str, **fields: object) -> dict:
+    """Build a wallet payload."""
+    return {
+        "uid": uid,
+        "tenant_id": "tenant",
+        "workspace_id": "workspace",
+        **fields,
+    }
+
+
+class WalletService:
+    """Serve a workspace whose default wallet can be deleted."""
+
+    def __init__(self) -> None:
+        self.wallets = {
+            "a": wallet_payload("a", is_default=False),
+            "b": wallet_payload("b", is_default=True),
+        }
+        self.paths: list[str] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path.removeprefix("/api/accounting/v1")
+        self.paths.append(f"{request.method} {path}")
+        if path == "/wallets":
+            items = list(self.wallets.values())
+            return httpx.Response(
+                200, json={"items": items, "total": len(items)}
+            )
+        wallet = self.wallets.get(path.rsplit("/", 1)[-1])
+        if wallet is None:
+            return httpx.Response(404, json={"detail": "Not found"})
+        if request.method == "PATCH":
+            wallet.update(json.loads(request.content))
+        return httpx.Response(200, json=wallet)
+
+
+@pytest.mark.asyncio
+async def test_default_wallet_is_cached(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test later lookups go straight to the cached default wallet."""
+    service = WalletService()
+    async with AccountingClient(
+        "tenant", transport=httpx.MockTransport(service)
+    ) as client:
+        first = await client.get_wallet(workspace_id="workspace")
+        second = await client.get_wallet(workspace_id="workspace")
+
+    assert first.uid == second.uid == "b"
+    assert service.paths == ["GET /wallets", "GET /wallets/b"]
+
+
+@pytest.mark.asyncio
+async def test_default_wallet_cache_invalidation(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test a 404 or a default change invalidates the cached wallet."""
+    service = WalletService()
+    async with AccountingClient(
+        "tenant", transport=httpx.MockTransport(service)
+    ) as client:
+        await client.get_wallet(workspace_id="workspace")
+        service.wallets["b"]["is_default"] = False
+        await client.update_wallet("a", WalletUpdateSchema(is_default=True))
+        assert (await client.get_wallet(workspace_id="workspace")).uid == "a"
+
+        del service.wallets["a"]
+        service.wallets["b"]["is_default"] = True
+        assert (await client.get_wallet(workspace_id="workspace")).uid == "b"
+
+    assert service.paths[1:] == [
+        "PATCH /wallets/a",
+        "GET /wallets/a",
+        "GET /wallets/a",
+        "GET /wallets",
+    ]
+
+
+class BalanceService:
+    """Serve one wallet together with hold and proposal creation."""
+
+    def __init__(self) -> None:
+        self.paths: list[str] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path.removeprefix("/api/accounting/v1")
+        self.paths.append(f"{request.method} {path}")
+        body = json.loads(request.content) if request.content else {}
+        if path == "/wallets/wallet":
+            return httpx.Response(
+                200,
+                json=wallet_payload(
+                    "wallet",
+                    balance={
+                        "USD": {
+                            "currency": "USD",
+                            "total": "100",
+                            "held": "0",
+                            "available": "100",
+                        }
+                    },
+                ),
+            )
+        if path == "/wallets/wallet/holds":
+            return httpx.Response(201, json=hold_payload(0, **body))
+        return httpx.Response(
+            201,
+            json={
+                "tenant_id": "tenant",
+                "user_id": "user",
+                "issuer_id": "agent",
+                **body,
+            },
+        )
+
+
+@pytest.mark.asyncio
+async def test_balance_cache_write_through(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test holds adjust cached balances and proposals invalidate them."""
+    service = BalanceService()
+    async with AccountingClient(
+        "tenant",
+        balance_cache_ttl=5,
+        transport=httpx.MockTransport(service),
+    ) as client:
+        balance = await client.get_balance("wallet", "USD")
+        assert balance.available == 100
+        balance.available = 0
+        assert (await client.get_balance("wallet", "USD")).available == 100
+        await client.create_hold(
+            "wallet", "USD", 30, datetime.now(UTC) + timedelta(hours=1)
+        )
+        balance = await client.get_balance("wallet", "USD")
+        assert (balance.held, balance.available) == (30, 70)
+
+        await client.create_proposal(
+            from_wallet_id="wallet",
+            to_wallet_id="other",
+            currency="USD",
+            amount=10,
+        )
+        await client.get_balance("wallet", "USD")
+
+    assert service.paths == [
+        "GET /wallets/wallet",
+        "POST /wallets/wallet/holds",
+        "POST /proposals",
+        "GET /wallets/wallet",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_identical_reads_are_coalesced(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test concurrent identical reads share one request."""
+    service = WalletService()
+    async with AccountingClient(
+        "tenant", transport=httpx.MockTransport(service)
+    ) as client:
+        wallets = await asyncio.gather(*[
+            client.get_wallet("a") for _ in range(20)
+        ])
+
+    assert service.paths == ["GET /wallets/a"]
+    assert client.inflight_reads.collapsed == 19
+    assert len({id(wallet) for wallet in wallets}) == 20
+
+
+@pytest.mark.asyncio
+async def test_idempotent_proposal(agent_tokens: list[list[str]]) -> None:
+    """Test repeated proposals with one key are created once."""
+    keys = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        keys.append(request.headers["Idempotency-Key"])
+        assert body["meta_data"]["idempotency_key"] == keys[-1]
+        return httpx.Response(
+            201,
+            json={
+                "tenant_id": "tenant",
+                "user_id": "user",
+                "issuer_id": "agent",
+                **body,
+            },
+        )
+
+    proposal = {
+        "from_wallet_id": "a",
+        "to_wallet_id": "b",
+        "currency": "USD",
+        "amount": Decimal(1),
+    }
+    async with AccountingClient(
+        "tenant", transport=httpx.MockTransport(handler)
+    ) as client:
+        first, second = await asyncio.gather(
+            client.create_proposal(**proposal, idempotency_key="key"),
+            client.create_proposal(**proposal, idempotency_key="key"),
+        )
+        third = await client.create_proposal(**proposal, idempotency_key="key")
+        await client.create_proposal(**proposal)
+
+    assert first == second == third
+    assert first is not second
+    assert keys[0] == "key"
+    assert len(keys) == 2
+    assert keys[1] != "key"
+
+
+@pytest.mark.asyncio
+async def test_proposal_body_is_balanced(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test float amounts balance exactly and unbalanced ones never send."""
+    service = BalanceService()
+    async with AccountingClient(
+        "tenant", transport=httpx.MockTransport(service)
+    ) as client:
+        proposal = await client.create_multi_recipient_proposal(
+            from_wallet_id="wallet",
+            to_wallet_ids=["b", "c"],
+            currency="USD",
+            amounts=[0.1, 0.2],
+            to_labels=["first"],
+        )
+        with pytest.raises(ValueError, match="proposal amount"):
+            await client.create_multi_recipient_proposal(
+                from_wallet_id="wallet",
+                to_wallet_ids=["b", "c"],
+                currency="USD",
+                amounts=[5, -2],
+            )
+
+    assert proposal.amount == Decimal("0.3")
+    assert [
+        (participant.amount, participant.label)
+        for participant in proposal.participants
+    ] == [
+        (Decimal("-0.3"), None),
+        (Decimal("0.1"), "first"),
+        (Decimal("0.2"), None),
+    ]
+    assert service.paths == ["POST /proposals"]
@@ -0,0 +1,192 @@
+"""Test the blocking accounting service client."""
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+import httpx
+import pytest
+
+from src.ufaas.retry import RetryPolicy
+from src.ufaas.services import AccountingClient, SyncAccountingClient
+from src.ufaas.wallet import WalletUpdateSchema
+
+from .test_services import WalletService, hold_payload, wallet_payload
+
+
+def proposal_service(keys: list[str]) -> httpx.MockTransport:
+    """Echo created proposals and record their idempotency keys."""
+    lock = threading.Lock()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        with lock:
+            keys.append(request.headers["Idempotency-Key"])
+        return httpx.Response(
+            201,
+            json={
+                "tenant_id": "tenant",
+                "user_id": "user",
+                "issuer_id": "agent",
+                **body,
+            },
+        )
+
+    return httpx.MockTransport(handler)
+
+
+def test_threads_share_one_client(agent_tokens: list[list[str]]) -> None:
+    """Test worker threads share the client's token and connections."""
+    keys: list[str] = []
+    with (
+        SyncAccountingClient(
+            "tenant", transport=proposal_service(keys)
+        ) as client,
+        ThreadPoolExecutor(max_workers=16) as pool,
+    ):
+        proposals = list(
+            pool.map(
+                lambda index: client.create_proposal(
+                    from_wallet_id="a",
+                    to_wallet_id=f"b{index}",
+                    currency="USD",
+                    amount=Decimal("0.5"),
+                ),
+                range(64),
+            )
+        )
+
+    assert len(agent_tokens) == 1
+    assert len(set(keys)) == 64
+    assert [proposal.participants[1].wallet_id for proposal in proposals] == [
+        f"b{index}" for index in range(64)
+    ]
+    assert proposals[0].participants[0].amount == Decimal("-0.5")
+
+
+def test_idempotent_proposal(agent_tokens: list[list[str]]) -> None:
+    """Test repeated proposals with one key are created once."""
+    keys: list[str] = []
+    with SyncAccountingClient(
+        "tenant", transport=proposal_service(keys)
+    ) as client:
+        first, second = (
+            client.create_proposal(
+                from_wallet_id="a",
+                to_wallet_id="b",
+                currency="USD",
+                amount=1,
+                idempotency_key="key",
+            )
+            for _ in range(2)
+        )
+
+    assert first == second
+    assert first is not second
+    assert keys == ["key"]
+
+
+def test_transient_failures_are_retried(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test reads are retried with the async client's policy."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(503)
+        return httpx.Response(200, json=wallet_payload("w"))
+
+    with SyncAccountingClient(
+        "tenant",
+        transport=httpx.MockTransport(handler),
+        retry_policy=RetryPolicy(base_delay=0.001),
+    ) as client:
+        wallet = client.get_wallet("w")
+
+    assert wallet.uid == "w"
+    assert len(calls) == 2
+    assert client.retry_stats.retries == 1
+
+
+def test_iter_holds_and_total(agent_tokens: list[list[str]]) -> None:
+    """Test pages are walked lazily and summed exactly."""
+    holds = [hold_payload(index, amount="0.1") for index in range(25)]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        offset = int(request.url.params["offset"])
+        limit = int(request.url.params["limit"])
+        return httpx.Response(
+            200,
+            json={
+                "items": holds[offset : offset + limit],
+                "total": len(holds),
+            },
+        )
+
+    with SyncAccountingClient(
+        "tenant", transport=httpx.MockTransport(handler)
+    ) as client:
+        uids = [hold.uid for hold in client.iter_holds("w", page_size=10)]
+        total = client.total_held_amount("w", "USD", page_size=10)
+
+    assert uids == [f"hold-{index}" for index in range(25)]
+    assert total == Decimal("2.5")
+
+
+def test_iter_holds_stops_when_offset_is_ignored(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test a server repeating the first page does not loop forever."""
+    holds = [hold_payload(index) for index in range(10)]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"items": holds})
+
+    with SyncAccountingClient(
+        "tenant", transport=httpx.MockTransport(handler)
+    ) as client:
+        uids = [hold.uid for hold in client.iter_holds("w", page_size=10)]
+
+    assert uids == [f"hold-{index}" for index in range(10)]
+
+
+def test_requires_agent_credentials(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test missing agent credentials are rejected."""
+    monkeypatch.delenv("AGENT_ID", raising=False)
+    monkeypatch.delenv("AGENT_PRIVATE_KEY", raising=False)
+    with pytest.raises(ValueError, match="agent_id"):
+        SyncAccountingClient("tenant")
+
+
+@pytest.mark.asyncio
+async def test_clients_send_the_same_requests(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test both clients run the same request flows."""
+    update = WalletUpdateSchema(is_default=True)
+    sync_service, async_service = WalletService(), WalletService()
+    with SyncAccountingClient(
+        "tenant", transport=httpx.MockTransport(sync_service)
+    ) as client:
+        client.get_wallet(workspace_id="workspace")
+        client.get_wallet(workspace_id="workspace")
+        client.update_wallet("a", update)
+        sync_wallet = client.get_wallet(workspace_id="workspace")
+    async with AccountingClient(
+        "tenant", transport=httpx.MockTransport(async_service)
+    ) as client:
+        await client.get_wallet(workspace_id="workspace")
+        await client.get_wallet(workspace_id="workspace")
+        await client.update_wallet("a", update)
+        async_wallet = await client.get_wallet(workspace_id="workspace")
+
+    assert sync_wallet.uid == async_wallet.uid
+    assert sync_service.paths == async_service.paths
+    assert sync_service.paths[:3] == [
+        "GET /wallets",
+        "GET /wallets/b",
+        "PATCH /wallets/a",
+    ]
@@ -0,0 +1,142 @@
+"""Test agent token caching."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.ufaas.services import ACCOUNTING_SCOPES, AccountingClient
+from src.ufaas.token_cache import TokenCache, token_expiry
+
+from .conftest import make_jwt
+
+
+def test_token_expiry() -> None:
+    """Test reading the exp claim."""
+    assert token_expiry(make_jwt({"exp": 1700000000})) == 1700000000
+    assert token_expiry(make_jwt({"sub": "agent"})) is None
+    assert token_expiry("not-a-jwt") is None
+
+
+def test_token_cache_margin() -> None:
+    """Test tokens expiring within the margin are dropped."""
+    cache = TokenCache(expiry_margin=30)
+    cache.set("fresh", make_jwt({"exp": time.time() + 120}))
+    cache.set("stale", make_jwt({"exp": time.time() + 10}))
+    assert cache.get("fresh") is not None
+    assert cache.get("stale") is None
+
+
+@pytest.mark.asyncio
+async def test_get_token_reuses_cached_token(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test repeated scopes share one token exchange."""
+    client = AccountingClient("tenant")
+    first = await client.get_token("read:finance/accounting/wallet")
+    second = await client.get_token(["read:finance/accounting/wallet"])
+    await client.get_token("read:finance/accounting/hold")
+
+    assert first == second
+    assert len(agent_tokens) == 2
+    assert client.token_cache.hits == 1
+    assert client.token_cache.misses == 2
+
+
+@pytest.mark.asyncio
+async def test_get_token_collapses_concurrent_refreshes(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test concurrent misses share one in-flight exchange."""
+    client = AccountingClient("tenant")
+    tokens = await asyncio.gather(*[
+        client.get_token("read:finance/accounting/wallet") for _ in range(10)
+    ])
+
+    assert len(set(tokens)) == 1
+    assert len(agent_tokens) == 1
+    assert client.token_cache.coalesced == 9
+
+
+@pytest.mark.asyncio
+async def test_empty_shared_cache_is_shared(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test clients given one empty cache share its tokens."""
+    cache = TokenCache()
+    first = AccountingClient("tenant", token_cache=cache)
+    second = AccountingClient("tenant", token_cache=cache)
+    await first.get_token("read:finance/accounting/wallet")
+    await second.get_token("read:finance/accounting/wallet")
+
+    assert first.token_cache is second.token_cache is cache
+    assert len(agent_tokens) == 1
+    assert cache.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_declared_scopes_share_one_token(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test a declared scope set covers every step of a workflow."""
+    client = AccountingClient("tenant", scopes=ACCOUNTING_SCOPES)
+    for scope in (
+        "read:finance/accounting/wallet",
+        "create:finance/accounting/hold",
+        "create:finance/accounting/proposal",
+        "update:finance/accounting/hold",
+    ):
+        await client.get_token(scope)
+
+    assert len(agent_tokens) == 1
+    assert set(agent_tokens[0]) == ACCOUNTING_SCOPES
+
+
+@pytest.mark.asyncio
+async def test_learned_scopes_accumulate(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test learned scopes are minted into later tokens."""
+    client = AccountingClient("tenant", learn_scopes=True)
+    await client.get_token("read:finance/accounting/wallet")
+    await client.get_token("create:finance/accounting/hold")
+    await client.get_token("read:finance/accounting/wallet")
+
+    assert len(agent_tokens) == 2
+    assert set(agent_tokens[1]) == {
+        "read:finance/accounting/wallet",
+        "create:finance/accounting/hold",
+    }
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_keeps_agents_apart(
+    agent_tokens: list[list[str]],
+) -> None:
+    """Test agents sharing a cache never get each other's tokens."""
+    cache = TokenCache()
+    first = AccountingClient("tenant", agent_id="first", token_cache=cache)
+    second = AccountingClient("tenant", agent_id="second", token_cache=cache)
+    await first.get_token("read:finance/accounting/wallet")
+    await second.get_token("read:finance/accounting/wallet")
+
+    assert len(agent_tokens) == 2
+    assert len(cache) == 2
+
+
+def test_sync_leader_rechecks_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test a thread missing just before a token is stored reuses it."""
+    cache = TokenCache()
+    token = make_jwt({"exp": time.time() + 600})
+    cache.set("key", token)
+    get = cache.get
+    # The first lookup races the previous leader and sees no token yet.
+    lookups = iter([None])
+    monkeypatch.setattr(cache, "get", lambda key: next(lookups, get(key)))
+    fetches: list[str] = []
+
+    assert cache.get_or_fetch_sync("key", lambda: fetches.append("key")) == (
+        token
+    )
+    assert fetches == []
+    assert (cache.hits, cache.misses) == (1, 0)